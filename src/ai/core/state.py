@@ -4,6 +4,9 @@ from abc import ABC, abstractmethod
 class State(ABC):
     """Classe astratta per rappresentare uno stato generico."""
 
+    # le sottoclassi possono usare __slots__ per occupare meno memoria
+    __slots__ = ()
+
     @abstractmethod
     def __eq__(self, other: object) -> bool:
         """Definisce l'uguaglianza tra stati."""
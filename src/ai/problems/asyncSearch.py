@@ -0,0 +1,133 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import aclosing
+from threading import Event
+from typing import Optional
+
+from ai.problems.problem import Problem
+from ai.problems.problemSolving import (
+    ProblemSolving,
+    SearchStreamType,
+    SolutionCallbackType,
+    SolutionType,
+)
+from ai.problems.searchEvents import FinishedEvent, SearchEvent, SolutionEvent
+from ai.problems.searchStatistics import SearchStatistics
+
+
+class AsyncSearch:
+    """
+    Versioni asyncio degli algoritmi di `ProblemSolving`, costruite sulle versioni a generatore (`...Stream`):
+    ogni **yieldInterval** nodi espansi la ricerca restituisce il controllo all'event loop,
+    così molte ricerche (e le altre coroutine) condividono lo stesso thread in modo equo.
+
+    Non serve uno stopEvent: la ricerca si interrompe cancellando il task (es: `asyncio.wait_for`,
+    `asyncio.timeout`), che riceve `asyncio.CancelledError` al primo punto di rilascio
+    e libera subito la frontiera
+    """
+
+    @staticmethod
+    async def events(stream: SearchStreamType) -> AsyncIterator[SearchEvent]:
+        """Inoltra gli eventi dello stream, rilasciando l'event loop dopo ogni evento"""
+        try:
+            for event in stream:
+                yield event
+                await asyncio.sleep(0)
+        finally:
+            # chiude il generatore anche se la coroutine viene cancellata
+            stream.close()
+
+    @staticmethod
+    async def run(
+        stream: SearchStreamType, onSolution: Optional[SolutionCallbackType] = None
+    ) -> FinishedEvent:
+        """Versione asincrona di `ProblemSolving.consumeStream`"""
+        async with aclosing(AsyncSearch.events(stream)) as events:
+            async for event in events:
+                if type(event) is SolutionEvent and onSolution is not None:
+                    onSolution(event.solution, event.bound)
+                elif type(event) is FinishedEvent:
+                    return event
+        raise RuntimeError("Lo stream è terminato senza un FinishedEvent")
+
+    @staticmethod
+    async def uniformSearch(
+        problem: Problem, yieldInterval: int = 200, statistics: Optional[SearchStatistics] = None
+    ) -> SolutionType:
+        stream = ProblemSolving.bestFirstSearchStream(
+            problem,
+            Event(),
+            lambda node: node.pathCost,
+            progressInterval=yieldInterval,
+            statistics=statistics,
+        )
+        return (await AsyncSearch.run(stream)).solution
+
+    @staticmethod
+    async def greedySearch(
+        problem: Problem, yieldInterval: int = 200, statistics: Optional[SearchStatistics] = None
+    ) -> SolutionType:
+        stream = ProblemSolving.bestFirstSearchStream(
+            problem,
+            Event(),
+            lambda node: node.heuristicDist,
+            progressInterval=yieldInterval,
+            statistics=statistics,
+        )
+        return (await AsyncSearch.run(stream)).solution
+
+    @staticmethod
+    async def aStarSearch(
+        problem: Problem, yieldInterval: int = 200, statistics: Optional[SearchStatistics] = None
+    ) -> SolutionType:
+        stream = ProblemSolving.bestFirstSearchStream(
+            problem,
+            Event(),
+            lambda node: node.pathCost + node.heuristicDist,
+            tieBreaker=lambda node: node.heuristicDist,
+            progressInterval=yieldInterval,
+            statistics=statistics,
+        )
+        return (await AsyncSearch.run(stream)).solution
+
+    @staticmethod
+    async def iterativeDeepeningSearch(
+        problem: Problem, yieldInterval: int = 200, statistics: Optional[SearchStatistics] = None
+    ) -> SolutionType:
+        stream = ProblemSolving.iterativeDeepeningStream(
+            problem, Event(), lambda node, depth: depth, yieldInterval, statistics
+        )
+        return (await AsyncSearch.run(stream)).solution
+
+    @staticmethod
+    async def iterativeDeepeningAStar(
+        problem: Problem, yieldInterval: int = 200, statistics: Optional[SearchStatistics] = None
+    ) -> SolutionType:
+        stream = ProblemSolving.iterativeDeepeningStream(
+            problem,
+            Event(),
+            lambda node, depth: node.pathCost + node.heuristicDist,
+            yieldInterval,
+            statistics,
+        )
+        return (await AsyncSearch.run(stream)).solution
+
+    @staticmethod
+    async def anytimeRepairingAStar(
+        problem: Problem,
+        initialWeight: float = 3.0,
+        weightStep: float = 0.5,
+        timeLimit: Optional[float] = None,
+        onSolution: Optional[SolutionCallbackType] = None,
+        yieldInterval: int = 200,
+        statistics: Optional[SearchStatistics] = None,
+    ) -> tuple[SolutionType, float]:
+        """
+        Con un tempo limite conviene usare **timeLimit** invece di cancellare il task:
+        alla scadenza restituisce la miglior soluzione trovata (le soluzioni intermedie arrivano a **onSolution**)
+        """
+        stream = ProblemSolving.anytimeRepairingAStarStream(
+            problem, Event(), initialWeight, weightStep, timeLimit, yieldInterval, statistics
+        )
+        finished = await AsyncSearch.run(stream, onSolution)
+        return (finished.solution, finished.bound)
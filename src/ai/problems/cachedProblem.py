@@ -0,0 +1,182 @@
+from functools import lru_cache
+from typing import Any, Optional
+
+from ai.core.action import Action
+from ai.core.state import State
+from ai.problems.problem import Problem
+
+
+class CachedProblem(Problem):
+    """
+    Involucro di un `Problem` che memorizza i risultati di `heuristicDistFunction`,
+    `getActionsFromState`, `transitionModel` ed `expand` (i successori completi, usati dagli
+    algoritmi di `ProblemSolving`) in cache LRU di dimensione limitata.
+
+    Utile per gli algoritmi che rigenerano molte volte gli stessi stati (IDS, IDA*, DFS limitata)
+    quando il calcolo è costoso (es: distanza di Manhattan del gioco dell'8).
+    Ogni cache si può disattivare: se il modello di transizione costa meno di una ricerca
+    in un dizionario la cache è solo un costo in più.
+
+    La cache dei successori è indicizzata dal solo stato: contiene tutti i successori, con la distanza
+    heuristica già calcolata, e la mossa inversa di **parentAction** (vedi `Problem.inverseAction`)
+    viene tolta dalla lista memorizzata a ogni chiamata. Così uno stato occupa un solo elemento,
+    qualunque sia la mossa con cui lo si raggiunge (es: IDS, IDA*).
+
+    Le liste di azioni e di successori restituite sono condivise tra le chiamate e non vanno modificate.
+    Gli altri attributi (es: `goalMap`) vengono letti dal problema originale
+    """
+
+    def __init__(
+        self,
+        problem: Problem,
+        maxSize: Optional[int] = 100_000,
+        cacheHeuristic: bool = True,
+        cacheActions: bool = True,
+        cacheTransitions: bool = True,
+        cacheSuccessors: bool = True,
+    ):
+        """
+        **problem**: *Problem*                                        - problema originale\\
+        **maxSize**: *Optional[int]*                                  - elementi massimi di ogni cache
+                                                                        (None: illimitata)\\
+        **cacheHeuristic**: *bool*                                    - memorizza `heuristicDistFunction`\\
+        **cacheActions**: *bool*                                      - memorizza `getActionsFromState`\\
+        **cacheTransitions**: *bool*                                  - memorizza `transitionModel`\\
+        **cacheSuccessors**: *bool*                                   - memorizza `expand`; se disattivata,
+                                                                        `expand` usa le altre cache abilitate
+        """
+        super().__init__(problem.initialState, problem.environment, problem.agents, problem.goal)
+        self.problem = problem
+        self.maxSize = maxSize
+        self.enabled = {
+            "heuristic": cacheHeuristic,
+            "actions": cacheActions,
+            "transitions": cacheTransitions,
+            "successors": cacheSuccessors,
+        }
+        self.createCaches()
+
+    def createCaches(self) -> None:
+        """(Ri)crea le cache abilitate, vuote e con i contatori azzerati"""
+        methods = {
+            "heuristic": self.problem.heuristicDistFunction,
+            "actions": self.problem.getActionsFromState,
+            "transitions": self.problem.transitionModel,
+            # solo lo stato: le distanze heuristiche dei figli non dipendono da quella del padre
+            "successors": lambda state: self.problem.expand(state),
+        }
+        self.caches = {
+            name: lru_cache(maxsize=self.maxSize)(method)
+            for name, method in methods.items()
+            if self.enabled[name]
+        }
+        # le chiamate vanno direttamente alla cache o al problema originale, senza controlli per chiamata
+        self.heuristicDistFunction = self.caches.get("heuristic", methods["heuristic"])
+        self.getActionsFromState = self.caches.get("actions", methods["actions"])
+        self.transitionModel = self.caches.get("transitions", methods["transitions"])
+        if "successors" in self.caches:
+            self.expand = self.cachedExpand
+        elif len(self.caches) == 0:
+            # nessuna cache: l'espansione in un'unica passata del problema originale resta la più veloce
+            self.expand = self.problem.expand
+        # altrimenti resta l'espansione predefinita di Problem, costruita sui metodi memorizzati
+
+    def cachedExpand(
+        self, state: State, heuristicDist: Optional[float] = None, parentAction: Optional[Action] = None
+    ) -> list[tuple[Action, State, float, float]]:
+        """`expand` dalla cache dei successori: **heuristicDist** non serve, i figli sono già calcolati"""
+        successors = self.caches["successors"](state)
+        if parentAction is None:
+            return successors
+        skipped = self.problem.inverseAction(parentAction)
+        if skipped is None:
+            return successors
+        return [successor for successor in successors if successor[0] != skipped]
+
+    def clearCaches(self) -> None:
+        for cache in self.caches.values():
+            cache.cache_clear()
+
+    def cacheInfo(self) -> dict[str, Any]:
+        """Per ogni cache abilitata: successi (hits), fallimenti (misses), dimensione massima e attuale"""
+        return {name: cache.cache_info() for name, cache in self.caches.items()}
+
+    @property
+    def hits(self) -> int:
+        return sum(info.hits for info in self.cacheInfo().values())
+
+    @property
+    def misses(self) -> int:
+        return sum(info.misses for info in self.cacheInfo().values())
+
+    # i metodi astratti sono sostituiti in createCaches dagli attributi dell'istanza
+
+    def getActionsFromState(self, state: State) -> list[Action]:
+        return self.problem.getActionsFromState(state)
+
+    def transitionModel(self, state: State, action: Action) -> State:
+        return self.problem.transitionModel(state, action)
+
+    def heuristicDistFunction(self, state: State) -> float:
+        return self.problem.heuristicDistFunction(state)
+
+    def pathCostFunction(self, state: State, action: Action) -> float:
+        return self.problem.pathCostFunction(state, action)
+
+    def isGoalAchieved(self, state: State) -> bool:
+        return self.problem.isGoalAchieved(state)
+
+    def inverseAction(self, action: Action) -> Optional[Action]:
+        return self.problem.inverseAction(action)
+
+    def getGoalStates(self) -> list[State]:
+        return self.problem.getGoalStates()
+
+    def getPredecessors(self, state: State) -> list[tuple[Action, State]]:
+        return self.problem.getPredecessors(state)
+
+    def encodeState(self, state: State) -> bytes:
+        return self.problem.encodeState(state)
+
+    def decodeState(self, data: bytes) -> State:
+        return self.problem.decodeState(data)
+
+    def encodeAction(self, action: Action) -> bytes:
+        return self.problem.encodeAction(action)
+
+    def decodeAction(self, data: bytes) -> Action:
+        return self.problem.decodeAction(data)
+
+    def stateSpaceSize(self) -> Optional[int]:
+        return self.problem.stateSpaceSize()
+
+    def stateRank(self, state: State) -> int:
+        return self.problem.stateRank(state)
+
+    def stateFromRank(self, rank: int) -> State:
+        return self.problem.stateFromRank(rank)
+
+    def fingerprint(self) -> bytes:
+        return self.problem.fingerprint()
+
+    def __getattr__(self, name: str) -> Any:
+        # chiamato solo per gli attributi non trovati nell'involucro
+        if name == "problem":
+            raise AttributeError(name)
+        return getattr(self.problem, name)
+
+    def __getstate__(self) -> dict[str, Any]:
+        # le cache (funzioni) non sono serializzabili: vengono ricreate vuote (es: avvio dei processi con spawn)
+        excluded = ("caches", "heuristicDistFunction", "getActionsFromState", "transitionModel", "expand")
+        return {key: value for key, value in self.__dict__.items() if key not in excluded}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.createCaches()
+
+    def __str__(self) -> str:
+        info = ", ".join(
+            f"{name}: {cache.hits} hit / {cache.misses} miss ({cache.currsize} elementi)"
+            for name, cache in self.cacheInfo().items()
+        )
+        return f"{self.problem}Cache: {info if info else 'disattivate'}\n"
@@ -0,0 +1,247 @@
+import heapq
+import mmap
+import os
+import shutil
+import tempfile
+from collections.abc import Iterator
+from threading import Event
+from typing import Optional
+
+from ai.core.action import Action
+from ai.core.state import State
+from ai.problems.problem import Problem
+from ai.problems.problemSolving import ProblemSolving, SolutionType
+from ai.problems.searchStatistics import SearchStatistics
+
+
+class ExternalBreadthFirstSearch:
+    """
+    BFS in memoria esterna con rilevamento ritardato dei duplicati (delayed duplicate detection):
+    ogni livello di profondità è un file di stati codificati (con `Problem.encodeState`, a lunghezza fissa)
+    ordinati e senza ripetizioni. I successori di un livello vengono accumulati in memoria fino a
+    **bufferSize** stati, ordinati e scritti su disco in blocchi (run); i run vengono poi fusi (merge)
+    eliminando i duplicati e gli stati già presenti nei livelli precedenti, letti anch'essi in ordine.
+    I file vengono letti tramite mmap, quindi in memoria resta solo il buffer dei successori.
+
+    Con azioni reversibili (es: gioco dell'8) un successore del livello k può trovarsi solo nei livelli
+    k e k - 1, quindi basta confrontarlo con i **previousLayers** = 2 livelli precedenti; per i problemi
+    con azioni non reversibili (es: aspirapolvere) va usato previousLayers=None (tutti i livelli).
+
+    Non mantiene i padri: la soluzione viene ricostruita a ritroso cercando, in ogni livello,
+    uno stato da cui si raggiunge lo stato successivo del percorso.
+    Con **keepLayers** i file dei livelli restano in **directory** (il file del livello k contiene
+    tutti e soli gli stati a distanza k dallo stato iniziale, vedi `readLayer`)
+    """
+
+    @staticmethod
+    def search(
+        problem: Problem,
+        stopEvent: Event,
+        statistics: Optional[SearchStatistics] = None,
+        directory: Optional[str] = None,
+        keepLayers: bool = False,
+        bufferSize: int = 1_000_000,
+        previousLayers: Optional[int] = 2,
+    ) -> SolutionType:
+        """
+        **directory**: *Optional[str]*            - cartella dei file (default: una cartella temporanea)\\
+        **keepLayers**: *bool*                    - se True non elimina i file dei livelli al termine\\
+        **bufferSize**: *int*                     - successori tenuti in memoria prima di scrivere un run\\
+        **previousLayers**: *Optional[int]*       - livelli precedenti con cui confrontare i successori (None: tutti)
+        """
+        root = problem.initialState
+        if problem.isGoalAchieved(root):
+            return ([], 0)
+
+        recordSize = len(problem.encodeState(root))
+        ownDirectory = directory is None
+        if ownDirectory:
+            directory = tempfile.mkdtemp(prefix="externalBfs")
+        else:
+            os.makedirs(directory, exist_ok=True)
+
+        layers: list[str] = [ExternalBreadthFirstSearch.layerPath(directory, 0)]
+        with open(layers[0], "wb") as file:
+            file.write(problem.encodeState(root))
+        if statistics is not None:
+            statistics.updatePeaks(1, 1)
+
+        try:
+            while True:
+                depth = len(layers) - 1
+                outcome = ExternalBreadthFirstSearch.expandLayer(
+                    problem, stopEvent, directory, layers, recordSize, bufferSize, previousLayers, statistics
+                )
+                if outcome is None:
+                    return ProblemSolving.CUTOFF
+
+                if isinstance(outcome, tuple):
+                    # obiettivo raggiunto da uno stato del livello depth
+                    parentState, action = outcome
+                    return ExternalBreadthFirstSearch.reconstructSolution(
+                        problem, layers, recordSize, depth, parentState, action
+                    )
+
+                if outcome == 0:
+                    # nuovo livello vuoto: visitati tutti gli stati raggiungibili
+                    os.remove(layers[-1])
+                    layers.pop()
+                    return ProblemSolving.NO_SOLUTIONS
+        finally:
+            if not keepLayers:
+                for path in layers:
+                    if os.path.exists(path):
+                        os.remove(path)
+                if ownDirectory:
+                    shutil.rmtree(directory, ignore_errors=True)
+
+    @staticmethod
+    def expandLayer(
+        problem: Problem,
+        stopEvent: Event,
+        directory: str,
+        layers: list[str],
+        recordSize: int,
+        bufferSize: int,
+        previousLayers: Optional[int],
+        statistics: Optional[SearchStatistics],
+    ) -> Optional[int | tuple[State, Action]]:
+        """
+        Genera il livello successivo all'ultimo di **layers** e lo aggiunge alla lista.
+        Restituisce il numero di stati del nuovo livello, oppure (stato, azione) se un successore
+        soddisfa l'obiettivo, oppure None se la ricerca è stata interrotta
+        """
+        depth = len(layers) - 1
+        runs: list[str] = []
+        buffer: list[bytes] = []
+        generated = 0
+
+        def writeRun() -> None:
+            path = os.path.join(directory, f"run{depth + 1:04d}-{len(runs):04d}.bin")
+            buffer.sort()
+            with open(path, "wb") as file:
+                previous = None
+                for record in buffer:
+                    if record != previous:
+                        file.write(record)
+                        previous = record
+            runs.append(path)
+            buffer.clear()
+
+        try:
+            for record in ExternalBreadthFirstSearch.readRecords(layers[depth], recordSize):
+                if stopEvent.is_set():
+                    return None
+
+                state = problem.decodeState(record)
+                successors = problem.expand(state)
+                generated += len(successors)
+                if statistics is not None:
+                    statistics.expanded += 1
+                    statistics.generated += len(successors)
+
+                for action, child, _, _ in successors:
+                    if problem.isGoalAchieved(child):
+                        return (state, action)
+                    encoded = problem.encodeState(child)
+                    if len(encoded) != recordSize:
+                        raise ValueError(
+                            "ExternalBreadthFirstSearch richiede stati codificati a lunghezza fissa"
+                        )
+                    buffer.append(encoded)
+
+                if len(buffer) >= bufferSize:
+                    writeRun()
+            if len(buffer) > 0:
+                writeRun()
+
+            # fusione dei run senza duplicati, escludendo gli stati dei livelli precedenti
+            compared = layers if previousLayers is None else layers[-previousLayers:]
+            layerPath = ExternalBreadthFirstSearch.layerPath(directory, depth + 1)
+            merged = heapq.merge(
+                *(ExternalBreadthFirstSearch.readRecords(path, recordSize) for path in runs)
+            )
+            filters = [ExternalBreadthFirstSearch.readRecords(path, recordSize) for path in compared]
+            heads = [next(records, None) for records in filters]
+
+            size = 0
+            with open(layerPath, "wb") as file:
+                previous = None
+                for record in merged:
+                    if record == previous:
+                        continue
+                    previous = record
+
+                    known = False
+                    for index, records in enumerate(filters):
+                        head = heads[index]
+                        while head is not None and head < record:
+                            head = next(records, None)
+                        heads[index] = head
+                        if head == record:
+                            known = True
+                    if not known:
+                        file.write(record)
+                        size += 1
+
+            layers.append(layerPath)
+            if statistics is not None:
+                # gli stati esplorati sono tutti quelli scritti sui livelli (su disco)
+                statistics.duplicates += generated - size
+                statistics.peakFrontier = max(statistics.peakFrontier, size)
+                statistics.peakExplored += size
+            return size
+        finally:
+            for path in runs:
+                os.remove(path)
+
+    @staticmethod
+    def reconstructSolution(
+        problem: Problem,
+        layers: list[str],
+        recordSize: int,
+        depth: int,
+        parentState: State,
+        action: Action,
+    ) -> SolutionType:
+        """Risale dal livello **depth** alla radice cercando in ogni livello un predecessore dello stato corrente"""
+        steps: list[tuple[State, Action]] = [(parentState, action)]
+        target = parentState
+        for previousDepth in range(depth - 1, -1, -1):
+            step = None
+            for record in ExternalBreadthFirstSearch.readRecords(layers[previousDepth], recordSize):
+                state = problem.decodeState(record)
+                for candidate in problem.getActionsFromState(state):
+                    if problem.transitionModel(state, candidate) == target:
+                        step = (state, candidate)
+                        break
+                if step is not None:
+                    break
+            steps.append(step)
+            target = step[0]
+
+        steps.reverse()
+        cost = sum(problem.pathCostFunction(state, action) for state, action in steps)
+        return ([action for _, action in steps], cost)
+
+    @staticmethod
+    def layerPath(directory: str, depth: int) -> str:
+        return os.path.join(directory, f"layer{depth:04d}.bin")
+
+    @staticmethod
+    def readRecords(path: str, recordSize: int) -> Iterator[bytes]:
+        """Legge in ordine i record di un file (ordinato) tramite mmap"""
+        if os.path.getsize(path) == 0:
+            return
+        with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for offset in range(0, len(data), recordSize):
+                yield data[offset : offset + recordSize]
+
+    @staticmethod
+    def readLayer(problem: Problem, directory: str, depth: int) -> Iterator[State]:
+        """Stati a distanza **depth** dallo stato iniziale, da una ricerca eseguita con keepLayers=True"""
+        recordSize = len(problem.encodeState(problem.initialState))
+        for record in ExternalBreadthFirstSearch.readRecords(
+            ExternalBreadthFirstSearch.layerPath(directory, depth), recordSize
+        ):
+            yield problem.decodeState(record)
@@ -0,0 +1,316 @@
+import multiprocessing
+import os
+import queue
+from multiprocessing.synchronize import Event as ProcessEvent
+from threading import Event
+from typing import Any, Optional
+
+from ai.core.action import Action
+from ai.core.state import State
+from ai.problems.priorityQueue import IndexedPriorityQueue
+from ai.problems.problem import Problem
+from ai.problems.problemSolving import ProblemSolving, SolutionType
+from ai.problems.searchStatistics import SearchStatistics
+
+
+class HashDistributedAStar:
+    """
+    HDA* (Hash Distributed A*): A* parallelo su più processi senza strutture condivise.
+    Ogni stato appartiene al worker `hash(stato) % workers`, che è l'unico a mantenerne
+    il miglior costo (open e closed list locali); i figli generati vengono inviati al proprietario
+    in blocchi (batch), così ogni messaggio trasporta molti nodi.
+
+    Poiché i worker non espandono i nodi nell'ordine globale di f, un nodo già chiuso viene riaperto se
+    arriva con un costo minore, e la prima soluzione trovata non è necessariamente ottima:
+    la ricerca termina quando nessun worker ha nodi con f minore della miglior soluzione (incumbent)
+    e nessun messaggio è in viaggio. Con un'euristica ammissibile la soluzione è ottima.
+
+    La terminazione usa un unico contatore condiviso `work` = worker attivi + messaggi in viaggio:
+    un messaggio viene contato prima dell'invio da un worker attivo, e il destinatario lo scala solo
+    dopo essere diventato attivo, quindi `work` arriva a 0 solo quando il lavoro è davvero finito.
+
+    Richiede il metodo fork: i worker devono calcolare gli stessi hash del processo principale
+    (gli hash delle stringhe cambiano tra processi avviati con spawn)
+    """
+
+    # tipi di messaggio verso i worker
+    NODES = 0
+    PARENT = 1
+    GOAL = 2
+    STOP = 3
+
+    # attesa massima delle risposte dei worker (in secondi)
+    REPLY_TIMEOUT = 30
+
+    @staticmethod
+    def search(
+        problem: Problem,
+        stopEvent: Event,
+        workers: Optional[int] = None,
+        batchSize: int = 64,
+        statistics: Optional[SearchStatistics] = None,
+    ) -> SolutionType:
+        """
+        **workers**: *Optional[int]*              - numero di processi (default: numero di CPU)\\
+        **batchSize**: *int*                      - nodi per messaggio e nodi espansi tra due invii\\
+        **statistics**: *SearchStatistics*        - se presente, somma i contatori dei worker
+                                                    (i picchi sono la somma dei picchi dei singoli worker)
+        """
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise RuntimeError("HashDistributedAStar richiede il metodo di avvio fork")
+
+        workers = workers if workers is not None else os.cpu_count() or 1
+        context = multiprocessing.get_context("fork")
+
+        inboxes = [context.Queue() for _ in range(workers)]
+        replies = context.Queue()
+        work = context.Value("q", 0)
+        incumbent = context.Value("d", float("inf"))
+        incumbentOwner = context.Value("i", -1)
+        stopFlag = context.Event()
+
+        # la radice è il primo messaggio in viaggio
+        root = problem.initialState
+        work.value = 1
+        rootEntry = (root, 0, problem.heuristicDistFunction(root), None, None)
+        inboxes[hash(root) % workers].put((HashDistributedAStar.NODES, [rootEntry]))
+
+        processes = [
+            context.Process(
+                target=runHashDistributedWorker,
+                args=(
+                    index,
+                    workers,
+                    problem,
+                    inboxes,
+                    replies,
+                    work,
+                    incumbent,
+                    incumbentOwner,
+                    stopFlag,
+                    batchSize,
+                    os.getpid(),
+                ),
+                daemon=True,
+            )
+            for index in range(workers)
+        ]
+        for process in processes:
+            process.start()
+
+        try:
+            # la lettura di work senza lock è sicura: una volta a 0 non può più cambiare
+            while work.value > 0:
+                if stopEvent.wait(0.005):
+                    return ProblemSolving.CUTOFF
+                if any(process.exitcode is not None for process in processes):
+                    raise RuntimeError("Un worker di HashDistributedAStar è terminato inaspettatamente")
+
+            if incumbent.value == float("inf"):
+                return ProblemSolving.NO_SOLUTIONS
+
+            return HashDistributedAStar.reconstructSolution(
+                problem, workers, inboxes, replies, incumbentOwner.value
+            )
+        finally:
+            HashDistributedAStar.shutdown(processes, inboxes, replies, stopFlag, statistics)
+
+    @staticmethod
+    def reconstructSolution(
+        problem: Problem,
+        workers: int,
+        inboxes: list[multiprocessing.Queue],
+        replies: multiprocessing.Queue,
+        goalOwner: int,
+    ) -> SolutionType:
+        """Risale dall'obiettivo alla radice chiedendo ad ogni worker il padre dei suoi stati"""
+        inboxes[goalOwner].put((HashDistributedAStar.GOAL, None))
+        state = replies.get(timeout=HashDistributedAStar.REPLY_TIMEOUT)
+
+        steps: list[tuple[State, Action]] = []
+        while True:
+            inboxes[hash(state) % workers].put((HashDistributedAStar.PARENT, state))
+            parentState, action = replies.get(timeout=HashDistributedAStar.REPLY_TIMEOUT)
+            if parentState is None:
+                break
+            steps.append((parentState, action))
+            state = parentState
+
+        steps.reverse()
+        # il costo viene ricalcolato sul percorso effettivo
+        cost = sum(problem.pathCostFunction(state, action) for state, action in steps)
+        return ([action for _, action in steps], cost)
+
+    @staticmethod
+    def shutdown(
+        processes: list[multiprocessing.Process],
+        inboxes: list[multiprocessing.Queue],
+        replies: multiprocessing.Queue,
+        stopFlag: ProcessEvent,
+        statistics: Optional[SearchStatistics],
+    ) -> None:
+        stopFlag.set()
+        for inbox in inboxes:
+            inbox.put((HashDistributedAStar.STOP, None))
+
+        # ogni worker risponde con i propri contatori prima di terminare
+        if statistics is not None:
+            for _ in processes:
+                try:
+                    counters = replies.get(timeout=1)
+                except queue.Empty:
+                    break
+                statistics.expanded += counters["expanded"]
+                statistics.generated += counters["generated"]
+                statistics.duplicates += counters["duplicates"]
+                statistics.reopened += counters["reopened"]
+                statistics.peakFrontier += counters["peakFrontier"]
+                statistics.peakExplored += counters["peakExplored"]
+
+        for process in processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.kill()
+                process.join()
+
+        for inbox in inboxes + [replies]:
+            inbox.cancel_join_thread()
+            inbox.close()
+
+
+def runHashDistributedWorker(
+    index: int,
+    workers: int,
+    problem: Problem,
+    inboxes: list[multiprocessing.Queue],
+    replies: multiprocessing.Queue,
+    work: Any,
+    incumbent: Any,
+    incumbentOwner: Any,
+    stopFlag: ProcessEvent,
+    batchSize: int,
+    parentPid: int,
+) -> None:
+    """Corpo di ogni worker di HashDistributedAStar: gestisce gli stati con `hash(stato) % workers == index`"""
+    inbox = inboxes[index]
+
+    # per ogni stato conosciuto: (costo migliore, stato padre, azione dal padre)
+    best: dict[State, tuple[float, Optional[State], Optional[Action]]] = {}
+    fringe = IndexedPriorityQueue()
+    closed: set[State] = set()
+    outgoing: list[list[tuple]] = [[] for _ in range(workers)]
+    counters = SearchStatistics()
+    goalState: Optional[State] = None
+    # un worker è attivo se ha nodi da espandere con f minore dell'incumbent
+    busy = False
+
+    def send(destination: int, batch: list[tuple]) -> None:
+        # il messaggio viene contato prima di essere inviato
+        with work.get_lock():
+            work.value += 1
+        inboxes[destination].put((HashDistributedAStar.NODES, batch))
+
+    def flush() -> None:
+        for destination in range(workers):
+            if len(outgoing[destination]) > 0:
+                send(destination, outgoing[destination])
+                outgoing[destination] = []
+
+    def insert(
+        state: State, g: float, h: float, parentState: Optional[State], action: Optional[Action]
+    ) -> None:
+        curr = best.get(state)
+        if curr is not None and curr[0] <= g:
+            counters.duplicates += 1
+            return
+
+        # non può migliorare la soluzione già trovata
+        if g + h >= incumbent.value:
+            return
+
+        if state in closed:
+            closed.remove(state)
+            counters.reopened += 1
+
+        best[state] = (g, parentState, action)
+        fringe.push(state, (g + h, h), state)
+
+    try:
+        while not stopFlag.is_set():
+            try:
+                # se inattivo attende nuovi messaggi (controllando periodicamente se il padre è ancora vivo)
+                message = inbox.get_nowait() if busy else inbox.get(timeout=0.05)
+            except queue.Empty:
+                message = None
+                if not busy and os.getppid() != parentPid:
+                    break
+
+            if message is not None:
+                kind, payload = message
+                if kind == HashDistributedAStar.STOP:
+                    break
+                if kind == HashDistributedAStar.GOAL:
+                    replies.put(goalState)
+                    continue
+                if kind == HashDistributedAStar.PARENT:
+                    replies.put(best[payload][1:])
+                    continue
+
+                for state, g, h, parentState, action in payload:
+                    insert(state, g, h, parentState, action)
+
+                # il messaggio consumato diventa lavoro del worker: se era inattivo work resta invariato
+                if busy:
+                    with work.get_lock():
+                        work.value -= 1
+                busy = True
+                # riceve tutti i messaggi disponibili prima di espandere
+                continue
+
+            if not busy:
+                continue
+
+            expanded = 0
+            while expanded < batchSize and len(fringe) > 0 and fringe.peekPriority()[0] < incumbent.value:
+                state = fringe.pop()
+                g = best[state][0]
+
+                if problem.isGoalAchieved(state):
+                    with incumbent.get_lock():
+                        if g < incumbent.value:
+                            incumbent.value = g
+                            incumbentOwner.value = index
+                            goalState = state
+                    continue
+
+                closed.add(state)
+                # l'euristica dei figli viene calcolata dal mittente, insieme ai successori
+                successors = problem.expand(state)
+                counters.expanded += 1
+                counters.generated += len(successors)
+                expanded += 1
+
+                for action, child, stepCost, h in successors:
+                    destination = hash(child) % workers
+                    if destination == index:
+                        insert(child, g + stepCost, h, state, action)
+                    else:
+                        outgoing[destination].append((child, g + stepCost, h, state, action))
+                        if len(outgoing[destination]) >= batchSize:
+                            send(destination, outgoing[destination])
+                            outgoing[destination] = []
+
+            flush()
+            counters.updatePeaks(len(fringe), len(closed))
+
+            if len(fringe) == 0 or fringe.peekPriority()[0] >= incumbent.value:
+                # i nodi rimasti (se presenti) non possono migliorare l'incumbent
+                busy = False
+                with work.get_lock():
+                    work.value -= 1
+    finally:
+        if stopFlag.is_set():
+            # ricerca interrotta: i messaggi ancora in coda non servono più
+            for other in inboxes:
+                other.cancel_join_thread()
+            replies.put(counters.asDict())
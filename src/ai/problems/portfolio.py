@@ -0,0 +1,243 @@
+import multiprocessing
+import time
+from multiprocessing.connection import Connection, wait
+from threading import Event, Timer
+from typing import Optional
+
+from ai.problems.problem import Problem
+from ai.problems.problemSolving import ProblemSolving, SearchAlgorithmType, SolutionType
+from ai.problems.searchStatistics import SearchStatistics
+
+try:
+    import resource
+except ImportError:  # non disponibile su Windows: il limite di memoria viene ignorato
+    resource = None
+
+
+class PortfolioResult:
+    SOLVED = "solved"
+    NO_SOLUTIONS = "no_solutions"
+    CUTOFF = "cutoff"
+    TIMEOUT = "timeout"
+    MEMORY = "memory"
+    ERROR = "error"
+    CANCELLED = "cancelled"
+
+    def __init__(
+        self,
+        name: str,
+        status: str,
+        solution: SolutionType,
+        time: float,
+        error: Optional[str] = None,
+        statistics: Optional[SearchStatistics] = None,
+    ):
+        """
+        **name**: *str*                     - nome dell'algoritmo\\
+        **status**: *str*                   - esito (una delle costanti di PortfolioResult)\\
+        **solution**: *SolutionType*        - soluzione restituita dall'algoritmo (CUTOFF se non disponibile)\\
+        **time**: *float*                   - tempo impiegato in secondi\\
+        **error**: *Optional[str]*          - descrizione dell'errore, se l'algoritmo è fallito\\
+        **statistics**: *SearchStatistics*  - contatori della ricerca (se richiesti)
+        """
+        self.name = name
+        self.status = status
+        self.solution = solution
+        self.time = time
+        self.error = error
+        self.statistics = statistics
+
+    def __str__(self) -> str:
+        return f"{self.name}: {self.status} in {self.time:.3f}s"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+class SearchPortfolio:
+    """
+    Esegue più algoritmi di ricerca sullo stesso problema in parallelo, ognuno in un processo separato
+    (quindi senza competere per il GIL). Ogni processo ha un limite di tempo, oltre il quale prima viene
+    impostato il suo stopEvent e poi, trascorso **gracePeriod**, viene terminato forzatamente
+    (anche se l'algoritmo ignora lo stopEvent), e un eventuale limite di memoria.
+
+    Dove disponibile i processi vengono creati con fork, altrimenti problema e algoritmi
+    devono essere serializzabili con pickle (niente lambda)
+    """
+
+    def __init__(
+        self,
+        algorithms: dict[str, SearchAlgorithmType],
+        timeout: float,
+        memoryLimit: Optional[int] = None,
+        maxWorkers: Optional[int] = None,
+        gracePeriod: float = 1.0,
+        collectStatistics: bool = False,
+    ):
+        """
+        **algorithms**: *dict[str, SearchAlgorithmType]*    - algoritmi da eseguire, per nome\\
+        **timeout**: *float*                                - tempo massimo (in secondi) per ogni algoritmo\\
+        **memoryLimit**: *Optional[int]*                    - memoria massima (in byte) per ogni processo\\
+        **maxWorkers**: *Optional[int]*                     - processi contemporanei (default: uno per algoritmo)\\
+        **gracePeriod**: *float*                            - attesa dopo il timeout prima di terminare il processo\\
+        **collectStatistics**: *bool*                       - raccoglie le `SearchStatistics` (gli algoritmi
+                                                              devono accettare il parametro `statistics`)
+        """
+        self.algorithms = algorithms
+        self.timeout = timeout
+        self.memoryLimit = memoryLimit
+        self.maxWorkers = maxWorkers if maxWorkers is not None else max(1, len(algorithms))
+        self.gracePeriod = gracePeriod
+        self.collectStatistics = collectStatistics
+
+        if "fork" in multiprocessing.get_all_start_methods():
+            self.context = multiprocessing.get_context("fork")
+        else:
+            self.context = multiprocessing.get_context()
+
+    def run(self, problem: Problem, firstResult: bool = False) -> dict[str, PortfolioResult]:
+        """
+        Restituisce il risultato di ogni algoritmo (nell'ordine di **algorithms**).
+        Se **firstResult** è True si ferma alla prima soluzione trovata: gli algoritmi ancora in esecuzione
+        vengono terminati e risultano CANCELLED
+        """
+        pending = list(self.algorithms.items())
+        running: dict[Connection, tuple[str, multiprocessing.Process, float]] = {}
+        results: dict[str, PortfolioResult] = {}
+
+        try:
+            while len(pending) > 0 or len(running) > 0:
+                while len(pending) > 0 and len(running) < self.maxWorkers:
+                    name, search = pending.pop(0)
+                    receiver, sender = self.context.Pipe(duplex=False)
+                    process = self.context.Process(
+                        target=runPortfolioWorker,
+                        args=(
+                            sender,
+                            search,
+                            problem,
+                            self.timeout,
+                            self.memoryLimit,
+                            self.collectStatistics,
+                        ),
+                        daemon=True,
+                    )
+                    process.start()
+                    sender.close()
+                    running[receiver] = (name, process, time.monotonic())
+
+                # attende il primo risultato, al più fino alla prima scadenza
+                deadline = min(start for _, _, start in running.values())
+                deadline += self.timeout + self.gracePeriod
+                ready = wait(list(running.keys()), timeout=max(0, deadline - time.monotonic()))
+
+                for receiver in ready:
+                    name, process, start = running.pop(receiver)
+                    results[name] = SearchPortfolio.receiveResult(receiver, name, process, start)
+
+                    if firstResult and results[name].status == PortfolioResult.SOLVED:
+                        for _, (otherName, _, otherStart) in running.items():
+                            results[otherName] = PortfolioResult(
+                                otherName,
+                                PortfolioResult.CANCELLED,
+                                ProblemSolving.CUTOFF,
+                                time.monotonic() - otherStart,
+                            )
+                        for otherName, _ in pending:
+                            results[otherName] = PortfolioResult(
+                                otherName, PortfolioResult.CANCELLED, ProblemSolving.CUTOFF, 0
+                            )
+                        pending.clear()
+                        return {name: results[name] for name in self.algorithms}
+
+                # termina forzatamente i processi che hanno ignorato lo stopEvent
+                now = time.monotonic()
+                for receiver, (name, process, start) in list(running.items()):
+                    if now - start >= self.timeout + self.gracePeriod:
+                        del running[receiver]
+                        SearchPortfolio.terminate(receiver, process)
+                        results[name] = PortfolioResult(
+                            name, PortfolioResult.TIMEOUT, ProblemSolving.CUTOFF, now - start
+                        )
+        finally:
+            for receiver, (_, process, _) in running.items():
+                SearchPortfolio.terminate(receiver, process)
+
+        return {name: results[name] for name in self.algorithms}
+
+    @staticmethod
+    def receiveResult(
+        receiver: Connection, name: str, process: multiprocessing.Process, start: float
+    ) -> PortfolioResult:
+        statistics = None
+        try:
+            status, solution, elapsed, error, statistics = receiver.recv()
+        except EOFError:
+            # il processo è terminato senza inviare nulla (es: ucciso dal sistema operativo)
+            process.join()
+            status, solution, elapsed = PortfolioResult.ERROR, ProblemSolving.CUTOFF, time.monotonic() - start
+            error = f"Il processo è terminato inaspettatamente (exit code {process.exitcode})"
+        finally:
+            receiver.close()
+
+        process.join()
+        return PortfolioResult(name, status, solution, elapsed, error, statistics)
+
+    @staticmethod
+    def terminate(receiver: Connection, process: multiprocessing.Process) -> None:
+        process.kill()
+        process.join()
+        receiver.close()
+
+
+def runPortfolioWorker(
+    sender: Connection,
+    search: SearchAlgorithmType,
+    problem: Problem,
+    timeout: float,
+    memoryLimit: Optional[int],
+    collectStatistics: bool = False,
+) -> None:
+    """Corpo di ogni processo del portfolio: esegue la ricerca e invia il risultato al processo padre"""
+    if memoryLimit is not None and resource is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (memoryLimit, memoryLimit))
+
+    stopEvent = Event()
+    timer = Timer(timeout, stopEvent.set)
+    timer.daemon = True
+    timer.start()
+
+    start = time.perf_counter()
+    try:
+        statistics = None
+        if collectStatistics:
+            solution, statistics = ProblemSolving.searchWithStatistics(search, problem, stopEvent)
+        else:
+            solution = search(problem, stopEvent)
+        elapsed = time.perf_counter() - start
+
+        if solution is ProblemSolving.CUTOFF:
+            status = PortfolioResult.TIMEOUT if stopEvent.is_set() else PortfolioResult.CUTOFF
+        elif solution[0] is None:
+            status = PortfolioResult.NO_SOLUTIONS
+        else:
+            status = PortfolioResult.SOLVED
+
+        sender.send((status, solution, elapsed, None, statistics))
+    except MemoryError:
+        sender.send(
+            (
+                PortfolioResult.MEMORY,
+                ProblemSolving.CUTOFF,
+                time.perf_counter() - start,
+                "Limite di memoria superato",
+                None,
+            )
+        )
+    except Exception as e:
+        sender.send(
+            (PortfolioResult.ERROR, ProblemSolving.CUTOFF, time.perf_counter() - start, repr(e), None)
+        )
+    finally:
+        timer.cancel()
+        sender.close()
@@ -0,0 +1,200 @@
+from abc import ABC, abstractmethod
+from collections.abc import Hashable, Iterator
+from itertools import count
+from typing import Any, Optional
+
+
+class PriorityFringe(ABC):
+    """
+    Frontiera con priorità indirizzabile per chiave (tipicamente uno State):
+    ogni chiave compare al più una volta e la sua priorità può essere migliorata (decrease-key)
+    """
+
+    @abstractmethod
+    def push(self, key: Hashable, priority: Any, item: Any) -> bool:
+        """
+        Inserisce **item** con chiave **key**, oppure ne migliora la priorità se la chiave è già presente.
+        Restituisce `False` (senza modificare nulla) se la priorità già presente è migliore o uguale
+        """
+        pass
+
+    @abstractmethod
+    def update(self, key: Hashable, priority: Any, item: Any) -> None:
+        """Inserisce o sostituisce **item** con chiave **key**, con priorità qualsiasi (anche peggiore)"""
+        pass
+
+    @abstractmethod
+    def pop(self) -> Any:
+        """Rimuove e restituisce l'elemento con priorità minore"""
+        pass
+
+    @abstractmethod
+    def peekPriority(self) -> Any:
+        """Restituisce la priorità minore senza rimuovere l'elemento"""
+        pass
+
+    @abstractmethod
+    def remove(self, key: Hashable) -> None:
+        pass
+
+    @abstractmethod
+    def priorityOf(self, key: Hashable) -> Optional[Any]:
+        """Priorità della chiave **key**, `None` se non presente"""
+        pass
+
+    @abstractmethod
+    def __contains__(self, key: Hashable) -> bool:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[tuple[Hashable, Any, Any]]:
+        """Itera sulle terne (chiave, priorità, elemento), in ordine qualsiasi"""
+        pass
+
+
+class IndexedPriorityQueue(PriorityFringe):
+    """
+    Heap binario indirizzabile: per ogni chiave ricorda la sua entry, che a sua volta conosce la propria
+    posizione nello heap, così decrease-key e rimozione costano O(log n) senza lasciare entry obsolete
+    nella coda (e gli spostamenti nello heap non richiedono di ricalcolare l'hash delle chiavi).
+    A parità di priorità viene estratto l'elemento inserito (o migliorato) per primo,
+    quindi gli elementi non vengono mai confrontati tra loro
+    """
+
+    def __init__(self):
+        # entry: [priorità, contatore di inserimento, chiave, elemento, posizione nello heap]
+        self.heap: list[list] = []
+        self.entries: dict[Hashable, list] = {}
+        self.counter = count()
+
+    def push(self, key: Hashable, priority: Any, item: Any) -> bool:
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = [priority, next(self.counter), key, item, len(self.heap)]
+            self.entries[key] = entry
+            self.heap.append(entry)
+            self.siftUp(entry)
+            return True
+
+        if not priority < entry[0]:
+            return False
+
+        entry[0] = priority
+        entry[1] = next(self.counter)
+        entry[3] = item
+        self.siftUp(entry)
+        return True
+
+    def update(self, key: Hashable, priority: Any, item: Any) -> None:
+        if not self.push(key, priority, item):
+            # priorità peggiore (o uguale): la entry può solo scendere nello heap
+            entry = self.entries[key]
+            entry[0] = priority
+            entry[1] = next(self.counter)
+            entry[3] = item
+            self.siftDown(entry)
+
+    def pop(self) -> Any:
+        heap = self.heap
+        last = heap.pop()
+        if len(heap) == 0:
+            del self.entries[last[2]]
+            return last[3]
+
+        top = heap[0]
+        del self.entries[top[2]]
+        heap[0] = last
+        last[4] = 0
+        self.siftToLeaf(last)
+        return top[3]
+
+    def peekPriority(self) -> Any:
+        return self.heap[0][0]
+
+    def remove(self, key: Hashable) -> None:
+        entry = self.entries.pop(key)
+        heap = self.heap
+        last = heap.pop()
+        if last is entry:
+            return
+
+        heap[entry[4]] = last
+        last[4] = entry[4]
+        self.siftUp(last)
+        self.siftDown(last)
+
+    def priorityOf(self, key: Hashable) -> Optional[Any]:
+        entry = self.entries.get(key)
+        return None if entry is None else entry[0]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.entries
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def __iter__(self) -> Iterator[tuple[Hashable, Any, Any]]:
+        for priority, _, key, item, _ in self.heap:
+            yield (key, priority, item)
+
+    # le entry sono liste: il confronto avviene su (priorità, contatore), che è sempre univoco
+
+    def siftUp(self, entry: list) -> None:
+        heap = self.heap
+        position = entry[4]
+        while position > 0:
+            parentPosition = (position - 1) >> 1
+            parent = heap[parentPosition]
+            if not entry < parent:
+                break
+            heap[position] = parent
+            parent[4] = position
+            position = parentPosition
+        heap[position] = entry
+        entry[4] = position
+
+    def siftDown(self, entry: list) -> None:
+        heap = self.heap
+        size = len(heap)
+        position = entry[4]
+        childPosition = 2 * position + 1
+        while childPosition < size:
+            rightPosition = childPosition + 1
+            if rightPosition < size and heap[rightPosition] < heap[childPosition]:
+                childPosition = rightPosition
+            child = heap[childPosition]
+            if not child < entry:
+                break
+            heap[position] = child
+            child[4] = position
+            position = childPosition
+            childPosition = 2 * position + 1
+        heap[position] = entry
+        entry[4] = position
+
+    def siftToLeaf(self, entry: list) -> None:
+        """
+        Come siftDown, ma porta la entry fino a una foglia seguendo il figlio minore e poi la fa risalire:
+        l'ultima entry dello heap (spostata in cima da pop) torna quasi sempre in basso,
+        quindi serve circa la metà dei confronti
+        """
+        heap = self.heap
+        size = len(heap)
+        position = entry[4]
+        childPosition = 2 * position + 1
+        while childPosition < size:
+            rightPosition = childPosition + 1
+            if rightPosition < size and heap[rightPosition] < heap[childPosition]:
+                childPosition = rightPosition
+            child = heap[childPosition]
+            heap[position] = child
+            child[4] = position
+            position = childPosition
+            childPosition = 2 * position + 1
+        heap[position] = entry
+        entry[4] = position
+        self.siftUp(entry)
@@ -1,5 +1,6 @@
+import pickle
 from abc import ABC, abstractmethod
-from typing import Sequence
+from typing import Optional, Sequence
 
 from ai.core.action import Action
 from ai.core.agent import Agent
@@ -42,5 +43,89 @@ class Problem(Task, ABC):
     def isGoalAchieved(self, state: State) -> bool:
         return self.goal.isGoalAchieved(state)
 
+    def expand(
+        self, state: State, heuristicDist: Optional[float] = None, parentAction: Optional[Action] = None
+    ) -> list[tuple[Action, State, float, float]]:
+        """
+        Restituisce tutti i successori di **state** come terne (azione, nuovo stato, costo dell'azione,
+        distanza heuristica del nuovo stato), nell'ordine di `getActionsFromState`.
+        Le sottoclassi possono ridefinirlo per calcolare i successori in un'unica passata;
+        **heuristicDist**, se indicata, è la distanza heuristica di **state** già calcolata (es: dal nodo),
+        da cui aggiornare quella dei figli senza ricalcolarla da zero.
+        **parentAction** è l'azione con cui si è raggiunto **state**: i problemi con azioni reversibili
+        possono omettere il successore generato dalla sua inversa, che è lo stato del padre
+        """
+        successors = []
+        for action in self.getActionsFromState(state):
+            newState = self.transitionModel(state, action)
+            successors.append(
+                (
+                    action,
+                    newState,
+                    self.pathCostFunction(state, action),
+                    self.heuristicDistFunction(newState),
+                )
+            )
+        return successors
+
+    def inverseAction(self, action: Action) -> Optional[Action]:
+        """
+        Azione che annulla **action** (quella che `expand` omette dato **parentAction**),
+        oppure None se il problema non ne omette nessuna
+        """
+        return None
+
+    # Hook opzionali per la ricerca all'indietro (es: ricerca bidirezionale)
+
+    def getGoalStates(self) -> list[State]:
+        """
+        Restituisce la lista esplicita degli stati che soddisfano l'obiettivo,
+        da cui parte la frontiera all'indietro
+        """
+        raise NotImplementedError(f"{type(self).__name__} non espone gli stati obiettivo")
+
+    def getPredecessors(self, state: State) -> list[tuple[Action, State]]:
+        """
+        Restituisce le coppie (azione, stato precedente) tali che eseguendo l'azione
+        a partire dallo stato precedente si ottiene **state** (inverso di `transitionModel`)
+        """
+        raise NotImplementedError(f"{type(self).__name__} non supporta la ricerca all'indietro")
+
+    # Hook per il salvataggio della ricerca (vedi SearchCheckpoint): per default usano pickle
+    # sul singolo stato o azione, le sottoclassi possono ridefinirli con una codifica più compatta
+
+    def encodeState(self, state: State) -> bytes:
+        return pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def decodeState(self, data: bytes) -> State:
+        return pickle.loads(data)
+
+    def encodeAction(self, action: Action) -> bytes:
+        return pickle.dumps(action, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def decodeAction(self, data: bytes) -> Action:
+        return pickle.loads(data)
+
+    # Hook opzionali per numerare gli stati (ranking perfetto): se stateSpaceSize non è None,
+    # stateRank associa ad ogni stato raggiungibile dallo stato iniziale un intero distinto
+    # in [0, stateSpaceSize) e stateFromRank lo inverte
+
+    def stateSpaceSize(self) -> Optional[int]:
+        return None
+
+    def stateRank(self, state: State) -> int:
+        raise NotImplementedError(f"{type(self).__name__} non numera i propri stati")
+
+    def stateFromRank(self, rank: int) -> State:
+        raise NotImplementedError(f"{type(self).__name__} non numera i propri stati")
+
+    def fingerprint(self) -> bytes:
+        """
+        Identifica la definizione del problema (azioni, modello di transizione e costi),
+        esclusi stato iniziale e obiettivo (vedi SolutionCache).
+        Le sottoclassi con parametri che cambiano le soluzioni (es: la mappa) devono ridefinirlo
+        """
+        return f"{type(self).__module__}.{type(self).__qualname__}".encode()
+
     def __str__(self) -> str:
         return f"Parto da:\n{self.initialState}\nDevo raggiungere l'obiettivo:\n{self.goal}\n"
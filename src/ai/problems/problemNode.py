@@ -8,6 +8,9 @@ from ai.problems.problem import Problem
 
 
 class ProblemNode:
+    # niente __dict__ per istanza: le ricerche generano milioni di nodi
+    __slots__ = ("parent", "children", "state", "action", "pathCost", "heuristicDist")
+
     def __init__(
         self,
         parent: Optional[ProblemNode],
@@ -15,37 +18,53 @@ class ProblemNode:
         action: Optional[Action],
         pathCost: float,
         heuristicDist: float,
+        retainTree: bool = False,
     ):
         """
         **parent**: *Optional[ProblemNode]*       - il nodo padre (None se è la radice)
-        **children**: *list[Node]*                - i nodi figli associati
+        **children**: *Optional[list[Node]]*      - i nodi figli associati (None se l'albero non viene mantenuto)
         **state**: *State*                        - lo stato associato al nodo
         **action**: *Optional[Action]*            - l'azione che ha portato a generare il nodo
         **pathCost**: *float*                     - costo per raggiungere il nodo a partire dalla radice
         **heuristicDist**: *float*                - distanza heuristica dalla/e destinazione/i
+        **retainTree**: *bool*                    - se True i figli vengono memorizzati in children (anche nei discendenti)
         """
         self.parent = parent
-        self.children: list[ProblemNode] = []
+        self.children: Optional[list[ProblemNode]] = [] if retainTree else None
         self.state = state
         self.action = action
         self.pathCost = pathCost
         self.heuristicDist = heuristicDist
 
-        
     def createChild(self, newState: State, action: Action, problem: Problem) -> ProblemNode:
+        return self.createSuccessor(
+            action,
+            newState,
+            problem.pathCostFunction(self.state, action),
+            problem.heuristicDistFunction(newState),
+        )
+
+    def createSuccessor(
+        self, action: Action, newState: State, stepCost: float, heuristicDist: float
+    ) -> ProblemNode:
+        """Crea un nodo figlio a partire da un successore già calcolato (vedi `Problem.expand`)"""
         return ProblemNode(
             parent=self,
             action=action,
             state=newState,
-            pathCost=self.pathCost + problem.pathCostFunction(self.state, action),
-            heuristicDist=problem.heuristicDistFunction(newState),
+            pathCost=self.pathCost + stepCost,
+            heuristicDist=heuristicDist,
+            retainTree=self.children is not None,
         )
 
     def addChild(self, child: ProblemNode) -> None:
-        self.children.append(child)
+        # i figli vengono ricordati solo se l'albero viene mantenuto,
+        # altrimenti ogni nodo resta vivo solo finché è in frontiera o antenato di un nodo in frontiera
+        if self.children is not None:
+            self.children.append(child)
         child.parent = self
-        
-    def childNode(self,  problem: Problem, action: Action) -> ProblemNode:
+
+    def childNode(self, problem: Problem, action: Action) -> ProblemNode:
         """
         Crea un nodo figlio usando il metodo astratto `createChild` che ogni sottoclasse deve implementare.
         """
@@ -56,7 +75,34 @@ class ProblemNode:
 
         self.addChild(newNode)
         return newNode
-    
+
+    def expand(self, problem: Problem) -> list[ProblemNode]:
+        """
+        Crea tutti i nodi figli con un'unica chiamata a `Problem.expand`
+        """
+        children = [
+            self.createSuccessor(action, newState, stepCost, heuristicDist)
+            for action, newState, stepCost, heuristicDist in problem.expand(
+                self.state, self.heuristicDist, self.action
+            )
+        ]
+        if self.children is not None:
+            self.children.extend(children)
+        return children
+
+    def predecessorNode(self, problem: Problem, action: Action, previousState: State) -> ProblemNode:
+        """
+        Crea un nodo della ricerca all'indietro: **previousState** è lo stato da cui, eseguendo **action**,
+        si raggiunge lo stato di questo nodo. Il pathCost è il costo per raggiungere l'obiettivo
+        """
+        return ProblemNode(
+            parent=self,
+            action=action,
+            state=previousState,
+            pathCost=self.pathCost + problem.pathCostFunction(previousState, action),
+            heuristicDist=0,
+        )
+
     # operators (by pathCost)
     def comparisonValue(self):
         return self.pathCost
@@ -84,3 +130,63 @@ class ProblemNode:
     def __ge__(self, other) -> bool:
         """self >= other."""
         return isinstance(other, type(self)) and self.comparisonValue() >= other.comparisonValue()
+
+
+class SMAStarNode(ProblemNode):
+    """
+    Nodo usato da SMA*: oltre ai dati di `ProblemNode` mantiene la profondità, il valore f
+    (eventualmente aggiornato dai figli) e i valori f dei figli dimenticati per liberare memoria.
+    **children** contiene solo i figli attualmente in memoria
+    """
+
+    __slots__ = ("depth", "f", "forgotten", "expanded", "inOpen", "inMemory", "version")
+
+    def __init__(
+        self,
+        parent: Optional[SMAStarNode],
+        state: State,
+        action: Optional[Action],
+        pathCost: float,
+        heuristicDist: float,
+        depth: int = 0,
+    ):
+        super().__init__(parent, state, action, pathCost, heuristicDist, retainTree=True)
+        self.depth = depth
+        self.f = pathCost + heuristicDist
+        self.forgotten: dict[Action, float] = {}
+        self.expanded = False
+        self.inOpen = False
+        self.inMemory = True
+        # incrementato ad ogni modifica, invalida le vecchie entry nelle code di priorità
+        self.version = 0
+
+    def createSuccessor(
+        self, action: Action, newState: State, stepCost: float, heuristicDist: float
+    ) -> SMAStarNode:
+        child = SMAStarNode(
+            parent=self,
+            action=action,
+            state=newState,
+            pathCost=self.pathCost + stepCost,
+            heuristicDist=heuristicDist,
+            depth=self.depth + 1,
+        )
+        # pathmax: f non decresce lungo un percorso
+        child.f = max(child.f, self.f)
+        return child
+
+    def isLeaf(self) -> bool:
+        return len(self.children) == 0
+
+    def openKey(self) -> float:
+        """Priorità nella frontiera: f del nodo se mai espanso, altrimenti il miglior figlio dimenticato"""
+        if not self.expanded:
+            return self.f
+        return min(self.forgotten.values(), default=float("inf"))
+
+    def backedUpValue(self) -> float:
+        """Minimo valore f tra i figli in memoria e quelli dimenticati"""
+        return min(
+            min((child.f for child in self.children), default=float("inf")),
+            min(self.forgotten.values(), default=float("inf")),
+        )
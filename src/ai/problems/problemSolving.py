@@ -1,6 +1,9 @@
+import os
+import time
 from collections import deque
-from collections.abc import Callable
-from heapq import heappop, heappush
+from collections.abc import Callable, Iterable, Iterator
+from heapq import heapify, heappop, heappush
+from itertools import count
 from threading import Event
 from typing import Optional
 
@@ -8,18 +11,38 @@ from ai.core.action import Action
 from ai.core.agent import Agent
 from ai.core.state import State
 from ai.core.taskSolver import TaskSolver
+from ai.problems.bitsetStateSet import BitsetStateSet
 from ai.problems.problem import Problem
-from ai.problems.problemNode import ProblemNode
+from ai.problems.priorityQueue import IndexedPriorityQueue, PriorityFringe
+from ai.problems.problemNode import ProblemNode, SMAStarNode
+from ai.problems.searchCheckpoint import SearchCheckpoint
+from ai.problems.searchEvents import FinishedEvent, ProgressEvent, SearchEvent, SolutionEvent
+from ai.problems.searchStatistics import SearchStatistics
 
 type SolutionType = Optional[tuple[Optional[list[Action]], float]]
 type SearchAlgorithmType = Callable[[Problem, Event], SolutionType]
 type CostFunctionType = Callable[[ProblemNode], float]
+type FringeFactoryType = Callable[[], PriorityFringe]
+type LimitScheduleType = Callable[[float, float], float]
+type SolutionCallbackType = Callable[[SolutionType, float], None]
+type DepthMeasureType = Callable[[ProblemNode, int], float]
+type SearchStreamType = Iterator[SearchEvent]
+type ExploredSetType = set[State] | BitsetStateSet
 
 
 class ProblemSolving(TaskSolver):
     CUTOFF = None
     NO_SOLUTIONS = (None, -1)
 
+    # se True, ogni nodo generato viene memorizzato anche nella lista children del padre
+    # (utile per ispezionare l'albero di ricerca, ma lo mantiene interamente in memoria)
+    retainTree = False
+
+    # se True, per i problemi che numerano i propri stati (`Problem.stateSpaceSize`) gli insiemi degli
+    # esplorati sono array di bit indicizzati dal rango dello stato (vedi BitsetStateSet):
+    # pochi KB invece di un set di stati, ma ogni inserimento e ricerca calcola il rango
+    compactExplored = False
+
     def __init__(self, agent: Agent, problem: Problem):
         super().__init__(problem)
 
@@ -63,6 +86,23 @@ class ProblemSolving(TaskSolver):
                 self.agent.executeAction(action, self.problem)
                 self.currenState = self.problem.environment.currentState
 
+    @staticmethod
+    def createExploredSet(problem: Problem, states: Iterable[State] = ()) -> ExploredSetType:
+        if ProblemSolving.compactExplored and problem.stateSpaceSize() is not None:
+            return BitsetStateSet(problem, states)
+        return set(states)
+
+    @staticmethod
+    def createRootNode(problem: Problem) -> ProblemNode:
+        return ProblemNode(
+            parent=None,
+            state=problem.initialState,
+            action=None,
+            pathCost=0,
+            heuristicDist=problem.heuristicDistFunction(problem.initialState),
+            retainTree=ProblemSolving.retainTree,
+        )
+
     @staticmethod
     def backtrackSolution(node: ProblemNode) -> SolutionType:
         actions = deque()
@@ -74,54 +114,276 @@ class ProblemSolving(TaskSolver):
         return (list[Action](actions), cost)
 
     @staticmethod
-    def breadthFirstSearch(problem: Problem, stopEvent: Event) -> SolutionType:
-        node = ProblemNode(
-            parent=None,
-            state=problem.initialState,
-            action=None,
-            pathCost=0,
-            heuristicDist=problem.heuristicDistFunction(problem.initialState),
-        )
+    def searchWithStatistics(
+        search: SearchAlgorithmType, problem: Problem, stopEvent: Event
+    ) -> tuple[SolutionType, SearchStatistics]:
+        """
+        Esegue **search** (che deve accettare il parametro opzionale `statistics`)
+        e restituisce la soluzione insieme alle statistiche raccolte
+        """
+        statistics = SearchStatistics()
+        statistics.start()
+        solution = ProblemSolving.CUTOFF
+        try:
+            solution = search(problem, stopEvent, statistics=statistics)
+        finally:
+            actions = None if solution is None else solution[0]
+            statistics.stop(None if actions is None else len(actions))
+        return (solution, statistics)
+
+    # Salvataggio e ripresa delle ricerche (checkpoint)
 
-        if problem.isGoalAchieved(node.state):
-            return ProblemSolving.backtrackSolution(node)
+    @staticmethod
+    def loadCheckpoint(problem: Problem, checkpointPath: Optional[str], kind: int) -> Optional[SearchCheckpoint]:
+        """Legge il checkpoint da cui riprendere la ricerca, se **checkpointPath** esiste"""
+        if checkpointPath is None or not os.path.exists(checkpointPath):
+            return None
+
+        checkpoint = SearchCheckpoint.load(checkpointPath, problem)
+        # esplorati e distanze heuristiche salvati valgono solo per lo stesso problema e lo stesso obiettivo
+        if (
+            checkpoint.kind != kind
+            or checkpoint.problemKey != SearchCheckpoint.problemKey(problem)
+            or checkpoint.rootState() != problem.initialState
+        ):
+            raise ValueError(f"Il checkpoint {checkpointPath} non appartiene a questa ricerca")
+        return checkpoint
 
-        fringe: deque[ProblemNode] = deque()
-        fringe.appendleft(node)
+    @staticmethod
+    def nextCheckpointTime(checkpointPath: Optional[str], checkpointInterval: Optional[float]) -> Optional[float]:
+        if checkpointPath is None or checkpointInterval is None:
+            return None
+        return time.perf_counter() + checkpointInterval
+
+    @staticmethod
+    def completeCheckpoint(checkpointPath: Optional[str], solution: SolutionType) -> SolutionType:
+        """Una ricerca conclusa (con o senza soluzione) non va ripresa: il suo checkpoint viene eliminato"""
+        if checkpointPath is not None and os.path.exists(checkpointPath):
+            os.remove(checkpointPath)
+        return solution
+
+    # Versioni a generatore (stream): producono eventi di avanzamento e le soluzioni appena trovate
+
+    @staticmethod
+    def finishStream(solution: SolutionType, start: float, bound: Optional[float] = None) -> SearchStreamType:
+        """Eventi conclusivi di una ricerca non anytime: la soluzione (se trovata) e la terminazione"""
+        elapsed = time.perf_counter() - start
+        if solution is not None and solution[0] is not None:
+            yield SolutionEvent(solution, bound, elapsed)
+        yield FinishedEvent(solution, bound, elapsed)
+
+    @staticmethod
+    def consumeStream(
+        events: SearchStreamType, onSolution: Optional[SolutionCallbackType] = None
+    ) -> FinishedEvent:
+        """
+        Esegue uno stream fino alla fine (versione bloccante) e ne restituisce l'evento finale.
+        **onSolution**, se presente, riceve ogni soluzione con il suo limite di subottimalità
+        """
+        for event in events:
+            if type(event) is SolutionEvent and onSolution is not None:
+                onSolution(event.solution, event.bound)
+            elif type(event) is FinishedEvent:
+                return event
+        raise RuntimeError("Lo stream è terminato senza un FinishedEvent")
+
+    @staticmethod
+    def breadthFirstSearch(
+        problem: Problem,
+        stopEvent: Event,
+        statistics: Optional[SearchStatistics] = None,
+        checkpointPath: Optional[str] = None,
+        checkpointInterval: Optional[float] = None,
+    ) -> SolutionType:
+        """
+        **statistics**: *SearchStatistics*        - se presente, raccoglie i contatori della ricerca\\
+        **checkpointPath**: *Optional[str]*       - se presente, la ricerca riprende da questo checkpoint (se esiste)
+                                                    e vi salva il proprio stato quando viene interrotta\\
+        **checkpointInterval**: *Optional[float]* - se presente, salva il checkpoint anche ogni tot secondi
+        """
+        checkpoint = ProblemSolving.loadCheckpoint(problem, checkpointPath, SearchCheckpoint.BREADTH_FIRST)
+        if checkpoint is None:
+            node = ProblemSolving.createRootNode(problem)
+
+            if problem.isGoalAchieved(node.state):
+                return ProblemSolving.backtrackSolution(node)
+
+            fringe: deque[ProblemNode] = deque()
+            fringe.appendleft(node)
 
-        explored: set = set()
+            explored = ProblemSolving.createExploredSet(problem)
+        else:
+            # il checkpoint elenca la frontiera in ordine di estrazione (che avviene da destra)
+            fringe = deque(reversed(checkpoint.frontier))
+            explored = ProblemSolving.createExploredSet(problem, checkpoint.explored)
+
+        nextCheckpoint = ProblemSolving.nextCheckpointTime(checkpointPath, checkpointInterval)
 
         while True:
             if stopEvent.is_set():
+                if checkpointPath is not None and len(fringe) > 0:
+                    checkpoint = SearchCheckpoint(SearchCheckpoint.BREADTH_FIRST, list(reversed(fringe)), explored)
+                    checkpoint.save(checkpointPath, problem)
                 return ProblemSolving.CUTOFF
 
             if len(fringe) == 0:
-                return ProblemSolving.NO_SOLUTIONS
+                return ProblemSolving.completeCheckpoint(checkpointPath, ProblemSolving.NO_SOLUTIONS)
+
+            if nextCheckpoint is not None and time.perf_counter() >= nextCheckpoint:
+                checkpoint = SearchCheckpoint(SearchCheckpoint.BREADTH_FIRST, list(reversed(fringe)), explored)
+                checkpoint.save(checkpointPath, problem)
+                nextCheckpoint = ProblemSolving.nextCheckpointTime(checkpointPath, checkpointInterval)
 
             # prende il più vecchio nodo inserito e lo espande
             node = fringe.pop()
             explored.add(node.state)
 
+            children = node.expand(problem)
+            if statistics is not None:
+                statistics.expanded += 1
+                statistics.generated += len(children)
+                statistics.updatePeaks(len(fringe) + 1, len(explored))
+
             # per ogni azione trova il nodo destinazione corrispondente
             # quindi, se lo stato associato non è stato già esplorato,
             # verifica se ha raggiunto l'obiettivo e in tal caso restituisce la soluzione;
             # altrimenti aggiunge il nodo alla frontiera
-            for action in problem.getActionsFromState(node.state):
-                child = node.childNode(problem, action)
+            for child in children:
                 if child.state not in explored:
                     if problem.isGoalAchieved(child.state):
-                        return ProblemSolving.backtrackSolution(child)
+                        return ProblemSolving.completeCheckpoint(
+                            checkpointPath, ProblemSolving.backtrackSolution(child)
+                        )
                     fringe.appendleft(child)
+                elif statistics is not None:
+                    statistics.duplicates += 1
+
+    # Ricerca di frontiera: niente insieme degli esplorati, solo gli ultimi livelli della BFS
 
     @staticmethod
-    def depthFirstSearch(problem: Problem, stopEvent: Event) -> SolutionType:
-        node = ProblemNode(
-            parent=None,
-            state=problem.initialState,
-            action=None,
-            pathCost=0,
-            heuristicDist=problem.heuristicDistFunction(problem.initialState),
+    def frontierBreadthFirstSearch(
+        problem: Problem, stopEvent: Event, statistics: Optional[SearchStatistics] = None
+    ) -> SolutionType:
+        """
+        BFS per problemi con azioni reversibili (lo stato di partenza è raggiungibile da ogni suo successore):
+        un successore del livello k può già trovarsi solo nei livelli k - 1, k o k + 1, quindi in memoria
+        restano solo questi tre livelli invece dell'insieme di tutti gli stati esplorati.
+        Con azioni non reversibili gli stati già visitati possono essere rigenerati
+        (e, se non ci sono soluzioni, la ricerca può non terminare).
+
+        Senza puntatori ai padri il percorso viene ricostruito con il divide et impera:
+        una volta nota la profondità d dell'obiettivo, una seconda ricerca associa ad ogni stato
+        il proprio antenato a profondità d / 2 (relay), che divide il problema in due metà risolte
+        allo stesso modo. Il costo è circa il doppio di una BFS, con la memoria di tre livelli
+        """
+        root = problem.initialState
+        found = ProblemSolving.frontierLayers(problem, stopEvent, root, problem.isGoalAchieved, 0, statistics)
+        if found is None:
+            return ProblemSolving.CUTOFF
+        depth, goalState, _ = found
+        if depth < 0:
+            return ProblemSolving.NO_SOLUTIONS
+
+        steps = ProblemSolving.frontierPath(problem, stopEvent, root, goalState, depth, statistics)
+        if steps is None:
+            return ProblemSolving.CUTOFF
+
+        cost = sum(problem.pathCostFunction(state, action) for state, action in steps)
+        return ([action for _, action in steps], cost)
+
+    @staticmethod
+    def frontierLayers(
+        problem: Problem,
+        stopEvent: Event,
+        start: State,
+        isTarget: Callable[[State], bool],
+        relayDepth: int,
+        statistics: Optional[SearchStatistics] = None,
+    ) -> Optional[tuple[int, Optional[State], Optional[State]]]:
+        """
+        BFS a livelli da **start** fino al primo stato che soddisfa **isTarget**.
+        Restituisce (profondità, stato trovato, suo antenato a profondità **relayDepth**),
+        (-1, None, None) se non ci sono soluzioni, oppure None se la ricerca è stata interrotta
+        """
+        if isTarget(start):
+            return (0, start, start)
+
+        # ogni livello associa ad uno stato il suo antenato a profondità relayDepth (None se più in basso)
+        previous: dict[State, Optional[State]] = {}
+        current: dict[State, Optional[State]] = {start: start if relayDepth == 0 else None}
+        depth = 0
+
+        while len(current) > 0:
+            following: dict[State, Optional[State]] = {}
+            for state, relay in current.items():
+                if stopEvent.is_set():
+                    return None
+
+                successors = problem.expand(state)
+                if statistics is not None:
+                    statistics.expanded += 1
+                    statistics.generated += len(successors)
+
+                for _, child, _, _ in successors:
+                    if child in current or child in previous or child in following:
+                        if statistics is not None:
+                            statistics.duplicates += 1
+                        continue
+
+                    childRelay = child if depth + 1 == relayDepth else relay
+                    if isTarget(child):
+                        return (depth + 1, child, childRelay)
+                    following[child] = childRelay
+
+            if statistics is not None:
+                statistics.updatePeaks(len(following), len(previous) + len(current))
+            previous, current = current, following
+            depth += 1
+
+        return (-1, None, None)
+
+    @staticmethod
+    def frontierPath(
+        problem: Problem,
+        stopEvent: Event,
+        start: State,
+        target: State,
+        depth: int,
+        statistics: Optional[SearchStatistics] = None,
+    ) -> Optional[list[tuple[State, Action]]]:
+        """
+        Passi (stato, azione) di un percorso minimo da **start** a **target**, che si trova a profondità **depth**
+        (None se la ricerca è stata interrotta)
+        """
+        if depth == 0:
+            return []
+        if depth == 1:
+            for action, child, _, _ in problem.expand(start):
+                if child == target:
+                    return [(start, action)]
+            raise ValueError(f"{target} non è un successore di {start}")
+
+        middle = depth // 2
+        found = ProblemSolving.frontierLayers(
+            problem, stopEvent, start, lambda state: state == target, middle, statistics
         )
+        if found is None:
+            return None
+        relay = found[2]
+
+        first = ProblemSolving.frontierPath(problem, stopEvent, start, relay, middle, statistics)
+        if first is None:
+            return None
+        second = ProblemSolving.frontierPath(problem, stopEvent, relay, target, depth - middle, statistics)
+        if second is None:
+            return None
+        return first + second
+
+    @staticmethod
+    def depthFirstSearch(
+        problem: Problem, stopEvent: Event, statistics: Optional[SearchStatistics] = None
+    ) -> SolutionType:
+        node = ProblemSolving.createRootNode(problem)
 
         if problem.isGoalAchieved(node.state):
             return ProblemSolving.backtrackSolution(node)
@@ -129,7 +391,7 @@ class ProblemSolving(TaskSolver):
         fringe: deque[ProblemNode] = deque()
         fringe.append(node)
 
-        explored: set[State] = set()
+        explored = ProblemSolving.createExploredSet(problem)
 
         while True:
             if stopEvent.is_set():
@@ -142,35 +404,42 @@ class ProblemSolving(TaskSolver):
             node = fringe.pop()
             explored.add(node.state)
 
+            children = node.expand(problem)
+            if statistics is not None:
+                statistics.expanded += 1
+                statistics.generated += len(children)
+                statistics.updatePeaks(len(fringe) + 1, len(explored))
+
             # per ogni azione trova il nodo destinazione corrispondente
             # quindi, se lo stato associato non è stato già esplorato,
             # verifica se ha raggiunto l'obiettivo e in tal caso restituisce la soluzione;
             # altrimenti aggiunge il nodo alla frontiera
-            for action in problem.getActionsFromState(node.state):
-                child = node.childNode(problem, action)
+            for child in children:
                 if child.state not in explored:
                     if problem.isGoalAchieved(child.state):
                         return ProblemSolving.backtrackSolution(child)
                     fringe.append(child)
+                elif statistics is not None:
+                    statistics.duplicates += 1
 
     @staticmethod
-    def depthFirstSearchRecursive(problem: Problem, stopEvent: Event) -> SolutionType:
-        initialNode = ProblemNode(
-            parent=None,
-            state=problem.initialState,
-            action=None,
-            pathCost=0,
-            heuristicDist=problem.heuristicDistFunction(problem.initialState),
-        )
+    def depthFirstSearchRecursive(
+        problem: Problem, stopEvent: Event, statistics: Optional[SearchStatistics] = None
+    ) -> SolutionType:
+        initialNode = ProblemSolving.createRootNode(problem)
 
-        explored: set[State] = set()
+        explored = ProblemSolving.createExploredSet(problem)
         return ProblemSolving.depthFirstSearchRecursiveHelper(
-            problem, stopEvent, initialNode, explored
+            problem, stopEvent, initialNode, explored, statistics
         )
 
     @staticmethod
     def depthFirstSearchRecursiveHelper(
-        problem: Problem, stopEvent: Event, node: ProblemNode, explored: set[State]
+        problem: Problem,
+        stopEvent: Event,
+        node: ProblemNode,
+        explored: ExploredSetType,
+        statistics: Optional[SearchStatistics] = None,
     ) -> SolutionType:
         if stopEvent.is_set():
             return ProblemSolving.CUTOFF
@@ -180,33 +449,37 @@ class ProblemSolving(TaskSolver):
 
         explored.add(node.state)
 
-        for action in problem.getActionsFromState(node.state):
-            child = node.childNode(problem, action)
+        children = node.expand(problem)
+        if statistics is not None:
+            statistics.expanded += 1
+            statistics.generated += len(children)
+            statistics.updatePeaks(0, len(explored))
+
+        for child in children:
 
             if child.state not in explored:
                 solution = ProblemSolving.depthFirstSearchRecursiveHelper(
-                    problem, stopEvent, child, explored
+                    problem, stopEvent, child, explored, statistics
                 )
                 if solution is not ProblemSolving.NO_SOLUTIONS:
                     return solution
+            elif statistics is not None:
+                statistics.duplicates += 1
 
         return ProblemSolving.NO_SOLUTIONS
 
     @staticmethod
     def depthFirstSearchRecursiveLimited(
-        problem: Problem, stopEvent: Event, limit: int
+        problem: Problem,
+        stopEvent: Event,
+        limit: int,
+        statistics: Optional[SearchStatistics] = None,
     ) -> SolutionType:
-        initialNode = ProblemNode(
-            parent=None,
-            state=problem.initialState,
-            action=None,
-            pathCost=0,
-            heuristicDist=problem.heuristicDistFunction(problem.initialState),
-        )
+        initialNode = ProblemSolving.createRootNode(problem)
 
-        explored: set[State] = set()
+        explored = ProblemSolving.createExploredSet(problem)
         return ProblemSolving.depthFirstSearchRecursiveLimitedHelper(
-            problem, stopEvent, initialNode, explored, limit
+            problem, stopEvent, initialNode, explored, limit, statistics
         )
 
     @staticmethod
@@ -214,8 +487,9 @@ class ProblemSolving(TaskSolver):
         problem: Problem,
         stopEvent: Event,
         node: ProblemNode,
-        explored: set[State],
+        explored: ExploredSetType,
         limit: int,
+        statistics: Optional[SearchStatistics] = None,
     ) -> SolutionType:
         if stopEvent.is_set():
             return ProblemSolving.CUTOFF
@@ -228,19 +502,26 @@ class ProblemSolving(TaskSolver):
 
         explored.add(node.state)  # Segniamo lo stato come visitato
 
+        children = node.expand(problem)
+        if statistics is not None:
+            statistics.expanded += 1
+            statistics.generated += len(children)
+            statistics.updatePeaks(0, len(explored))
+
         cutoff_occurred = False
 
-        for action in problem.getActionsFromState(node.state):
-            child = node.childNode(problem, action)
+        for child in children:
 
             if child.state not in explored:
                 solution = ProblemSolving.depthFirstSearchRecursiveLimitedHelper(
-                    problem, stopEvent, child, explored, limit - 1
+                    problem, stopEvent, child, explored, limit - 1, statistics
                 )
                 if solution is ProblemSolving.CUTOFF:
                     cutoff_occurred = True
                 elif solution is not ProblemSolving.NO_SOLUTIONS:
                     return solution
+            elif statistics is not None:
+                statistics.duplicates += 1
 
         if cutoff_occurred:
             return ProblemSolving.CUTOFF
@@ -248,85 +529,1232 @@ class ProblemSolving(TaskSolver):
         # non ci sono soluzioni (nessun CUTOFF)
         return ProblemSolving.NO_SOLUTIONS
 
+    # Versioni iterative (senza ricorsione) della ricerca in profondità
+
+    @staticmethod
+    def depthLimitedSearch(
+        problem: Problem,
+        stopEvent: Event,
+        limit: float,
+        statistics: Optional[SearchStatistics] = None,
+    ) -> SolutionType:
+        """
+        Ricerca in profondità limitata a **limit** livelli, con uno stack esplicito al posto della ricorsione.
+        I cicli vengono evitati controllando solo gli stati del percorso corrente (nessun explored condiviso
+        tra i rami), quindi la memoria è proporzionale alla profondità e nessun percorso più corto viene perso
+        """
+        node = ProblemSolving.createRootNode(problem)
+
+        if problem.isGoalAchieved(node.state):
+            return ProblemSolving.backtrackSolution(node)
+
+        # lo stack contiene i nodi del percorso corrente, ognuno con i figli ancora da provare
+        # (il figlio si trova quindi a profondità len(stack))
+        children = node.expand(problem)
+        stack: list[tuple[ProblemNode, Iterator[ProblemNode]]] = [(node, iter(children))]
+        pathStates: set[State] = {node.state}
+        if statistics is not None:
+            statistics.expanded += 1
+            statistics.generated += len(children)
+            statistics.updatePeaks(1, 1)
+
+        cutoffOccurred = False
+
+        while len(stack) > 0:
+            if stopEvent.is_set():
+                return ProblemSolving.CUTOFF
+
+            node, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                # tutti i figli provati: torna indietro
+                stack.pop()
+                pathStates.remove(node.state)
+                continue
+
+            if child.state in pathStates:
+                if statistics is not None:
+                    statistics.duplicates += 1
+                continue
+
+            if problem.isGoalAchieved(child.state):
+                return ProblemSolving.backtrackSolution(child)
+
+            if len(stack) >= limit:
+                cutoffOccurred = True
+                continue
+
+            pathStates.add(child.state)
+            children = child.expand(problem)
+            stack.append((child, iter(children)))
+            if statistics is not None:
+                statistics.expanded += 1
+                statistics.generated += len(children)
+                statistics.updatePeaks(len(stack), len(pathStates))
+
+        if cutoffOccurred:
+            return ProblemSolving.CUTOFF
+
+        # non ci sono soluzioni (nessun CUTOFF)
+        return ProblemSolving.NO_SOLUTIONS
+
+    @staticmethod
+    def depthFirstSearchIterative(
+        problem: Problem, stopEvent: Event, statistics: Optional[SearchStatistics] = None
+    ) -> SolutionType:
+        return ProblemSolving.depthLimitedSearch(problem, stopEvent, float("inf"), statistics)
+
     @staticmethod
-    def iterativeDeepeningSearch(problem: Problem, stopEvent: Event) -> SolutionType:
+    def iterativeDeepeningSearch(
+        problem: Problem, stopEvent: Event, statistics: Optional[SearchStatistics] = None
+    ) -> SolutionType:
         limit = 1
         while True:
             if stopEvent.is_set():
                 return ProblemSolving.CUTOFF
 
-            solution = ProblemSolving.depthFirstSearchRecursiveLimited(problem, stopEvent, limit)
+            solution = ProblemSolving.depthLimitedSearch(problem, stopEvent, limit, statistics)
             if solution is not ProblemSolving.CUTOFF:
                 return solution
             limit += 1
 
-    # Algoritmi di ricerca basati su un costo (best-first)
+    # Iterative deepening incrementale: ogni iterazione riparte dai nodi di confine della precedente
 
     @staticmethod
-    def bestFirstSearch(
-        problem: Problem, stopEvent: Event, costFunction: CostFunctionType
+    def linearLimitSchedule(limit: float, minExceeded: float) -> float:
+        """Aumenta il limite di 1 (come iterativeDeepeningSearch)"""
+        return max(limit + 1, minExceeded)
+
+    @staticmethod
+    def geometricLimitSchedule(factor: float) -> LimitScheduleType:
+        """Moltiplica il limite per **factor** ad ogni iterazione"""
+        return lambda limit, minExceeded: max(limit * factor, minExceeded)
+
+    @staticmethod
+    def fBoundLimitSchedule(limit: float, minExceeded: float) -> float:
+        """Porta il limite al minimo valore che lo ha superato (come IDA*)"""
+        return minExceeded
+
+    @staticmethod
+    def iterativeDeepeningSearchIncremental(
+        problem: Problem,
+        stopEvent: Event,
+        limitSchedule: Optional[LimitScheduleType] = None,
+        boundFunction: Optional[CostFunctionType] = None,
+        statistics: Optional[SearchStatistics] = None,
     ) -> SolutionType:
-        node = ProblemNode(
-            parent=None,
-            state=problem.initialState,
-            action=None,
-            pathCost=0,
-            heuristicDist=problem.heuristicDistFunction(problem.initialState),
-        )
+        """
+        Iterative deepening che non rigenera i livelli già visitati: i nodi che superano il limite
+        (nodi di confine) vengono conservati e l'iterazione successiva riparte da loro.
 
-        if problem.isGoalAchieved(node.state):
-            return ProblemSolving.backtrackSolution(node)
+        **limitSchedule**: *LimitScheduleType*     - calcola il nuovo limite dal precedente e dal minimo valore
+                                                     che lo ha superato (default: linearLimitSchedule)\\
+        **boundFunction**: *CostFunctionType*      - grandezza limitata (default: la profondità; ad esempio
+                                                     `pathCost + heuristicDist` per un limite su f)
 
-        fringe: list[tuple[float, ProblemNode]] = []
-        heappush(fringe, (costFunction(node), node))
+        La soluzione restituita è quella con valore limitato minore (la meno profonda, con il default)
+        """
+        if limitSchedule is None:
+            limitSchedule = ProblemSolving.linearLimitSchedule
 
-        costMap: dict[State, float] = {node.state: node.pathCost}
+        if boundFunction is None:
+            measure = lambda node, depth: depth
+        else:
+            measure = lambda node, depth: boundFunction(node)
 
-        explored: set[State] = set()
+        node = ProblemSolving.createRootNode(problem)
+
+        # nodi di confine: generati ma non ancora verificati né espansi, con profondità e valore limitato.
+        # Per ogni stato basta conservare il nodo con valore minore: gli altri visiterebbero lo stesso sottoalbero
+        boundary: dict[State, tuple[ProblemNode, int, float]] = {node.state: (node, 0, measure(node, 0))}
+        limit = float("-inf")
 
         while True:
             if stopEvent.is_set():
                 return ProblemSolving.CUTOFF
 
-            if len(fringe) == 0:
+            if len(boundary) == 0:
                 return ProblemSolving.NO_SOLUTIONS
 
-            node: ProblemNode = heappop(fringe)[1]
-            # ignora se già esplorato (controllo anche qui perché non rimuovo dalla fringe)
-            if node.state in explored:
+            limit = limitSchedule(limit, min(entry[2] for entry in boundary.values()))
+
+            nextBoundary: dict[State, tuple[ProblemNode, int, float]] = {}
+            best: Optional[ProblemNode] = None
+            bestMeasure = float("inf")
+
+            for node, depth, nodeMeasure in boundary.values():
+                if nodeMeasure > limit:
+                    ProblemSolving.addBoundaryNode(nextBoundary, node, depth, nodeMeasure)
+                    continue
+
+                goal, goalMeasure = ProblemSolving.deepenFromBoundaryNode(
+                    problem,
+                    stopEvent,
+                    node,
+                    depth,
+                    limit,
+                    measure,
+                    bestMeasure,
+                    nextBoundary,
+                    statistics,
+                )
+                if stopEvent.is_set():
+                    return ProblemSolving.CUTOFF
+
+                if goal is not None and goalMeasure < bestMeasure:
+                    best, bestMeasure = goal, goalMeasure
+
+            # tutti i nodi con valore entro il limite sono stati visitati: la soluzione migliore è definitiva
+            if best is not None:
+                return ProblemSolving.backtrackSolution(best)
+
+            boundary = nextBoundary
+
+    @staticmethod
+    def addBoundaryNode(
+        boundary: dict[State, tuple[ProblemNode, int, float]],
+        node: ProblemNode,
+        depth: int,
+        nodeMeasure: float,
+    ) -> None:
+        curr = boundary.get(node.state)
+        if curr is None or nodeMeasure < curr[2]:
+            boundary[node.state] = (node, depth, nodeMeasure)
+
+    @staticmethod
+    def deepenFromBoundaryNode(
+        problem: Problem,
+        stopEvent: Event,
+        node: ProblemNode,
+        depth: int,
+        limit: float,
+        measure: Callable[[ProblemNode, int], float],
+        bestMeasure: float,
+        boundary: dict[State, tuple[ProblemNode, int, float]],
+        statistics: Optional[SearchStatistics] = None,
+    ) -> tuple[Optional[ProblemNode], float]:
+        """
+        Visita in profondità (con stack esplicito) il sottoalbero di **node** fino a **limit**,
+        aggiungendo a **boundary** i nodi che lo superano. Restituisce il nodo obiettivo con valore minore
+        di **bestMeasure** (e il suo valore), se trovato
+        """
+        best: Optional[ProblemNode] = None
+
+        if problem.isGoalAchieved(node.state):
+            nodeMeasure = measure(node, depth)
+            # un nodo di confine obiettivo vale solo se migliora la soluzione già trovata
+            if nodeMeasure >= bestMeasure:
+                return (None, bestMeasure)
+            return (node, nodeMeasure)
+
+        # stati del percorso dalla radice a node, per evitare i cicli
+        pathStates: set[State] = set()
+        curr = node
+        while curr is not None:
+            pathStates.add(curr.state)
+            curr = curr.parent
+
+        children = node.expand(problem)
+        stack: list[tuple[ProblemNode, int, Iterator[ProblemNode]]] = [(node, depth, iter(children))]
+        if statistics is not None:
+            statistics.expanded += 1
+            statistics.generated += len(children)
+            statistics.updatePeaks(len(boundary) + 1, len(pathStates))
+
+        while len(stack) > 0:
+            if stopEvent.is_set():
+                return (best, bestMeasure)
+
+            node, depth, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                pathStates.remove(node.state)
+                continue
+
+            if child.state in pathStates:
+                if statistics is not None:
+                    statistics.duplicates += 1
+                continue
+
+            childMeasure = measure(child, depth + 1)
+            # non può migliorare la soluzione già trovata
+            if childMeasure >= bestMeasure:
                 continue
 
+            if childMeasure > limit:
+                ProblemSolving.addBoundaryNode(boundary, child, depth + 1, childMeasure)
+                continue
+
+            if problem.isGoalAchieved(child.state):
+                best, bestMeasure = child, childMeasure
+                continue
+
+            pathStates.add(child.state)
+            children = child.expand(problem)
+            stack.append((child, depth + 1, iter(children)))
+            if statistics is not None:
+                statistics.expanded += 1
+                statistics.generated += len(children)
+                statistics.updatePeaks(len(boundary) + len(stack), len(pathStates))
+
+        return (best, bestMeasure)
+
+    # Algoritmi di ricerca basati su un costo (best-first)
+
+    @staticmethod
+    def bestFirstSearch(
+        problem: Problem,
+        stopEvent: Event,
+        costFunction: CostFunctionType,
+        tieBreaker: Optional[CostFunctionType] = None,
+        fringeFactory: FringeFactoryType = IndexedPriorityQueue,
+        statistics: Optional[SearchStatistics] = None,
+        checkpointPath: Optional[str] = None,
+        checkpointInterval: Optional[float] = None,
+    ) -> SolutionType:
+        """
+        **costFunction**: *CostFunctionType*      - priorità di un nodo nella frontiera (minore = migliore)\\
+        **tieBreaker**: *CostFunctionType*        - criterio secondario a parità di costo
+                                                    (poi vale l'ordine di inserimento)\\
+        **fringeFactory**: *FringeFactoryType*    - crea la frontiera (coda di priorità indirizzabile per stato)\\
+        **statistics**: *SearchStatistics*        - se presente, raccoglie i contatori della ricerca\\
+        **checkpointPath**: *Optional[str]*       - se presente, la ricerca riprende da questo checkpoint (se esiste)
+                                                    e vi salva il proprio stato quando viene interrotta\\
+        **checkpointInterval**: *Optional[float]* - se presente, salva il checkpoint anche ogni tot secondi
+        """
+        return ProblemSolving.consumeStream(
+            ProblemSolving.bestFirstSearchStream(
+                problem,
+                stopEvent,
+                costFunction,
+                tieBreaker,
+                fringeFactory,
+                None,
+                statistics,
+                checkpointPath,
+                checkpointInterval,
+            )
+        ).solution
+
+    @staticmethod
+    def bestFirstSearchStream(
+        problem: Problem,
+        stopEvent: Event,
+        costFunction: CostFunctionType,
+        tieBreaker: Optional[CostFunctionType] = None,
+        fringeFactory: FringeFactoryType = IndexedPriorityQueue,
+        progressInterval: Optional[int] = 1000,
+        statistics: Optional[SearchStatistics] = None,
+        checkpointPath: Optional[str] = None,
+        checkpointInterval: Optional[float] = None,
+    ) -> SearchStreamType:
+        """
+        Versione a generatore di `bestFirstSearch`: ogni **progressInterval** nodi espansi produce un
+        `ProgressEvent` (con la priorità del nodo espanso), poi la soluzione e un `FinishedEvent`.\\
+        **progressInterval**: *Optional[int]*     - nodi espansi tra due eventi di avanzamento (None: nessuno)
+        """
+        if tieBreaker is None:
+            priorityFunction = costFunction
+        else:
+            priorityFunction = lambda node: (costFunction(node), tieBreaker(node))
+
+        # la frontiera viene salvata in ordine di priorità, così alla ripresa viene reinserita nello stesso ordine
+        saveCheckpoint = lambda: SearchCheckpoint(
+            SearchCheckpoint.BEST_FIRST,
+            [node for _, _, node in sorted(fringe, key=lambda entry: entry[1])],
+            explored,
+        ).save(checkpointPath, problem)
+
+        start = time.perf_counter()
+        # ogni stato compare al più una volta nella frontiera, con la priorità del miglior nodo trovato
+        fringe = fringeFactory()
+        checkpoint = ProblemSolving.loadCheckpoint(problem, checkpointPath, SearchCheckpoint.BEST_FIRST)
+        if checkpoint is None:
+            node = ProblemSolving.createRootNode(problem)
+
             if problem.isGoalAchieved(node.state):
-                return ProblemSolving.backtrackSolution(node)
+                yield from ProblemSolving.finishStream(ProblemSolving.backtrackSolution(node), start)
+                return
+
+            fringe.push(node.state, priorityFunction(node), node)
+            explored = ProblemSolving.createExploredSet(problem)
+        else:
+            for node in checkpoint.frontier:
+                fringe.push(node.state, priorityFunction(node), node)
+            explored = ProblemSolving.createExploredSet(problem, checkpoint.explored)
+
+        expanded = 0
+        generated = 0
+        nextProgress = progressInterval if progressInterval is not None else -1
+        nextCheckpoint = ProblemSolving.nextCheckpointTime(checkpointPath, checkpointInterval)
+
+        while True:
+            if stopEvent.is_set():
+                if checkpointPath is not None and len(fringe) > 0:
+                    saveCheckpoint()
+                yield from ProblemSolving.finishStream(ProblemSolving.CUTOFF, start)
+                return
+
+            if len(fringe) == 0:
+                solution = ProblemSolving.completeCheckpoint(checkpointPath, ProblemSolving.NO_SOLUTIONS)
+                yield from ProblemSolving.finishStream(solution, start)
+                return
+
+            if nextCheckpoint is not None and time.perf_counter() >= nextCheckpoint:
+                saveCheckpoint()
+                nextCheckpoint = ProblemSolving.nextCheckpointTime(checkpointPath, checkpointInterval)
+
+            node: ProblemNode = fringe.pop()
+
+            if problem.isGoalAchieved(node.state):
+                solution = ProblemSolving.completeCheckpoint(checkpointPath, ProblemSolving.backtrackSolution(node))
+                yield from ProblemSolving.finishStream(solution, start)
+                return
 
             explored.add(node.state)
 
+            children = node.expand(problem)
+            expanded += 1
+            generated += len(children)
+            if statistics is not None:
+                statistics.expanded += 1
+                statistics.generated += len(children)
+                statistics.updatePeaks(len(fringe) + 1, len(explored))
+
+            if expanded == nextProgress:
+                nextProgress += progressInterval
+                yield ProgressEvent(
+                    expanded, generated, len(fringe) + 1, costFunction(node), time.perf_counter() - start
+                )
+
             # per ogni azione possibile dallo stato corrente, la espande (cioè aggiunge alla frontiera)
             # se non già presente (oppure se il percorso trovato è meno costoso)
-            for action in problem.getActionsFromState(node.state):
-                child = node.childNode(problem, action)
+            for child in children:
 
                 # ignora se già esplorato
                 if child.state in explored:
+                    if statistics is not None:
+                        statistics.duplicates += 1
                     continue
 
-                currCost = costMap.get(child.state)
-                nextCost = costFunction(child)
-                if currCost is None or nextCost < currCost:
-                    # aggiunge (o sostituisce) lo stato child.state con il nodo child nella frontiera
-                    heappush(fringe, (nextCost, child))
-                    costMap[child.state] = nextCost
+                # aggiunge lo stato child.state alla frontiera, oppure ne diminuisce la priorità
+                # sostituendo il nodo se child è migliore (decrease-key)
+                if not fringe.push(child.state, priorityFunction(child), child) and statistics is not None:
+                    statistics.duplicates += 1
 
     @staticmethod
-    def uniformSearch(problem: Problem, stopEvent: Event) -> SolutionType:
-        return ProblemSolving.bestFirstSearch(problem, stopEvent, lambda node: node.pathCost)
+    def uniformSearch(
+        problem: Problem,
+        stopEvent: Event,
+        statistics: Optional[SearchStatistics] = None,
+        checkpointPath: Optional[str] = None,
+        checkpointInterval: Optional[float] = None,
+    ) -> SolutionType:
+        return ProblemSolving.bestFirstSearch(
+            problem,
+            stopEvent,
+            lambda node: node.pathCost,
+            statistics=statistics,
+            checkpointPath=checkpointPath,
+            checkpointInterval=checkpointInterval,
+        )
 
     @staticmethod
-    def greedySearch(problem: Problem, stopEvent: Event) -> SolutionType:
-        return ProblemSolving.bestFirstSearch(problem, stopEvent, lambda node: node.heuristicDist)
+    def greedySearch(
+        problem: Problem,
+        stopEvent: Event,
+        statistics: Optional[SearchStatistics] = None,
+        checkpointPath: Optional[str] = None,
+        checkpointInterval: Optional[float] = None,
+    ) -> SolutionType:
+        return ProblemSolving.bestFirstSearch(
+            problem,
+            stopEvent,
+            lambda node: node.heuristicDist,
+            statistics=statistics,
+            checkpointPath=checkpointPath,
+            checkpointInterval=checkpointInterval,
+        )
 
     @staticmethod
-    def aStarSearch(problem: Problem, stopEvent: Event) -> SolutionType:
+    def aStarSearch(
+        problem: Problem,
+        stopEvent: Event,
+        statistics: Optional[SearchStatistics] = None,
+        checkpointPath: Optional[str] = None,
+        checkpointInterval: Optional[float] = None,
+    ) -> SolutionType:
+        # a parità di f preferisce il nodo più vicino all'obiettivo secondo l'euristica
         return ProblemSolving.bestFirstSearch(
-            problem, stopEvent, lambda node: node.pathCost + node.heuristicDist
+            problem,
+            stopEvent,
+            lambda node: node.pathCost + node.heuristicDist,
+            tieBreaker=lambda node: node.heuristicDist,
+            statistics=statistics,
+            checkpointPath=checkpointPath,
+            checkpointInterval=checkpointInterval,
+        )
+
+    @staticmethod
+    def uniformSearchStream(
+        problem: Problem, stopEvent: Event, progressInterval: Optional[int] = 1000
+    ) -> SearchStreamType:
+        return ProblemSolving.bestFirstSearchStream(
+            problem, stopEvent, lambda node: node.pathCost, progressInterval=progressInterval
+        )
+
+    @staticmethod
+    def greedySearchStream(
+        problem: Problem, stopEvent: Event, progressInterval: Optional[int] = 1000
+    ) -> SearchStreamType:
+        return ProblemSolving.bestFirstSearchStream(
+            problem, stopEvent, lambda node: node.heuristicDist, progressInterval=progressInterval
+        )
+
+    @staticmethod
+    def aStarSearchStream(
+        problem: Problem, stopEvent: Event, progressInterval: Optional[int] = 1000
+    ) -> SearchStreamType:
+        return ProblemSolving.bestFirstSearchStream(
+            problem,
+            stopEvent,
+            lambda node: node.pathCost + node.heuristicDist,
+            tieBreaker=lambda node: node.heuristicDist,
+            progressInterval=progressInterval,
         )
+
+    @staticmethod
+    def iterativeDeepeningAStar(
+        problem: Problem, stopEvent: Event, statistics: Optional[SearchStatistics] = None
+    ) -> SolutionType:
+        """
+        IDA*: ricerca in profondità limitata da una soglia su f = pathCost + heuristicDist,
+        che ad ogni iterazione sale al minimo valore di f che l'aveva superata.
+        Non mantiene né costMap né explored: la memoria è proporzionale alla profondità della soluzione
+        """
+        node = ProblemSolving.createRootNode(problem)
+
+        # stati del percorso corrente (evita i cicli senza ricordare gli stati già esplorati)
+        pathStates: set[State] = {node.state}
+        bound = node.pathCost + node.heuristicDist
+
+        while True:
+            solution, nextBound = ProblemSolving.iterativeDeepeningAStarHelper(
+                problem, stopEvent, node, pathStates, bound, statistics
+            )
+            if solution is not None:
+                return solution
+
+            if stopEvent.is_set():
+                return ProblemSolving.CUTOFF
+
+            if nextBound == float("inf"):
+                return ProblemSolving.NO_SOLUTIONS
+
+            bound = nextBound
+
+    @staticmethod
+    def iterativeDeepeningAStarHelper(
+        problem: Problem,
+        stopEvent: Event,
+        node: ProblemNode,
+        pathStates: set[State],
+        bound: float,
+        statistics: Optional[SearchStatistics] = None,
+    ) -> tuple[SolutionType, float]:
+        """
+        Restituisce la soluzione (se trovata entro **bound**) e il minimo valore di f che ha superato **bound**
+        """
+        f = node.pathCost + node.heuristicDist
+        if f > bound:
+            return (None, f)
+
+        if problem.isGoalAchieved(node.state):
+            return (ProblemSolving.backtrackSolution(node), f)
+
+        if stopEvent.is_set():
+            return (None, float("inf"))
+
+        nextBound = float("inf")
+
+        successors = problem.expand(node.state, node.heuristicDist, node.action)
+        if statistics is not None:
+            statistics.expanded += 1
+            statistics.generated += len(successors)
+            statistics.updatePeaks(len(pathStates), len(pathStates))
+
+        for successor in successors:
+            # il figlio non viene aggiunto a node.children, così i sottoalberi già visitati vengono liberati
+            child = node.createSuccessor(*successor)
+            if child.state in pathStates:
+                if statistics is not None:
+                    statistics.duplicates += 1
+                continue
+
+            pathStates.add(child.state)
+            solution, childBound = ProblemSolving.iterativeDeepeningAStarHelper(
+                problem, stopEvent, child, pathStates, bound, statistics
+            )
+            pathStates.remove(child.state)
+
+            if solution is not None:
+                return (solution, childBound)
+            nextBound = min(nextBound, childBound)
+
+        return (None, nextBound)
+
+    @staticmethod
+    def iterativeDeepeningStream(
+        problem: Problem,
+        stopEvent: Event,
+        measure: DepthMeasureType,
+        progressInterval: Optional[int] = 1000,
+        statistics: Optional[SearchStatistics] = None,
+    ) -> SearchStreamType:
+        """
+        Approfondimento iterativo a generatore (con uno stack esplicito, così ogni punto della visita
+        può produrre un evento): ad ogni iterazione visita in profondità i nodi con **measure**(nodo, profondità)
+        entro la soglia, che poi sale al minimo valore che l'aveva superata.
+        Produce un `ProgressEvent` all'inizio di ogni iterazione (con la nuova soglia) e ogni
+        **progressInterval** nodi espansi, poi la soluzione e un `FinishedEvent`
+
+        **measure**: *DepthMeasureType*           - valore limitato dalla soglia (es: profondità per IDS, f per IDA*)
+        """
+        start = time.perf_counter()
+        root = ProblemSolving.createRootNode(problem)
+        if problem.isGoalAchieved(root.state):
+            yield from ProblemSolving.finishStream(ProblemSolving.backtrackSolution(root), start)
+            return
+
+        bound = measure(root, 0)
+        expanded = 0
+        generated = 0
+        nextProgress = progressInterval if progressInterval is not None else -1
+
+        while True:
+            yield ProgressEvent(expanded, generated, 1, bound, time.perf_counter() - start)
+            nextBound = float("inf")
+
+            # stack dei nodi del percorso corrente con i figli ancora da provare (il figlio ha profondità len(stack))
+            children = root.expand(problem)
+            stack: list[tuple[ProblemNode, Iterator[ProblemNode]]] = [(root, iter(children))]
+            pathStates: set[State] = {root.state}
+            expanded += 1
+            generated += len(children)
+            if statistics is not None:
+                statistics.expanded += 1
+                statistics.generated += len(children)
+
+            while len(stack) > 0:
+                if stopEvent.is_set():
+                    yield from ProblemSolving.finishStream(ProblemSolving.CUTOFF, start)
+                    return
+
+                node, children = stack[-1]
+                child = next(children, None)
+                if child is None:
+                    stack.pop()
+                    pathStates.remove(node.state)
+                    continue
+
+                if child.state in pathStates:
+                    if statistics is not None:
+                        statistics.duplicates += 1
+                    continue
+
+                value = measure(child, len(stack))
+                if value > bound:
+                    nextBound = min(nextBound, value)
+                    continue
+
+                if problem.isGoalAchieved(child.state):
+                    yield from ProblemSolving.finishStream(ProblemSolving.backtrackSolution(child), start)
+                    return
+
+                pathStates.add(child.state)
+                children = child.expand(problem)
+                stack.append((child, iter(children)))
+                expanded += 1
+                generated += len(children)
+                if statistics is not None:
+                    statistics.expanded += 1
+                    statistics.generated += len(children)
+                    statistics.updatePeaks(len(stack), len(pathStates))
+
+                if expanded == nextProgress:
+                    nextProgress += progressInterval
+                    yield ProgressEvent(expanded, generated, len(stack), bound, time.perf_counter() - start)
+
+            if nextBound == float("inf"):
+                yield from ProblemSolving.finishStream(ProblemSolving.NO_SOLUTIONS, start)
+                return
+
+            bound = nextBound
+
+    @staticmethod
+    def iterativeDeepeningSearchStream(
+        problem: Problem, stopEvent: Event, progressInterval: Optional[int] = 1000
+    ) -> SearchStreamType:
+        """Versione a generatore di `iterativeDeepeningSearch`: la soglia è la profondità"""
+        return ProblemSolving.iterativeDeepeningStream(
+            problem, stopEvent, lambda node, depth: depth, progressInterval
+        )
+
+    @staticmethod
+    def iterativeDeepeningAStarStream(
+        problem: Problem, stopEvent: Event, progressInterval: Optional[int] = 1000
+    ) -> SearchStreamType:
+        """Versione a generatore di `iterativeDeepeningAStar`: la soglia è su f = pathCost + heuristicDist"""
+        return ProblemSolving.iterativeDeepeningStream(
+            problem, stopEvent, lambda node, depth: node.pathCost + node.heuristicDist, progressInterval
+        )
+
+    @staticmethod
+    def smaStarSearch(
+        problem: Problem,
+        stopEvent: Event,
+        maxNodes: int,
+        statistics: Optional[SearchStatistics] = None,
+    ) -> SolutionType:
+        """
+        SMA* (Simplified Memory-bounded A*): come A*, ma mantiene in memoria al più **maxNodes** nodi.
+        Quando il limite è raggiunto dimentica la foglia peggiore (f maggiore, a parità la meno profonda)
+        e ne riporta il valore f nel padre, che la rigenererà se tornerà ad essere la più promettente.
+        La soluzione è ottima se il percorso ottimo richiede al più **maxNodes** nodi in memoria
+        """
+        root = SMAStarNode(
+            parent=None,
+            state=problem.initialState,
+            action=None,
+            pathCost=0,
+            heuristicDist=problem.heuristicDistFunction(problem.initialState),
+        )
+
+        # code di priorità con entry invalidate tramite version (non rimuovo dalle code)
+        # fringe: la migliore (f minore, a parità la più profonda) da espandere
+        # leaves: la foglia peggiore (f maggiore, a parità la meno profonda) da dimenticare
+        counter = count()
+        fringe: list[tuple[float, int, int, int, SMAStarNode]] = []
+        leaves: list[tuple[float, int, int, int, SMAStarNode]] = []
+
+        def refresh(node: SMAStarNode):
+            node.version += 1
+            if node.inOpen:
+                heappush(fringe, (node.openKey(), -node.depth, next(counter), node.version, node))
+            if node.isLeaf() and node is not root:
+                heappush(leaves, (-node.f, node.depth, next(counter), node.version, node))
+
+        def backup(node: Optional[SMAStarNode]):
+            # propaga verso la radice il miglior valore f dei figli
+            while node is not None:
+                newF = node.backedUpValue()
+                if newF == node.f:
+                    break
+                node.f = newF
+                refresh(node)
+                node = node.parent
+
+        # per ogni stato, il nodo in memoria con il pathCost minore: un nodo con costo maggiore o uguale
+        # è inutile (include i cicli, visto che gli antenati restano sempre in memoria)
+        reached: dict[State, SMAStarNode] = {root.state: root}
+
+        root.inOpen = True
+        refresh(root)
+        nodesInMemory = 1
+        # diventa True se qualche percorso è stato scartato perché non entra in memoria
+        memoryCutoff = False
+
+        while True:
+            if stopEvent.is_set():
+                return ProblemSolving.CUTOFF
+
+            # prende il nodo migliore ancora valido
+            node: Optional[SMAStarNode] = None
+            while len(fringe) > 0:
+                _, _, _, version, candidate = heappop(fringe)
+                if candidate.inOpen and candidate.version == version:
+                    node = candidate
+                    break
+
+            if node is None or node.openKey() == float("inf"):
+                return ProblemSolving.CUTOFF if memoryCutoff else ProblemSolving.NO_SOLUTIONS
+
+            if not node.expanded:
+                if problem.isGoalAchieved(node.state):
+                    return ProblemSolving.backtrackSolution(node)
+                children = [
+                    node.createSuccessor(*successor)
+                    for successor in problem.expand(node.state, node.heuristicDist, node.action)
+                ]
+            else:
+                # rigenera solo i figli dimenticati
+                children = [
+                    node.createChild(problem.transitionModel(node.state, action), action, problem)
+                    for action in node.forgotten
+                ]
+
+            if statistics is not None:
+                statistics.expanded += 1
+                statistics.generated += len(children)
+                if node.expanded:
+                    statistics.reopened += len(children)
+
+            for child in children:
+                forgottenF = node.forgotten.pop(child.action, 0)
+                other = reached.get(child.state)
+                if other is not None and other.pathCost <= child.pathCost:
+                    if statistics is not None:
+                        statistics.duplicates += 1
+                    continue
+
+                reached[child.state] = child
+                child.f = max(child.f, forgottenF)
+
+                # un nodo alla profondità massima non può essere espanso restando nel limite di memoria
+                if child.depth >= maxNodes - 1 and not problem.isGoalAchieved(child.state):
+                    child.f = float("inf")
+                    memoryCutoff = True
+
+                node.addChild(child)
+                nodesInMemory += 1
+                child.inOpen = True
+                refresh(child)
+
+            node.expanded = True
+            node.forgotten.clear()
+            node.inOpen = False
+            if node.isLeaf():
+                # nessun successore utile: vicolo cieco
+                node.f = float("inf")
+            refresh(node)
+            backup(node.parent if node.isLeaf() else node)
+
+            if statistics is not None:
+                statistics.updatePeaks(nodesInMemory, len(reached))
+
+            # dimentica le foglie peggiori finché non si rientra nel limite di memoria
+            while nodesInMemory > maxNodes and len(leaves) > 0:
+                _, _, _, version, leaf = heappop(leaves)
+                if not leaf.inMemory or leaf.version != version or not leaf.isLeaf():
+                    continue
+
+                if reached.get(leaf.state) is leaf:
+                    del reached[leaf.state]
+
+                parent = leaf.parent
+                parent.children.remove(leaf)
+                parent.forgotten[leaf.action] = leaf.f
+                leaf.inMemory = False
+                leaf.inOpen = False
+                nodesInMemory -= 1
+
+                parent.inOpen = True
+                refresh(parent)
+                backup(parent)
+
+            # elimina le entry non più valide se le code crescono troppo rispetto ai nodi in memoria
+            if len(fringe) + len(leaves) > 4 * maxNodes + 64:
+                fringe = [e for e in fringe if e[4].inOpen and e[4].version == e[3]]
+                leaves = [e for e in leaves if e[4].inMemory and e[4].version == e[3]]
+                heapify(fringe)
+                heapify(leaves)
+
+    # Ricerca anytime
+
+    @staticmethod
+    def anytimeRepairingAStar(
+        problem: Problem,
+        stopEvent: Event,
+        initialWeight: float = 3.0,
+        weightStep: float = 0.5,
+        timeLimit: Optional[float] = None,
+        onSolution: Optional[SolutionCallbackType] = None,
+        statistics: Optional[SearchStatistics] = None,
+    ) -> tuple[SolutionType, float]:
+        """
+        ARA* (Anytime Repairing A*): una serie di ricerche A* pesate, con f = pathCost + weight * heuristicDist,
+        in cui **weight** parte da **initialWeight** e scende di **weightStep** fino a 1.
+        Ogni iterazione riusa il lavoro della precedente: riespande solo gli stati il cui costo è migliorato
+        (la frontiera viene riordinata con il nuovo peso), e scarta i nodi che non possono migliorare
+        la soluzione trovata.
+
+        La ricerca si ferma quando trova la soluzione ottima, quando viene impostato **stopEvent**
+        o quando scade **timeLimit**, e restituisce la miglior soluzione trovata fino a quel momento
+        (CUTOFF se non ne ha trovate) insieme al suo limite di subottimalità: costo / costo ottimo <= limite
+        (1 se ottima, inf se non ci sono soluzioni). Con un'euristica non ammissibile il limite non è garantito
+
+        **initialWeight**: *float*                - peso dell'euristica nella prima iterazione (>= 1)\\
+        **weightStep**: *float*                   - diminuzione del peso ad ogni iterazione\\
+        **timeLimit**: *Optional[float]*          - tempo massimo in secondi (oltre a stopEvent)\\
+        **onSolution**: *SolutionCallbackType*    - se presente, chiamata ogni volta che la soluzione
+                                                    o il suo limite di subottimalità migliorano\\
+        **statistics**: *SearchStatistics*        - se presente, raccoglie i contatori della ricerca
+        """
+        finished = ProblemSolving.consumeStream(
+            ProblemSolving.anytimeRepairingAStarStream(
+                problem, stopEvent, initialWeight, weightStep, timeLimit, None, statistics
+            ),
+            onSolution,
+        )
+        return (finished.solution, finished.bound)
+
+    @staticmethod
+    def anytimeRepairingAStarStream(
+        problem: Problem,
+        stopEvent: Event,
+        initialWeight: float = 3.0,
+        weightStep: float = 0.5,
+        timeLimit: Optional[float] = None,
+        progressInterval: Optional[int] = 1000,
+        statistics: Optional[SearchStatistics] = None,
+    ) -> SearchStreamType:
+        """
+        Versione a generatore di `anytimeRepairingAStar`: produce un `SolutionEvent` ogni volta che
+        la soluzione o il suo limite di subottimalità migliorano, un `ProgressEvent` ogni **progressInterval**
+        nodi espansi (con la priorità pesata del nodo espanso) e infine un `FinishedEvent`
+        """
+        if initialWeight < 1:
+            raise ValueError(f"initialWeight deve essere almeno 1: {initialWeight}")
+        if weightStep <= 0:
+            raise ValueError(f"weightStep deve essere positivo: {weightStep}")
+
+        start = time.perf_counter()
+        deadline = None if timeLimit is None else start + timeLimit
+
+        root = ProblemSolving.createRootNode(problem)
+        if problem.isGoalAchieved(root.state):
+            yield from ProblemSolving.finishStream(ProblemSolving.backtrackSolution(root), start, 1.0)
+            return
+
+        weight = initialWeight
+        # a parità di f pesata preferisce il nodo più vicino all'obiettivo
+        priority = lambda node: (node.pathCost + weight * node.heuristicDist, node.heuristicDist)
+
+        fringe = IndexedPriorityQueue()
+        fringe.push(root.state, priority(root), root)
+        # miglior nodo trovato per ogni stato
+        best: dict[State, ProblemNode] = {root.state: root}
+        closed: set[State] = set()
+        # stati già chiusi nell'iterazione corrente il cui costo è migliorato: riaperti alla successiva
+        inconsistent: dict[State, ProblemNode] = {}
+
+        incumbent: Optional[ProblemNode] = None
+        incumbentCost = float("inf")
+        # limite inferiore del costo ottimo e limite garantito dall'ultima iterazione completata
+        lowerBound = root.pathCost + root.heuristicDist
+        weightBound = float("inf")
+        reportedBound = float("inf")
+
+        expanded = 0
+        generated = 0
+        nextProgress = progressInterval if progressInterval is not None else -1
+
+        def currentBound() -> float:
+            ratio = incumbentCost / lowerBound if lowerBound > 0 else float("inf")
+            return max(1.0, min(weightBound, ratio))
+
+        while True:
+            # espande finché qualche nodo della frontiera può ancora migliorare la soluzione (con il peso attuale)
+            while len(fringe) > 0 and fringe.peekPriority()[0] < incumbentCost:
+                if stopEvent.is_set() or (deadline is not None and time.perf_counter() >= deadline):
+                    if incumbent is None:
+                        yield FinishedEvent(ProblemSolving.CUTOFF, float("inf"), time.perf_counter() - start)
+                    else:
+                        solution = ProblemSolving.backtrackSolution(incumbent)
+                        yield FinishedEvent(solution, currentBound(), time.perf_counter() - start)
+                    return
+
+                node: ProblemNode = fringe.pop()
+                closed.add(node.state)
+
+                children = node.expand(problem)
+                expanded += 1
+                generated += len(children)
+                if statistics is not None:
+                    statistics.expanded += 1
+                    statistics.generated += len(children)
+                    statistics.updatePeaks(len(fringe) + 1, len(closed))
+
+                if expanded == nextProgress:
+                    nextProgress += progressInterval
+                    yield ProgressEvent(
+                        expanded, generated, len(fringe) + 1, priority(node)[0], time.perf_counter() - start
+                    )
+
+                improved = False
+                for child in children:
+                    curr = best.get(child.state)
+                    if curr is not None and curr.pathCost <= child.pathCost:
+                        if statistics is not None:
+                            statistics.duplicates += 1
+                        continue
+                    # non può migliorare la soluzione già trovata
+                    if child.pathCost + child.heuristicDist >= incumbentCost:
+                        continue
+
+                    best[child.state] = child
+                    if problem.isGoalAchieved(child.state):
+                        incumbent = child
+                        incumbentCost = child.pathCost
+                        improved = True
+                    elif child.state in closed:
+                        inconsistent[child.state] = child
+                        if statistics is not None:
+                            statistics.reopened += 1
+                    else:
+                        fringe.push(child.state, priority(child), child)
+
+                if improved:
+                    reportedBound = currentBound()
+                    yield SolutionEvent(
+                        ProblemSolving.backtrackSolution(incumbent), reportedBound, time.perf_counter() - start
+                    )
+
+            # il costo ottimo è almeno il minimo g + h tra gli stati ancora da espandere
+            # (o la soluzione trovata, se nessuno può migliorarla)
+            pending = [node for _, _, node in fringe] + list(inconsistent.values())
+            lowerBound = max(
+                lowerBound,
+                min(
+                    min((node.pathCost + node.heuristicDist for node in pending), default=float("inf")),
+                    incumbentCost,
+                ),
+            )
+
+            if incumbent is None and len(pending) == 0:
+                yield FinishedEvent(ProblemSolving.NO_SOLUTIONS, float("inf"), time.perf_counter() - start)
+                return
+
+            if incumbent is not None:
+                weightBound = weight
+                bound = currentBound()
+                solution = ProblemSolving.backtrackSolution(incumbent)
+                if bound < reportedBound:
+                    reportedBound = bound
+                    yield SolutionEvent(solution, bound, time.perf_counter() - start)
+                if bound <= 1 or (weight == 1 and len(inconsistent) == 0):
+                    yield FinishedEvent(solution, bound, time.perf_counter() - start)
+                    return
+
+            # nuova iterazione con peso minore: frontiera e stati inconsistenti riordinati, chiusi dimenticati
+            weight = max(1.0, weight - weightStep)
+            fringe = IndexedPriorityQueue()
+            for node in pending:
+                if node.pathCost + node.heuristicDist < incumbentCost:
+                    fringe.push(node.state, priority(node), node)
+            inconsistent = {}
+            closed = set()
+
+    @staticmethod
+    def araStarSearch(
+        problem: Problem, stopEvent: Event, statistics: Optional[SearchStatistics] = None
+    ) -> SolutionType:
+        """ARA* con i parametri predefiniti: restituisce solo la miglior soluzione trovata (vedi `anytimeRepairingAStar`)"""
+        return ProblemSolving.anytimeRepairingAStar(problem, stopEvent, statistics=statistics)[0]
+
+    # Algoritmi di ricerca bidirezionale (richiedono gli hook getGoalStates e getPredecessors del problema)
+
+    @staticmethod
+    def joinBidirectionalSolution(forwardNode: ProblemNode, backwardNode: ProblemNode) -> SolutionType:
+        """
+        Unisce il percorso in avanti (radice -> **forwardNode**) con quello all'indietro
+        (**backwardNode** -> obiettivo), che si incontrano nello stesso stato
+        """
+        actions, cost = ProblemSolving.backtrackSolution(forwardNode)
+        curr = backwardNode
+        while curr.parent is not None:
+            actions.append(curr.action)
+            curr = curr.parent
+        return (actions, cost + backwardNode.pathCost)
+
+    @staticmethod
+    def expandBidirectionalLayer(
+        problem: Problem,
+        stopEvent: Event,
+        fringe: deque[ProblemNode],
+        reached: dict[State, tuple[ProblemNode, int]],
+        otherReached: dict[State, tuple[ProblemNode, int]],
+        forward: bool,
+        statistics: Optional[SearchStatistics] = None,
+    ) -> Optional[tuple[ProblemNode, ProblemNode]]:
+        """
+        Espande tutti i nodi dell'ultimo livello di **fringe** (in avanti o all'indietro).
+        Restituisce la coppia (nodo in avanti, nodo all'indietro) del punto di incontro
+        con meno azioni trovato nel livello, oppure `None`
+        """
+        meeting = None
+        meetingDepth = float("inf")
+
+        for _ in range(len(fringe)):
+            if stopEvent.is_set():
+                return None
+
+            node = fringe.pop()
+            depth = reached[node.state][1] + 1
+            if statistics is not None:
+                statistics.expanded += 1
+
+            if forward:
+                children = node.expand(problem)
+            else:
+                children = (
+                    node.predecessorNode(problem, action, previousState)
+                    for action, previousState in problem.getPredecessors(node.state)
+                )
+
+            for child in children:
+                if statistics is not None:
+                    statistics.generated += 1
+
+                if child.state in reached:
+                    if statistics is not None:
+                        statistics.duplicates += 1
+                    continue
+                reached[child.state] = (child, depth)
+
+                # le frontiere si incontrano: tiene il percorso complessivo più corto del livello
+                other = otherReached.get(child.state)
+                if other is not None and depth + other[1] < meetingDepth:
+                    meetingDepth = depth + other[1]
+                    meeting = (child, other[0]) if forward else (other[0], child)
+
+                fringe.appendleft(child)
+
+        if statistics is not None:
+            statistics.updatePeaks(len(fringe), len(reached) + len(otherReached))
+
+        return meeting
+
+    @staticmethod
+    def bidirectionalBreadthFirstSearch(
+        problem: Problem, stopEvent: Event, statistics: Optional[SearchStatistics] = None
+    ) -> SolutionType:
+        node = ProblemSolving.createRootNode(problem)
+
+        if problem.isGoalAchieved(node.state):
+            return ProblemSolving.backtrackSolution(node)
+
+        # per ogni stato raggiunto memorizza il nodo e la sua profondità
+        forwardReached: dict[State, tuple[ProblemNode, int]] = {node.state: (node, 0)}
+        backwardReached: dict[State, tuple[ProblemNode, int]] = {}
+        for goalState in problem.getGoalStates():
+            backwardReached[goalState] = (ProblemNode(None, goalState, None, 0, 0), 0)
+
+        forwardFringe: deque[ProblemNode] = deque([node])
+        backwardFringe: deque[ProblemNode] = deque(node for node, _ in backwardReached.values())
+
+        while True:
+            if stopEvent.is_set():
+                return ProblemSolving.CUTOFF
+
+            if len(forwardFringe) == 0 or len(backwardFringe) == 0:
+                return ProblemSolving.NO_SOLUTIONS
+
+            # espande un intero livello della frontiera più piccola
+            if len(forwardFringe) <= len(backwardFringe):
+                meeting = ProblemSolving.expandBidirectionalLayer(
+                    problem,
+                    stopEvent,
+                    forwardFringe,
+                    forwardReached,
+                    backwardReached,
+                    True,
+                    statistics,
+                )
+            else:
+                meeting = ProblemSolving.expandBidirectionalLayer(
+                    problem,
+                    stopEvent,
+                    backwardFringe,
+                    backwardReached,
+                    forwardReached,
+                    False,
+                    statistics,
+                )
+
+            if meeting is not None:
+                return ProblemSolving.joinBidirectionalSolution(*meeting)
+
+    @staticmethod
+    def bidirectionalUniformSearch(
+        problem: Problem, stopEvent: Event, statistics: Optional[SearchStatistics] = None
+    ) -> SolutionType:
+        node = ProblemSolving.createRootNode(problem)
+
+        if problem.isGoalAchieved(node.state):
+            return ProblemSolving.backtrackSolution(node)
+
+        # il contatore evita il confronto tra nodi a parità di costo
+        counter = count()
+
+        forwardFringe: list[tuple[float, int, ProblemNode]] = [(0, next(counter), node)]
+        forwardReached: dict[State, ProblemNode] = {node.state: node}
+
+        backwardFringe: list[tuple[float, int, ProblemNode]] = []
+        backwardReached: dict[State, ProblemNode] = {}
+        for goalState in problem.getGoalStates():
+            goalNode = ProblemNode(None, goalState, None, 0, 0)
+            backwardReached[goalState] = goalNode
+            heappush(backwardFringe, (0, next(counter), goalNode))
+
+        meeting: Optional[tuple[ProblemNode, ProblemNode]] = None
+        meetingCost = float("inf")
+
+        while len(forwardFringe) > 0 and len(backwardFringe) > 0:
+            if stopEvent.is_set():
+                return ProblemSolving.CUTOFF
+
+            # nessun percorso non ancora trovato può costare meno del miglior incontro
+            if forwardFringe[0][0] + backwardFringe[0][0] >= meetingCost:
+                break
+
+            # espande il nodo meno costoso tra le due frontiere
+            forward = forwardFringe[0][0] <= backwardFringe[0][0]
+            if forward:
+                fringe, reached, otherReached = forwardFringe, forwardReached, backwardReached
+            else:
+                fringe, reached, otherReached = backwardFringe, backwardReached, forwardReached
+
+            node = heappop(fringe)[2]
+            # ignora se è stato trovato un percorso migliore (non rimuovo dalla fringe)
+            if reached[node.state] is not node:
+                continue
+
+            if statistics is not None:
+                statistics.expanded += 1
+                statistics.updatePeaks(
+                    len(forwardFringe) + len(backwardFringe) + 1,
+                    len(forwardReached) + len(backwardReached),
+                )
+
+            if forward:
+                children = node.expand(problem)
+            else:
+                children = (
+                    node.predecessorNode(problem, action, previousState)
+                    for action, previousState in problem.getPredecessors(node.state)
+                )
+
+            for child in children:
+                if statistics is not None:
+                    statistics.generated += 1
+
+                currNode = reached.get(child.state)
+                if currNode is not None and currNode.pathCost <= child.pathCost:
+                    if statistics is not None:
+                        statistics.duplicates += 1
+                    continue
+
+                reached[child.state] = child
+                heappush(fringe, (child.pathCost, next(counter), child))
+
+                other = otherReached.get(child.state)
+                if other is not None and child.pathCost + other.pathCost < meetingCost:
+                    meetingCost = child.pathCost + other.pathCost
+                    meeting = (child, other) if forward else (other, child)
+
+        if meeting is None:
+            return ProblemSolving.NO_SOLUTIONS
+
+        return ProblemSolving.joinBidirectionalSolution(*meeting)
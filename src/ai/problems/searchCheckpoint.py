@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import io
+import os
+import pickle
+import struct
+import sys
+from array import array
+from collections.abc import Hashable, Iterable
+from typing import Callable, Optional
+
+from ai.core.state import State
+from ai.problems.problem import Problem
+from ai.problems.problemNode import ProblemNode
+
+
+class SearchCheckpoint:
+    """
+    Stato salvabile di una ricerca (BFS o best-first): i nodi della frontiera, nell'ordine in cui
+    verranno estratti, e gli stati già esplorati. I nodi antenati della frontiera vengono salvati una sola
+    volta, così le catene dei padri (e quindi le soluzioni) vengono ricostruite alla ripresa.
+
+    Il formato è binario e a colonne, senza serializzare i grafi di `ProblemNode`:
+    stati e azioni distinti vengono codificati una volta sola con gli hook `encodeState` / `encodeAction`
+    del problema, e ogni nodo occupa 28 byte (padre, stato, azione, costo, distanza heuristica).
+    Costi e distanze vengono salvati come interi se lo sono tutti, così la ricerca ripresa
+    restituisce costi dello stesso tipo di quella non interrotta. L'intestazione contiene l'impronta
+    del problema e l'obiettivo (vedi `problemKey`): frontiera, esplorati e distanze heuristiche
+    valgono solo per quelli.
+
+        magic "AISC" | versione (u8) | tipo di ricerca (u8)
+        problema: 2 (u32), lunghezze (u32[]), impronta e obiettivo codificati
+        azioni: numero (u32), lunghezze (u32[]), byte concatenati
+        stati:  numero (u32), lunghezze (u32[]), byte concatenati
+        nodi:   numero (u32), padri (i32[], -1 = radice), stati (u32[]), azioni (i32[]),
+                costi e distanze heuristiche (ciascuna colonna: tipo (u8, "q" = i64, "d" = f64) e valori);
+                ogni padre precede i propri figli
+        frontiera: numero (u32), nodi (u32[])
+        esplorati: numero (u32), stati (u32[])
+    """
+
+    MAGIC = b"AISC"
+    VERSION = 3
+
+    # tipi di ricerca
+    BREADTH_FIRST = 0
+    BEST_FIRST = 1
+
+    def __init__(
+        self,
+        kind: int,
+        frontier: list[ProblemNode],
+        explored: Iterable[State],
+        problemKey: Optional[list[bytes]] = None,
+    ):
+        """
+        **kind**: *int*                           - tipo di ricerca (BREADTH_FIRST, BEST_FIRST)\\
+        **frontier**: *list[ProblemNode]*         - nodi della frontiera, dal primo che verrà estratto\\
+        **explored**: *Iterable[State]*           - stati già esplorati\\
+        **problemKey**: *Optional[list[bytes]]*   - impronta e obiettivo del problema (letti da `load`)
+        """
+        self.kind = kind
+        self.frontier = frontier
+        self.explored = explored
+        self.problemKey = problemKey
+
+    def save(self, path: str, problem: Problem) -> None:
+        """
+        Scrive il checkpoint in **path**, passando da un file temporaneo poi rinominato:
+        un checkpoint valido non viene mai sostituito da uno scritto a metà
+        """
+        actionIds: dict[Hashable, int] = {}
+        stateIds: dict[State, int] = {}
+
+        def intern(table: dict, value: Hashable) -> int:
+            index = table.get(value)
+            if index is None:
+                index = len(table)
+                table[value] = index
+            return index
+
+        # numerazione dei nodi: ogni catena viene risalita fino al primo nodo già numerato
+        nodeIds: dict[int, int] = {}
+        parents = array("i")
+        states = array("I")
+        actions = array("i")
+        pathCosts: list[float] = []
+        heuristicDists: list[float] = []
+        for node in self.frontier:
+            chain: list[ProblemNode] = []
+            curr = node
+            while curr is not None and id(curr) not in nodeIds:
+                chain.append(curr)
+                curr = curr.parent
+            for curr in reversed(chain):
+                nodeIds[id(curr)] = len(parents)
+                parents.append(-1 if curr.parent is None else nodeIds[id(curr.parent)])
+                states.append(intern(stateIds, curr.state))
+                actions.append(-1 if curr.action is None else intern(actionIds, curr.action))
+                pathCosts.append(curr.pathCost)
+                heuristicDists.append(curr.heuristicDist)
+
+        frontier = array("I", (nodeIds[id(node)] for node in self.frontier))
+        explored = array("I", (intern(stateIds, state) for state in self.explored))
+
+        temporaryPath = f"{path}.tmp"
+        with open(temporaryPath, "wb") as file:
+            file.write(SearchCheckpoint.MAGIC)
+            file.write(struct.pack("<BB", SearchCheckpoint.VERSION, self.kind))
+            SearchCheckpoint.writeObjects(file, SearchCheckpoint.problemKey(problem), bytes)
+            SearchCheckpoint.writeObjects(file, actionIds, problem.encodeAction)
+            SearchCheckpoint.writeObjects(file, stateIds, problem.encodeState)
+            file.write(struct.pack("<I", len(parents)))
+            for column in (parents, states, actions):
+                SearchCheckpoint.writeColumn(file, column)
+            for values in (pathCosts, heuristicDists):
+                SearchCheckpoint.writeNumbers(file, values)
+            for column in (frontier, explored):
+                file.write(struct.pack("<I", len(column)))
+                SearchCheckpoint.writeColumn(file, column)
+        os.replace(temporaryPath, path)
+
+    @staticmethod
+    def load(path: str, problem: Problem) -> SearchCheckpoint:
+        """Legge un checkpoint scritto da `save`, ricostruendo i nodi con i loro padri"""
+        with open(path, "rb") as file:
+            data = memoryview(file.read())
+
+        if bytes(data[:4]) != SearchCheckpoint.MAGIC:
+            raise ValueError(f"{path} non è un checkpoint di ricerca")
+        version, kind = struct.unpack_from("<BB", data, 4)
+        if version != SearchCheckpoint.VERSION:
+            raise ValueError(f"Versione del checkpoint non supportata: {version}")
+        offset = 6
+
+        problemKey, offset = SearchCheckpoint.readObjects(data, offset, bytes)
+        actionTable, offset = SearchCheckpoint.readObjects(data, offset, problem.decodeAction)
+        stateTable, offset = SearchCheckpoint.readObjects(data, offset, problem.decodeState)
+
+        (nodeCount,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        parents, offset = SearchCheckpoint.readColumn(data, offset, "i", nodeCount)
+        states, offset = SearchCheckpoint.readColumn(data, offset, "I", nodeCount)
+        actions, offset = SearchCheckpoint.readColumn(data, offset, "i", nodeCount)
+        pathCosts, offset = SearchCheckpoint.readNumbers(data, offset, nodeCount)
+        heuristicDists, offset = SearchCheckpoint.readNumbers(data, offset, nodeCount)
+
+        nodes: list[ProblemNode] = []
+        for index in range(nodeCount):
+            parent = parents[index]
+            action = actions[index]
+            nodes.append(
+                ProblemNode(
+                    parent=None if parent < 0 else nodes[parent],
+                    state=stateTable[states[index]],
+                    action=None if action < 0 else actionTable[action],
+                    pathCost=pathCosts[index],
+                    heuristicDist=heuristicDists[index],
+                )
+            )
+
+        (frontierCount,) = struct.unpack_from("<I", data, offset)
+        frontier, offset = SearchCheckpoint.readColumn(data, offset + 4, "I", frontierCount)
+        (exploredCount,) = struct.unpack_from("<I", data, offset)
+        explored, offset = SearchCheckpoint.readColumn(data, offset + 4, "I", exploredCount)
+
+        return SearchCheckpoint(
+            kind, [nodes[index] for index in frontier], [stateTable[index] for index in explored], problemKey
+        )
+
+    @staticmethod
+    def encodeGoal(problem: Problem) -> tuple[bytes, Optional[list[bytes]]]:
+        """
+        Obiettivo codificato: gli stati di `Problem.getGoalStates` (ordinati) se disponibili,
+        altrimenti l'obiettivo serializzato con pickle. Restituisce anche gli stati codificati (o None)
+        """
+        try:
+            goalStates = sorted(problem.encodeState(state) for state in problem.getGoalStates())
+        except NotImplementedError:
+            return (pickle.dumps(problem.goal, protocol=pickle.HIGHEST_PROTOCOL), None)
+        file = io.BytesIO()
+        SearchCheckpoint.writeObjects(file, goalStates, bytes)
+        return (file.getvalue(), goalStates)
+
+    @staticmethod
+    def problemKey(problem: Problem) -> list[bytes]:
+        """Impronta (`Problem.fingerprint`) e obiettivo codificato del problema"""
+        return [problem.fingerprint(), SearchCheckpoint.encodeGoal(problem)[0]]
+
+    def rootState(self) -> State:
+        """Stato iniziale della ricerca salvata (radice delle catene dei padri)"""
+        if len(self.frontier) == 0:
+            raise ValueError("Checkpoint senza frontiera")
+        node = self.frontier[0]
+        while node.parent is not None:
+            node = node.parent
+        return node.state
+
+    @staticmethod
+    def writeObjects(file, table: Iterable[Hashable], encode: Callable[[Hashable], bytes]) -> None:
+        encoded = [encode(value) for value in table]
+        file.write(struct.pack("<I", len(encoded)))
+        SearchCheckpoint.writeColumn(file, array("I", (len(value) for value in encoded)))
+        file.write(b"".join(encoded))
+
+    @staticmethod
+    def readObjects(data: memoryview, offset: int, decode: Callable[[bytes], Hashable]) -> tuple[list, int]:
+        (count,) = struct.unpack_from("<I", data, offset)
+        lengths, offset = SearchCheckpoint.readColumn(data, offset + 4, "I", count)
+        objects = []
+        for length in lengths:
+            objects.append(decode(bytes(data[offset : offset + length])))
+            offset += length
+        return (objects, offset)
+
+    @staticmethod
+    def writeNumbers(file, values: list[float]) -> None:
+        """Colonna di numeri: i64 se sono tutti interi (nei limiti di i64), altrimenti f64"""
+        typecode = "q"
+        for value in values:
+            if not isinstance(value, int) or not -(2**63) <= value < 2**63:
+                typecode = "d"
+                break
+        file.write(typecode.encode())
+        SearchCheckpoint.writeColumn(file, array(typecode, values))
+
+    @staticmethod
+    def readNumbers(data: memoryview, offset: int, count: int) -> tuple[array, int]:
+        typecode = chr(data[offset])
+        if typecode not in ("q", "d"):
+            raise ValueError(f"Tipo di colonna non valido: {typecode!r}")
+        return SearchCheckpoint.readColumn(data, offset + 1, typecode, count)
+
+    # le colonne sono sempre salvate in little-endian
+
+    @staticmethod
+    def writeColumn(file, column: array) -> None:
+        if sys.byteorder == "big":
+            column = array(column.typecode, column)
+            column.byteswap()
+        file.write(column.tobytes())
+
+    @staticmethod
+    def readColumn(data: memoryview, offset: int, typecode: str, count: int) -> tuple[array, int]:
+        column = array(typecode)
+        end = offset + count * column.itemsize
+        column.frombytes(data[offset:end])
+        if sys.byteorder == "big":
+            column.byteswap()
+        return (column, end)
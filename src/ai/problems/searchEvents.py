@@ -0,0 +1,94 @@
+from typing import Optional
+
+from ai.core.action import Action
+
+# stesso tipo di SolutionType di ProblemSolving (non importabile qui senza import circolari)
+type EventSolutionType = Optional[tuple[Optional[list[Action]], float]]
+
+
+class SearchEvent:
+    """
+    Evento prodotto dalle versioni a generatore (`...Stream`) degli algoritmi di `ProblemSolving`.
+    **elapsed** è il tempo in secondi dall'inizio della ricerca
+    """
+
+    __slots__ = ("elapsed",)
+
+    def __init__(self, elapsed: float):
+        self.elapsed = elapsed
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+class ProgressEvent(SearchEvent):
+    """
+    Avanzamento della ricerca, prodotto ogni `progressInterval` nodi espansi
+    (e, per le ricerche ad approfondimento iterativo, all'inizio di ogni iterazione)
+    """
+
+    __slots__ = ("expanded", "generated", "frontierSize", "bound")
+
+    def __init__(self, expanded: int, generated: int, frontierSize: int, bound: float, elapsed: float):
+        """
+        **expanded**: *int*                       - nodi espansi fino ad ora\\
+        **generated**: *int*                      - nodi generati fino ad ora\\
+        **frontierSize**: *int*                   - nodi in frontiera (per le ricerche in profondità: lunghezza del percorso)\\
+        **bound**: *float*                        - priorità del nodo espanso (es: f per A*),
+                                                    oppure soglia su f o profondità dell'iterazione corrente
+        """
+        super().__init__(elapsed)
+        self.expanded = expanded
+        self.generated = generated
+        self.frontierSize = frontierSize
+        self.bound = bound
+
+    def __str__(self) -> str:
+        return (
+            f"Espansi: {self.expanded}, generati: {self.generated}, frontiera: {self.frontierSize}, "
+            f"limite: {self.bound} ({self.elapsed:.3f}s)"
+        )
+
+
+class SolutionEvent(SearchEvent):
+    """
+    Soluzione trovata: le ricerche anytime ne producono una ogni volta che la soluzione
+    (o il suo limite di subottimalità) migliora, le altre una sola prima di terminare
+    """
+
+    __slots__ = ("solution", "bound")
+
+    def __init__(self, solution: EventSolutionType, bound: Optional[float], elapsed: float):
+        """
+        **solution**: *SolutionType*              - (azioni, costo)\\
+        **bound**: *Optional[float]*              - limite di subottimalità: costo / costo ottimo <= bound
+                                                    (None se l'algoritmo non lo conosce)
+        """
+        super().__init__(elapsed)
+        self.solution = solution
+        self.bound = bound
+
+    def __str__(self) -> str:
+        bound = "" if self.bound is None else f", limite di subottimalità {self.bound:.3f}"
+        return f"Soluzione di costo {self.solution[1]}{bound} ({self.elapsed:.3f}s)"
+
+
+class FinishedEvent(SearchEvent):
+    """
+    Ultimo evento di ogni ricerca: **solution** è il valore che restituirebbe la versione bloccante
+    (soluzione, `ProblemSolving.CUTOFF` o `ProblemSolving.NO_SOLUTIONS`)
+    """
+
+    __slots__ = ("solution", "bound")
+
+    def __init__(self, solution: EventSolutionType, bound: Optional[float], elapsed: float):
+        super().__init__(elapsed)
+        self.solution = solution
+        self.bound = bound
+
+    def __str__(self) -> str:
+        if self.solution is None:
+            return f"Ricerca interrotta ({self.elapsed:.3f}s)"
+        if self.solution[0] is None:
+            return f"Non ci sono soluzioni ({self.elapsed:.3f}s)"
+        return f"Ricerca terminata con costo {self.solution[1]} ({self.elapsed:.3f}s)"
@@ -0,0 +1,117 @@
+import time
+from typing import Optional
+
+
+class SearchStatistics:
+    """
+    Contatori raccolti (opzionalmente) dagli algoritmi di `ProblemSolving`.
+    Gli algoritmi aggiornano direttamente gli attributi, solo se ricevono un'istanza di questa classe:
+    senza statistiche il costo è un confronto con None per nodo espanso
+    """
+
+    def __init__(self):
+        # nodi di cui sono stati generati i successori
+        self.expanded = 0
+        # nodi figli creati
+        self.generated = 0
+        # figli scartati perché il loro stato era già stato raggiunto (con un costo non peggiore)
+        self.duplicates = 0
+        # nodi rigenerati o espansi di nuovo dopo essere stati chiusi o dimenticati (es: SMA*)
+        self.reopened = 0
+        # massime dimensioni raggiunte dalla frontiera e dall'insieme degli stati esplorati
+        # (per le ricerche in profondità: lo stack e gli stati del percorso corrente;
+        # le versioni ricorsive non hanno una frontiera esplicita e non aggiornano peakFrontier)
+        self.peakFrontier = 0
+        self.peakExplored = 0
+        # numero di azioni della soluzione trovata (None se non trovata)
+        self.solutionDepth: Optional[int] = None
+
+        self.startTime: Optional[float] = None
+        self.endTime: Optional[float] = None
+
+    def start(self) -> None:
+        self.startTime = time.perf_counter()
+        self.endTime = None
+
+    def stop(self, solutionDepth: Optional[int] = None) -> None:
+        self.endTime = time.perf_counter()
+        self.solutionDepth = solutionDepth
+
+    def updatePeaks(self, frontierSize: int, exploredSize: int) -> None:
+        if frontierSize > self.peakFrontier:
+            self.peakFrontier = frontierSize
+        if exploredSize > self.peakExplored:
+            self.peakExplored = exploredSize
+
+    @property
+    def elapsed(self) -> float:
+        """Tempo trascorso in secondi (fino ad ora, se la ricerca non è terminata)"""
+        if self.startTime is None:
+            return 0.0
+        end = self.endTime if self.endTime is not None else time.perf_counter()
+        return end - self.startTime
+
+    @property
+    def nodesPerSecond(self) -> float:
+        """Nodi espansi al secondo"""
+        elapsed = self.elapsed
+        return self.expanded / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def effectiveBranchingFactor(self) -> Optional[float]:
+        """
+        Fattore di ramificazione b* di un albero uniforme di profondità pari alla soluzione
+        che contiene tutti i nodi generati: N + 1 = 1 + b* + b*^2 + ... + b*^d.
+        None se non c'è una soluzione (o se è vuota)
+        """
+        depth = self.solutionDepth
+        if depth is None or depth == 0 or self.generated == 0:
+            return None
+
+        total = self.generated + 1
+
+        def treeSize(b: float) -> float:
+            size, level = 1.0, 1.0
+            for _ in range(depth):
+                level *= b
+                size += level
+            return size
+
+        # treeSize è crescente in b: ricerca per bisezione in [0, N]
+        low, high = 0.0, float(max(self.generated, 1))
+        for _ in range(100):
+            middle = (low + high) / 2
+            if treeSize(middle) < total:
+                low = middle
+            else:
+                high = middle
+            if high - low < 1e-6:
+                break
+        return (low + high) / 2
+
+    def asDict(self) -> dict[str, Optional[float]]:
+        return {
+            "expanded": self.expanded,
+            "generated": self.generated,
+            "duplicates": self.duplicates,
+            "reopened": self.reopened,
+            "peakFrontier": self.peakFrontier,
+            "peakExplored": self.peakExplored,
+            "solutionDepth": self.solutionDepth,
+            "effectiveBranchingFactor": self.effectiveBranchingFactor,
+            "elapsed": self.elapsed,
+            "nodesPerSecond": self.nodesPerSecond,
+        }
+
+    def __str__(self) -> str:
+        branchingFactor = self.effectiveBranchingFactor
+        return (
+            f"Espansi: {self.expanded}, generati: {self.generated}, duplicati: {self.duplicates}, "
+            f"riaperti: {self.reopened}, frontiera max: {self.peakFrontier}, "
+            f"esplorati max: {self.peakExplored}, "
+            f"b*: {'-' if branchingFactor is None else f'{branchingFactor:.3f}'}, "
+            f"nodi/s: {self.nodesPerSecond:.0f}"
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
@@ -0,0 +1,270 @@
+import io
+import sqlite3
+from collections import OrderedDict
+from threading import Event, Lock
+from typing import Optional
+
+from ai.core.action import Action
+from ai.problems.problem import Problem
+from ai.problems.problemSolving import ProblemSolving, SearchAlgorithmType, SolutionType
+from ai.problems.searchCheckpoint import SearchCheckpoint
+
+# (impronta del problema, algoritmo, stato iniziale, obiettivo); l'algoritmo è "" per le soluzioni ottime
+type CacheKeyType = tuple[bytes, str, bytes, bytes]
+
+
+class CachedSolution:
+    """
+    Soluzione memorizzata: azioni, costi cumulati e stati attraversati (codificati con `Problem.encodeState`),
+    che permettono di rispondere anche dai sottopercorsi. **actions** è None se non ci sono soluzioni
+    """
+
+    __slots__ = ("actions", "costs", "states")
+
+    def __init__(self, actions: Optional[list[Action]], costs: list[float], states: list[bytes]):
+        """
+        **actions**: *Optional[list[Action]]*     - azioni della soluzione\\
+        **costs**: *list[float]*                  - costo del percorso dopo ogni azione (il primo è 0)\\
+        **states**: *list[bytes]*                 - stati codificati, dallo stato iniziale all'obiettivo
+        """
+        self.actions = actions
+        self.costs = costs
+        self.states = states
+
+    def subpath(self, first: int, last: int) -> SolutionType:
+        return (self.actions[first:last], self.costs[last] - self.costs[first])
+
+
+class SolutionCache:
+    """
+    Cache delle soluzioni davanti agli algoritmi di `ProblemSolving`: le richieste vengono identificate
+    da impronta del problema (`Problem.fingerprint`), stato iniziale e obiettivo (gli stati di
+    `Problem.getGoalStates`, se disponibili). Le soluzioni restano in una cache LRU in memoria
+    e, se è indicato **path**, in un database sqlite condiviso tra le esecuzioni (e tra i processi).
+
+    Le soluzioni degli algoritmi dichiarati ottimi (vedi `cached`) rispondono anche alle richieste
+    degli altri algoritmi, e ogni loro sottopercorso è a sua volta ottimo: una richiesta che parte
+    da uno stato intermedio di una soluzione ottima già nota usa il suffisso (stesso obiettivo)
+    oppure il tratto fino all'unico stato obiettivo, se questo compare più avanti nel percorso.
+    Le soluzioni degli altri algoritmi valgono solo per lo stesso algoritmo e la stessa richiesta.
+
+    Le ricerche interrotte (`ProblemSolving.CUTOFF`) non vengono memorizzate
+    """
+
+    def __init__(self, maxSize: Optional[int] = 1024, path: Optional[str] = None):
+        """
+        **maxSize**: *Optional[int]*              - soluzioni tenute in memoria (None: illimitate)\\
+        **path**: *Optional[str]*                 - database sqlite delle soluzioni (None: solo in memoria)
+        """
+        self.maxSize = maxSize
+        self.path = path
+        self.entries: OrderedDict[CacheKeyType, CachedSolution] = OrderedDict()
+        # (impronta, stato) -> posizione dello stato in ogni soluzione ottima che lo attraversa
+        self.positions: dict[tuple[bytes, bytes], dict[CacheKeyType, int]] = {}
+        self.hits = 0
+        self.subpathHits = 0
+        self.misses = 0
+        # le ricerche con stopEvent girano su thread diversi da quello che ha creato la cache
+        self.lock = Lock()
+        self.connection = None
+        if path is not None:
+            self.connection = sqlite3.connect(path, check_same_thread=False)
+            with self.connection:
+                self.connection.execute(
+                    "CREATE TABLE IF NOT EXISTS solutions (id INTEGER PRIMARY KEY, fingerprint BLOB, "
+                    "search TEXT, start BLOB, goal BLOB, actions BLOB, costs BLOB, states BLOB, "
+                    "UNIQUE (fingerprint, search, start, goal))"
+                )
+                self.connection.execute(
+                    "CREATE TABLE IF NOT EXISTS positions (fingerprint BLOB, state BLOB, solution INTEGER)"
+                )
+                self.connection.execute(
+                    "CREATE INDEX IF NOT EXISTS positionsByState ON positions (fingerprint, state)"
+                )
+
+    def cached(
+        self, search: SearchAlgorithmType, optimal: bool = False, name: Optional[str] = None
+    ) -> SearchAlgorithmType:
+        """
+        Restituisce **search** preceduto dalla cache, utilizzabile ovunque serva un `SearchAlgorithmType`
+        (es: `ProblemSolving.simpleProblemSolvingAgent`).\\
+        **optimal**: *bool*                       - True se **search** trova sempre soluzioni di costo minimo
+                                                    (es: uniformSearch, aStarSearch con heuristica ammissibile)\\
+        **name**: *Optional[str]*                 - nome dell'algoritmo nelle chiavi (default: `__qualname__`)
+        """
+        searchName = name if name is not None else getattr(search, "__qualname__", repr(search))
+
+        def cachedSearch(problem: Problem, stopEvent: Event) -> SolutionType:
+            return self.search(problem, stopEvent, search, optimal, searchName)
+
+        return cachedSearch
+
+    def search(
+        self,
+        problem: Problem,
+        stopEvent: Event,
+        search: SearchAlgorithmType,
+        optimal: bool = False,
+        name: Optional[str] = None,
+    ) -> SolutionType:
+        searchName = name if name is not None else getattr(search, "__qualname__", repr(search))
+        solution = self.lookup(problem, searchName)
+        if solution is not None:
+            return solution
+
+        solution = search(problem, stopEvent)
+        if solution is not ProblemSolving.CUTOFF:
+            self.store(problem, searchName, solution, optimal)
+        return solution
+
+    def lookup(self, problem: Problem, searchName: str) -> SolutionType:
+        """Soluzione memorizzata per il problema, oppure None se la richiesta non è in cache"""
+        fingerprint, start, goal, goalStates = SolutionCache.requestKey(problem)
+        with self.lock:
+            solution = self.lookupEntries(fingerprint, searchName, start, goal, goalStates)
+            if solution is None and self.connection is not None:
+                # carica dal database le soluzioni candidate e ripete la ricerca in memoria
+                self.loadCandidates(problem, fingerprint, searchName, start, goal)
+                solution = self.lookupEntries(fingerprint, searchName, start, goal, goalStates)
+            if solution is None:
+                self.misses += 1
+            return solution
+
+    def lookupEntries(
+        self, fingerprint: bytes, searchName: str, start: bytes, goal: bytes, goalStates: Optional[list[bytes]]
+    ) -> SolutionType:
+        for key in ((fingerprint, "", start, goal), (fingerprint, searchName, start, goal)):
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                if entry.actions is None:
+                    return ProblemSolving.NO_SOLUTIONS
+                return entry.subpath(0, len(entry.actions))
+
+        # sottopercorsi delle soluzioni ottime che attraversano lo stato iniziale
+        for key, first in self.positions.get((fingerprint, start), {}).items():
+            entry = self.entries[key]
+            last = None
+            if key[3] == goal:
+                last = len(entry.actions)
+            elif goalStates is not None and len(goalStates) == 1:
+                last = self.positions.get((fingerprint, goalStates[0]), {}).get(key)
+            if last is not None and last >= first:
+                self.entries.move_to_end(key)
+                self.subpathHits += 1
+                return entry.subpath(first, last)
+        return None
+
+    def store(self, problem: Problem, searchName: str, solution: SolutionType, optimal: bool = False) -> None:
+        """Memorizza la soluzione (o l'assenza di soluzioni) trovata da **searchName** per il problema"""
+        fingerprint, start, goal, _ = SolutionCache.requestKey(problem)
+        actions = solution[0]
+        costs = [0]
+        states = [start]
+        if actions is not None:
+            state = problem.initialState
+            for action in actions:
+                costs.append(costs[-1] + problem.pathCostFunction(state, action))
+                state = problem.transitionModel(state, action)
+                states.append(problem.encodeState(state))
+        else:
+            # l'assenza di soluzioni non ha sottopercorsi: vale solo per l'algoritmo che l'ha stabilita
+            optimal = False
+
+        key = (fingerprint, "" if optimal else searchName, start, goal)
+        entry = CachedSolution(actions, costs, states)
+        with self.lock:
+            self.addEntry(key, entry)
+            if self.connection is not None:
+                self.saveEntry(problem, key, entry)
+
+    def addEntry(self, key: CacheKeyType, entry: CachedSolution) -> None:
+        if key in self.entries:
+            self.removeEntry(key)
+        self.entries[key] = entry
+        if key[1] == "" and entry.actions is not None:
+            for position, state in enumerate(entry.states):
+                # uno stato ripetuto (azioni a costo nullo) viene indicizzato alla prima occorrenza
+                self.positions.setdefault((key[0], state), {}).setdefault(key, position)
+
+        while self.maxSize is not None and len(self.entries) > self.maxSize:
+            self.removeEntry(next(iter(self.entries)))
+
+    def removeEntry(self, key: CacheKeyType) -> None:
+        entry = self.entries.pop(key)
+        if key[1] == "" and entry.actions is not None:
+            for state in entry.states:
+                index = self.positions.get((key[0], state))
+                if index is not None:
+                    index.pop(key, None)
+                    if len(index) == 0:
+                        del self.positions[(key[0], state)]
+
+    # Database
+
+    def saveEntry(self, problem: Problem, key: CacheKeyType, entry: CachedSolution) -> None:
+        actions = None
+        if entry.actions is not None:
+            file = io.BytesIO()
+            SearchCheckpoint.writeObjects(file, entry.actions, problem.encodeAction)
+            actions = file.getvalue()
+        costs = io.BytesIO()
+        SearchCheckpoint.writeNumbers(costs, entry.costs)
+        states = io.BytesIO()
+        SearchCheckpoint.writeObjects(states, entry.states, bytes)
+
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM positions WHERE solution IN (SELECT id FROM solutions "
+                "WHERE fingerprint = ? AND search = ? AND start = ? AND goal = ?)",
+                key,
+            )
+            cursor = self.connection.execute(
+                "INSERT OR REPLACE INTO solutions (fingerprint, search, start, goal, actions, costs, states) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (*key, actions, costs.getvalue(), states.getvalue()),
+            )
+            if key[1] == "" and entry.actions is not None:
+                solution = cursor.lastrowid
+                self.connection.executemany(
+                    "INSERT INTO positions (fingerprint, state, solution) VALUES (?, ?, ?)",
+                    ((key[0], state, solution) for state in set(entry.states)),
+                )
+
+    def loadCandidates(self, problem: Problem, fingerprint: bytes, searchName: str, start: bytes, goal: bytes) -> None:
+        """Porta in memoria le soluzioni del database che possono rispondere alla richiesta"""
+        rows = self.connection.execute(
+            "SELECT search, start, goal, actions, costs, states FROM solutions "
+            "WHERE fingerprint = ? AND search IN ('', ?) AND start = ? AND goal = ? "
+            "UNION SELECT search, start, goal, actions, costs, states FROM solutions "
+            "WHERE id IN (SELECT solution FROM positions WHERE fingerprint = ? AND state = ?)",
+            (fingerprint, searchName, start, goal, fingerprint, start),
+        ).fetchall()
+        for search, solutionStart, solutionGoal, actions, costs, states in rows:
+            key = (fingerprint, search, solutionStart, solutionGoal)
+            if key in self.entries:
+                continue
+            states, _ = SearchCheckpoint.readObjects(memoryview(states), 0, bytes)
+            costs, _ = SearchCheckpoint.readNumbers(memoryview(costs), 0, len(states))
+            if actions is not None:
+                actions, _ = SearchCheckpoint.readObjects(memoryview(actions), 0, problem.decodeAction)
+            self.addEntry(key, CachedSolution(actions, costs.tolist(), states))
+
+    def close(self) -> None:
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    @staticmethod
+    def requestKey(problem: Problem) -> tuple[bytes, bytes, bytes, Optional[list[bytes]]]:
+        """(impronta del problema, stato iniziale, obiettivo, stati obiettivo) codificati"""
+        start = problem.encodeState(problem.initialState)
+        goal, goalStates = SearchCheckpoint.encodeGoal(problem)
+        return (problem.fingerprint(), start, goal, goalStates)
+
+    def __str__(self) -> str:
+        return (
+            f"Soluzioni in cache: {len(self.entries)}, successi: {self.hits}, "
+            f"da sottopercorsi: {self.subpathHits}, fallimenti: {self.misses}"
+        )
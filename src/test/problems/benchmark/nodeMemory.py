@@ -0,0 +1,145 @@
+"""
+Misura la memoria occupata da ogni nodo generato durante una ricerca, confrontando
+il vecchio layout di `ProblemNode` (con __dict__ e lista children sempre popolata)
+con quello attuale (__slots__, children mantenuti solo su richiesta).
+
+Esecuzione (dalla cartella src):
+    python -m test.problems.benchmark.nodeMemory [NUMERO_NODI]
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import tracemalloc
+from collections import deque
+from collections.abc import Callable
+from test.problems.nPuzzle.nPuzzle import (
+    NPuzzleAgent,
+    NPuzzleEnvironment,
+    NPuzzleGoal,
+    NPuzzleProblem,
+    generateRandomState,
+    generateSortedState,
+    manhattanDistance,
+)
+from typing import Optional
+
+from ai.core.action import Action
+from ai.core.state import State
+from ai.problems.problemNode import ProblemNode
+
+
+class LegacyProblemNode:
+    """Copia del layout precedente di ProblemNode, usata come riferimento"""
+
+    def __init__(
+        self,
+        parent: Optional[LegacyProblemNode],
+        state: State,
+        action: Optional[Action],
+        pathCost: float,
+        heuristicDist: float,
+    ):
+        self.parent = parent
+        self.children: list[LegacyProblemNode] = []
+        self.state = state
+        self.action = action
+        self.pathCost = pathCost
+        self.heuristicDist = heuristicDist
+
+    def addChild(self, child: LegacyProblemNode) -> None:
+        self.children.append(child)
+        child.parent = self
+
+
+def generateExpansions(
+    problem: NPuzzleProblem, count: int
+) -> list[tuple[int, State, Optional[Action], float, float]]:
+    """
+    Genera in ampiezza **count** nodi (come indice del padre, stato, azione, costo, euristica),
+    in modo che la misura successiva riguardi solo la creazione dei nodi e non degli stati
+    """
+    initialState = problem.initialState
+    expansions = [(-1, initialState, None, 0, problem.heuristicDistFunction(initialState))]
+    fringe = deque([0])
+    while len(expansions) < count:
+        parentIndex = fringe.popleft()
+        _, state, _, pathCost, _ = expansions[parentIndex]
+        for action in problem.getActionsFromState(state):
+            if len(expansions) == count:
+                break
+            newState = problem.transitionModel(state, action)
+            expansions.append(
+                (
+                    parentIndex,
+                    newState,
+                    action,
+                    pathCost + problem.pathCostFunction(state, action),
+                    problem.heuristicDistFunction(newState),
+                )
+            )
+            fringe.append(len(expansions) - 1)
+    return expansions
+
+
+def measureBytesPerNode(
+    expansions: list[tuple[int, State, Optional[Action], float, float]],
+    createNode: Callable[[Optional[object], tuple], object],
+) -> float:
+    nodes: list[Optional[object]] = [None] * len(expansions)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i, expansion in enumerate(expansions):
+        parentIndex = expansion[0]
+        nodes[i] = createNode(nodes[parentIndex] if parentIndex >= 0 else None, expansion)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return (after - before) / len(expansions)
+
+
+def createLegacyNode(parent: Optional[LegacyProblemNode], expansion: tuple) -> LegacyProblemNode:
+    _, state, action, pathCost, heuristicDist = expansion
+    node = LegacyProblemNode(parent, state, action, pathCost, heuristicDist)
+    if parent is not None:
+        parent.addChild(node)
+    return node
+
+
+def nodeFactory(retainTree: bool) -> Callable[[Optional[ProblemNode], tuple], ProblemNode]:
+    def createNode(parent: Optional[ProblemNode], expansion: tuple) -> ProblemNode:
+        _, state, action, pathCost, heuristicDist = expansion
+        node = ProblemNode(parent, state, action, pathCost, heuristicDist, retainTree=retainTree)
+        if parent is not None:
+            parent.addChild(node)
+        return node
+
+    return createNode
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    random.seed(0)
+    initialState = generateRandomState(3)
+    goal = NPuzzleGoal(generateSortedState(3))
+    environment = NPuzzleEnvironment(initialState)
+    problem = NPuzzleProblem(initialState, environment, [NPuzzleAgent()], goal, manhattanDistance)
+
+    print(f"Genero {count} nodi (8-puzzle, espansione in ampiezza)...")
+    expansions = generateExpansions(problem, count)
+
+    results = {
+        "Prima (__dict__ + children sempre)": measureBytesPerNode(expansions, createLegacyNode),
+        "Dopo (__slots__, retainTree=True)": measureBytesPerNode(expansions, nodeFactory(True)),
+        "Dopo (__slots__, retainTree=False)": measureBytesPerNode(expansions, nodeFactory(False)),
+    }
+
+    for name, bytesPerNode in results.items():
+        print(f"{name:<40} {bytesPerNode:>8.1f} byte/nodo")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,446 @@
+"""
+Benchmark riproducibile degli algoritmi di `ProblemSolving` sui problemi di esempio:
+- 8-puzzle e 15-puzzle: istanze casuali generate con `generateRandomState` a partire da semi fissi
+- googleMaps: percorsi da ogni città della `costMatrix` verso Bucharest (l'unica destinazione dell'euristica)
+- vacuumCleaner: tutte le coppie (stato iniziale, stato obiettivo)
+
+Per ogni coppia (istanza, algoritmo) vengono eseguite **warmup** esecuzioni non misurate, **repeats**
+esecuzioni cronometrate e infine un'esecuzione con tracemalloc (che rallenta la ricerca e quindi
+non viene cronometrata) per misurare il picco di memoria. I risultati (tempi, nodi espansi e generati,
+picco di memoria, costo della soluzione) vengono salvati in JSON e confrontati con una baseline.
+
+Esecuzione (dalla cartella src):
+    python -m test.problems.benchmark.suite [--suites romania vacuum 8-puzzle] [--output risultati.json]
+                                            [--heuristic manhattan] [--baseline baseline.json] [--save-baseline]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import statistics as stats
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from datetime import datetime, timezone
+from pathlib import Path
+from test.problems.googleMaps.googleMaps import (
+    CityState,
+    GoogleMapsAgent,
+    GoogleMapsEnvironment,
+    GoogleMapsGoal,
+    GoogleMapsProblem,
+    costMatrix,
+)
+from test.problems.nPuzzle.nPuzzle import (
+    NPuzzleAgent,
+    NPuzzleEnvironment,
+    NPuzzleGoal,
+    NPuzzleProblem,
+    PackedNPuzzleProblem,
+    PackedNPuzzleState,
+    generateRandomState,
+    generateSortedState,
+    linearConflict,
+    manhattanDistance,
+    walkingDistance,
+)
+from test.problems.vacuumCleaner.vacuumCleaner import (
+    ALL_STATES,
+    VacuumAgent,
+    VacuumEnvironment,
+    VacuumGoal,
+    VacuumProblem,
+)
+from threading import Event, Timer
+from typing import Any, Optional
+
+from ai.problems.hashDistributedSearch import HashDistributedAStar
+from ai.problems.problem import Problem
+from ai.problems.problemSolving import ProblemSolving, SearchAlgorithmType, SolutionType
+from ai.problems.searchStatistics import SearchStatistics
+
+# come i risultati, la baseline dipende dalla macchina: viene letta e salvata nella cartella di lavoro
+DEFAULT_BASELINE = Path("baseline.json")
+
+# nodi in memoria concessi a SMA*
+SMA_STAR_MAX_NODES = 10_000
+
+# tracemalloc rallenta la ricerca: il limite di tempo della misura di memoria viene moltiplicato
+TRACEMALLOC_SLOWDOWN = 5
+
+
+def smaStarSearch(
+    problem: Problem, stopEvent: Event, statistics: Optional[SearchStatistics] = None
+) -> SolutionType:
+    return ProblemSolving.smaStarSearch(problem, stopEvent, SMA_STAR_MAX_NODES, statistics)
+
+
+def hashDistributedAStar(
+    problem: Problem, stopEvent: Event, statistics: Optional[SearchStatistics] = None
+) -> SolutionType:
+    return HashDistributedAStar.search(problem, stopEvent, statistics=statistics)
+
+
+ALGORITHMS: dict[str, SearchAlgorithmType] = {
+    name: getattr(ProblemSolving, name)
+    for name in [
+        "breadthFirstSearch",
+        "frontierBreadthFirstSearch",
+        "depthFirstSearch",
+        "depthFirstSearchRecursive",
+        "depthFirstSearchIterative",
+        "iterativeDeepeningSearch",
+        "iterativeDeepeningSearchIncremental",
+        "uniformSearch",
+        "greedySearch",
+        "aStarSearch",
+        "araStarSearch",
+        "iterativeDeepeningAStar",
+        "bidirectionalBreadthFirstSearch",
+        "bidirectionalUniformSearch",
+    ]
+}
+ALGORITHMS["smaStarSearch"] = smaStarSearch
+ALGORITHMS["hashDistributedAStar"] = hashDistributedAStar
+
+# euristiche delle istanze n-puzzle
+HEURISTICS = {
+    "manhattan": manhattanDistance,
+    "linearConflict": linearConflict,
+    "walkingDistance": walkingDistance,
+}
+
+
+# Insiemi di istanze: ognuno genera coppie (nome istanza, problema), sempre nello stesso ordine
+
+
+def nPuzzleInstances(
+    dimension: int, count: int, firstSeed: int, heuristic: str = "manhattan", packed: bool = False
+) -> Iterator[tuple[str, Problem]]:
+    goalState = generateSortedState(dimension)
+    if packed:
+        goalState = PackedNPuzzleState.fromBoard(goalState.board, dimension)
+    goal = NPuzzleGoal(goalState)
+    for seed in range(firstSeed, firstSeed + count):
+        random.seed(seed)
+        initialState = generateRandomState(dimension)
+        if packed:
+            # stesse istanze della versione con tuple
+            initialState = PackedNPuzzleState.fromBoard(initialState.board, dimension)
+        environment = NPuzzleEnvironment(initialState)
+        problemType = PackedNPuzzleProblem if packed else NPuzzleProblem
+        problem = problemType(initialState, environment, [NPuzzleAgent()], goal, HEURISTICS[heuristic])
+        yield (f"seed={seed}", problem)
+
+
+def romaniaInstances() -> Iterator[tuple[str, Problem]]:
+    goalState = CityState("Bucharest")
+    for cityName in costMatrix:
+        if cityName == goalState.name:
+            continue
+        initialState = CityState(cityName)
+        environment = GoogleMapsEnvironment(initialState)
+        problem = GoogleMapsProblem(
+            initialState, environment, [GoogleMapsAgent()], GoogleMapsGoal(goalState)
+        )
+        yield (f"{cityName}-{goalState.name}", problem)
+
+
+def vacuumInstances() -> Iterator[tuple[str, Problem]]:
+    for initialState in ALL_STATES:
+        for goalState in ALL_STATES:
+            environment = VacuumEnvironment(initialState)
+            problem = VacuumProblem(initialState, environment, [VacuumAgent()], VacuumGoal(goalState))
+            yield (f"{initialState.bitmap}-{goalState.bitmap}", problem)
+
+
+def createSuites(
+    instances: int, firstSeed: int, heuristic: str = "manhattan", packed: bool = False
+) -> dict[str, Callable[[], Iterator[tuple[str, Problem]]]]:
+    return {
+        "romania": romaniaInstances,
+        "vacuum": vacuumInstances,
+        "8-puzzle": lambda: nPuzzleInstances(3, instances, firstSeed, heuristic, packed),
+        "15-puzzle": lambda: nPuzzleInstances(4, instances, firstSeed, heuristic, packed),
+    }
+
+
+# Esecuzione
+
+
+def runOnce(
+    search: SearchAlgorithmType, problem: Problem, timeout: float
+) -> tuple[str, SolutionType, SearchStatistics, Optional[str]]:
+    """Esegue una ricerca con limite di tempo; restituisce (esito, soluzione, statistiche, errore)"""
+    stopEvent = Event()
+    timer = Timer(timeout, stopEvent.set)
+    timer.daemon = True
+    timer.start()
+
+    statistics = SearchStatistics()
+    statistics.start()
+    solution = ProblemSolving.CUTOFF
+    try:
+        solution = search(problem, stopEvent, statistics=statistics)
+    except Exception as e:
+        return ("error", ProblemSolving.CUTOFF, statistics, repr(e))
+    finally:
+        timer.cancel()
+        actions = None if solution is None else solution[0]
+        statistics.stop(None if actions is None else len(actions))
+
+    if solution is ProblemSolving.CUTOFF:
+        return ("timeout" if stopEvent.is_set() else "cutoff", solution, statistics, None)
+    if solution[0] is None:
+        return ("no_solutions", solution, statistics, None)
+    return ("solved", solution, statistics, None)
+
+
+def benchmark(
+    suite: str,
+    instance: str,
+    algorithm: str,
+    problem: Problem,
+    timeout: float,
+    warmup: int,
+    repeats: int,
+) -> dict[str, Any]:
+    search = ALGORITHMS[algorithm]
+
+    times: list[float] = []
+    for i in range(max(1, warmup + repeats)):
+        status, solution, statistics, error = runOnce(search, problem, timeout)
+        # inutile ripetere una ricerca interrotta dal timeout o fallita
+        if status in ("timeout", "error"):
+            times.clear()
+            break
+        if i >= warmup:
+            times.append(statistics.elapsed)
+
+    # esecuzione separata con tracemalloc per il picco di memoria
+    peakMemory = None
+    if status not in ("timeout", "error"):
+        tracemalloc.start()
+        memoryStatus = runOnce(search, problem, timeout * TRACEMALLOC_SLOWDOWN)[0]
+        if memoryStatus == status:
+            peakMemory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "suite": suite,
+        "instance": instance,
+        "algorithm": algorithm,
+        "status": status,
+        "error": error,
+        "cost": solution[1] if status == "solved" else None,
+        "solutionLength": statistics.solutionDepth,
+        "times": times,
+        "medianTime": stats.median(times) if len(times) > 0 else None,
+        "minTime": min(times) if len(times) > 0 else None,
+        "expanded": statistics.expanded,
+        "generated": statistics.generated,
+        "duplicates": statistics.duplicates,
+        "peakFrontier": statistics.peakFrontier,
+        "peakExplored": statistics.peakExplored,
+        "peakMemory": peakMemory,
+    }
+
+
+def runBenchmarks(arguments: argparse.Namespace) -> list[dict[str, Any]]:
+    ProblemSolving.compactExplored = arguments.compact_explored
+    suites = createSuites(arguments.instances, arguments.seed, arguments.heuristic, arguments.packed)
+    results = []
+    for suite in arguments.suites:
+        for instance, problem in suites[suite]():
+            for algorithm in arguments.algorithms:
+                result = benchmark(
+                    suite,
+                    instance,
+                    algorithm,
+                    problem,
+                    arguments.timeout,
+                    arguments.warmup,
+                    arguments.repeats,
+                )
+                results.append(result)
+                if not arguments.quiet:
+                    elapsed = "-" if result["medianTime"] is None else f"{result['medianTime']:.4f}s"
+                    print(
+                        f"{suite:<10} {instance:<28} {algorithm:<38} {result['status']:<13} "
+                        f"costo={result['cost']} espansi={result['expanded']} tempo={elapsed}"
+                    )
+    return results
+
+
+def gitCommit() -> Optional[str]:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() if output.returncode == 0 else None
+
+
+# Confronto con la baseline
+
+
+def compareWithBaseline(
+    results: list[dict[str, Any]],
+    baseline: dict[str, Any],
+    timeTolerance: float,
+    minTime: float,
+) -> tuple[list[str], list[str]]:
+    """
+    Confronta i risultati con quelli della baseline (stessa suite, istanza e algoritmo).
+    Restituisce (regressioni, miglioramenti) rispetto a esito, costo, nodi espansi e tempo mediano:
+    il tempo viene confrontato solo se supera **minTime** secondi e varia oltre **timeTolerance** (0.1 = 10%)
+    """
+    baselineResults = {
+        (result["suite"], result["instance"], result["algorithm"]): result
+        for result in baseline["results"]
+    }
+
+    regressions: list[str] = []
+    improvements: list[str] = []
+
+    for result in results:
+        key = (result["suite"], result["instance"], result["algorithm"])
+        old = baselineResults.get(key)
+        if old is None:
+            continue
+        name = "/".join(key)
+
+        if old["status"] != result["status"]:
+            message = f"{name}: esito {old['status']} -> {result['status']}"
+            (improvements if result["status"] == "solved" else regressions).append(message)
+            continue
+
+        if old["cost"] is not None and result["cost"] is not None and old["cost"] != result["cost"]:
+            message = f"{name}: costo {old['cost']} -> {result['cost']}"
+            (regressions if result["cost"] > old["cost"] else improvements).append(message)
+
+        if old["expanded"] != result["expanded"] and result["status"] != "timeout":
+            message = f"{name}: espansi {old['expanded']} -> {result['expanded']}"
+            (regressions if result["expanded"] > old["expanded"] else improvements).append(message)
+
+        if (
+            old["medianTime"] is not None
+            and result["medianTime"] is not None
+            and max(old["medianTime"], result["medianTime"]) >= minTime
+        ):
+            ratio = result["medianTime"] / old["medianTime"]
+            message = f"{name}: tempo {old['medianTime']:.4f}s -> {result['medianTime']:.4f}s ({ratio:.2f}x)"
+            if ratio > 1 + timeTolerance:
+                regressions.append(message)
+            elif ratio < 1 / (1 + timeTolerance):
+                improvements.append(message)
+
+    return (regressions, improvements)
+
+
+def parseArguments(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark degli algoritmi di ProblemSolving")
+    suites = ["romania", "vacuum", "8-puzzle", "15-puzzle"]
+    parser.add_argument("--suites", nargs="+", default=suites, choices=suites)
+    parser.add_argument("--algorithms", nargs="+", default=list(ALGORITHMS), choices=list(ALGORITHMS))
+    parser.add_argument("--instances", type=int, default=3, help="istanze per ogni n-puzzle")
+    parser.add_argument("--seed", type=int, default=0, help="primo seme delle istanze n-puzzle")
+    parser.add_argument(
+        "--heuristic", default="manhattan", choices=list(HEURISTICS), help="euristica delle istanze n-puzzle"
+    )
+    parser.add_argument("--packed", action="store_true", help="istanze n-puzzle con PackedNPuzzleState")
+    parser.add_argument(
+        "--compact-explored", action="store_true", help="insiemi degli esplorati a bit (ProblemSolving.compactExplored)"
+    )
+    parser.add_argument("--timeout", type=float, default=10, help="secondi per ogni esecuzione")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", type=Path, default=Path("benchmarkResults.json"))
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="salva i risultati come baseline")
+    parser.add_argument(
+        "--time-tolerance", type=float, default=0.1, help="variazione di tempo tollerata (0.1 = 10%%)"
+    )
+    parser.add_argument(
+        "--min-time", type=float, default=0.001, help="tempo sotto cui non si confrontano i tempi (s)"
+    )
+    parser.add_argument(
+        "--fail-on-regression", action="store_true", help="termina con codice 1 se ci sono regressioni"
+    )
+    parser.add_argument("--quiet", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    arguments = parseArguments(argv)
+
+    # le ricerche ricorsive scendono in profondità quanto la soluzione
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 100_000))
+
+    start = time.perf_counter()
+    results = runBenchmarks(arguments)
+
+    report = {
+        "metadata": {
+            "date": datetime.now(timezone.utc).isoformat(),
+            "commit": gitCommit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "suites": arguments.suites,
+            "instances": arguments.instances,
+            "seed": arguments.seed,
+            "heuristic": arguments.heuristic,
+            "packed": arguments.packed,
+            "compactExplored": arguments.compact_explored,
+            "timeout": arguments.timeout,
+            "warmup": arguments.warmup,
+            "repeats": arguments.repeats,
+            "duration": time.perf_counter() - start,
+        },
+        "results": results,
+    }
+
+    with open(arguments.output, mode="w") as output:
+        json.dump(report, output, indent=1)
+    print(f"Risultati salvati in {arguments.output}")
+
+    if arguments.save_baseline:
+        with open(arguments.baseline, mode="w") as output:
+            json.dump(report, output, indent=1)
+        print(f"Baseline salvata in {arguments.baseline}")
+        return 0
+
+    if not arguments.baseline.exists():
+        print(f"Nessuna baseline in {arguments.baseline} (crearla con --save-baseline)")
+        return 0
+
+    with open(arguments.baseline) as baselineFile:
+        baseline = json.load(baselineFile)
+
+    regressions, improvements = compareWithBaseline(
+        results, baseline, arguments.time_tolerance, arguments.min_time
+    )
+    print(f"\nConfronto con la baseline (commit {baseline['metadata'].get('commit')}):")
+    print(f"Miglioramenti: {len(improvements)}")
+    for message in improvements:
+        print(f"  + {message}")
+    print(f"Regressioni: {len(regressions)}")
+    for message in regressions:
+        print(f"  - {message}")
+
+    return 1 if arguments.fail_on_regression and len(regressions) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
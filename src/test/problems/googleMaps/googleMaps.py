@@ -87,6 +87,26 @@ class GoogleMapsProblem(Problem):
     def transitionModel(self, state: CityState, action: MoveAction) -> CityState:
         return _transitionModel(state, action)
 
+    def getGoalStates(self) -> list[CityState]:
+        return [self.goal.goalState]
+
+    def getPredecessors(self, state: CityState) -> list[tuple[MoveAction, CityState]]:
+        return _getPredecessorsPerState(state)
+
+    def encodeState(self, state: CityState) -> bytes:
+        return state.name.encode()
+
+    def decodeState(self, data: bytes) -> CityState:
+        return CityState(data.decode())
+
+    # città di partenza e di arrivo separate da un byte nullo
+    def encodeAction(self, action: MoveAction) -> bytes:
+        return f"{action.from_city.name}\0{action.to_city.name}".encode()
+
+    def decodeAction(self, data: bytes) -> MoveAction:
+        fromName, toName = data.decode().split("\0")
+        return MoveAction(CityState(fromName), CityState(toName))
+
 
 # città
 city_names = [
@@ -265,11 +285,22 @@ for state in states:
 
     actionsPerStateTable[state] = actions_from_city
 
+# Azioni entranti in ogni città (per la ricerca all'indietro)
+predecessorsPerStateTable: dict[CityState, list[tuple[MoveAction, CityState]]] = {
+    state: [] for state in states
+}
+for action in actions:
+    predecessorsPerStateTable[action.to_city].append((action, action.from_city))
+
 
 def _getActionsPerState(state: CityState) -> list[MoveAction]:
     return actionsPerStateTable[state]
 
 
+def _getPredecessorsPerState(state: CityState) -> list[tuple[MoveAction, CityState]]:
+    return predecessorsPerStateTable[state]
+
+
 def _transitionModel(state: CityState, action: MoveAction) -> CityState:
     if state != action.from_city:
         raise ValueError("Inconsistent arguments")
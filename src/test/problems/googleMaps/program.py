@@ -1,4 +1,3 @@
-from collections.abc import Callable
 from test.problems.googleMaps.googleMaps import (
     CityState,
     GoogleMapsAgent,
@@ -6,9 +5,9 @@ from test.problems.googleMaps.googleMaps import (
     GoogleMapsGoal,
     GoogleMapsProblem,
 )
-from threading import Event, Thread
 
-from ai.problems.problemSolving import ProblemSolving, SearchAlgorithmType, SolutionType
+from ai.problems.portfolio import PortfolioResult, SearchPortfolio
+from ai.problems.problemSolving import ProblemSolving
 
 
 def capitalize_first_letter(string: str) -> str:
@@ -20,47 +19,7 @@ def capitalize_first_letter(string: str) -> str:
     return string[0].upper() + string[1::]
 
 
-# Funzione per eseguire l'algoritmo di ricerca con un limite di tempo
-def runWithTimeout(
-    searchAlgorithm: SearchAlgorithmType,
-    problem,
-    timeout: float,
-    log: Callable[[str], None],
-) -> SolutionType:
-    global name
-
-    solution = None
-
-    stopEvent = Event()
-
-    def search():
-        nonlocal solution
-        try:
-            solution = searchAlgorithm(problem, stopEvent)
-        except Exception as e:
-            log(f"Algorithm {name} did not succeed: {e}")
-
-    searchThread = Thread(target=search)
-    searchThread.start()
-
-    searchThread.join(timeout)
-
-    if searchThread.is_alive():
-        log(f"Tempo scaduto dopo {timeout} secondi!")
-        stopEvent.set()
-        return ProblemSolving.CUTOFF
-
-    searchThread.join()
-
-    return solution
-
-
 def main():
-    global name
-
-    def reset():
-        environment.currentState = initialState
-
     initialState = CityState("Arad")
     goalState = CityState("Bucharest")
     goal = GoogleMapsGoal(goalState)
@@ -76,10 +35,15 @@ def main():
         "breadthFirstSearch",
         "depthFirstSearch",
         "depthFirstSearchRecursive",
+        "depthFirstSearchIterative",
         "iterativeDeepeningSearch",
+        "iterativeDeepeningSearchIncremental",
         "uniformSearch",
         "greedySearch",
         "aStarSearch",
+        "iterativeDeepeningAStar",
+        "bidirectionalBreadthFirstSearch",
+        "bidirectionalUniformSearch",
     ]
 
     with open("./test/nPuzzleOutput.txt", mode="w") as logger:
@@ -92,50 +56,44 @@ def main():
         algorithmsTimeMap: dict[str, float] = {}
         algorithmsCostMap: dict[str, float] = {}
 
-        for algorithm in algorithmsToTry:
-            name = capitalize_first_letter(algorithm)
+        # ogni algoritmo viene eseguito in un processo separato, con un limite di tempo
+        portfolio = SearchPortfolio(
+            {capitalize_first_letter(algorithm): getattr(solver, algorithm) for algorithm in algorithmsToTry},
+            timeout=10,
+            collectStatistics=True,
+        )
+        results = portfolio.run(problem)
+
+        for name, result in results.items():
             log(f"{name}:")
-            searchAlgorithm: SearchAlgorithmType = getattr(solver, algorithm)
-            try:
-                from timeit import default_timer as timer
-
-                start = timer()
-                solution = runWithTimeout(searchAlgorithm, problem, timeout=10, log=log)
-                end = timer()
-
-                time = end - start
-                log(f"Search algorithm time: {time}s")
-
-                if solution is None:
-                    raise ValueError("Solution era None")
-
-                if solution is ProblemSolving.CUTOFF:
-                    log(
-                        "Nessuna soluzione trovata (non e' stato visitato tutto l'albero degli stati a causa di timeout o errori interni)"
-                    )
-                    time = float("+inf")
-                    cost = float("+inf")
-                elif solution is ProblemSolving.NO_SOLUTIONS:
-                    log("Non ci sono soluzioni")
-                    time = float("+inf")
-                    cost = float("+inf")
-                else:
-                    actions, cost = solution
-                    if actions == None:
-                        print("Actions era None")
-                        return
-
-                    log(f"Soluzione trovata (Costo {cost})")
-                    for i in range(len(actions)):
-                        log(f"{f'{i+1}.':<5}\t{actions[i]}", logToStdout=False)
-
-                algorithmsTimeMap[name] = time
-                algorithmsCostMap[name] = cost
-
-                log("-----------------------------------")
-            except Exception as e:
-                log(f"Algorithm {name} did not succeed: {e}")
-            reset()
+            log(f"Search algorithm time: {result.time}s")
+            if result.statistics is not None:
+                log(str(result.statistics))
+
+            time = float("+inf")
+            cost = float("+inf")
+            if result.status == PortfolioResult.SOLVED:
+                actions, cost = result.solution
+                time = result.time
+
+                log(f"Soluzione trovata (Costo {cost})")
+                for i in range(len(actions)):
+                    log(f"{f'{i+1}.':<5}\t{actions[i]}", logToStdout=False)
+            elif result.status == PortfolioResult.NO_SOLUTIONS:
+                log("Non ci sono soluzioni")
+            elif result.status == PortfolioResult.ERROR:
+                log(f"Algorithm {name} did not succeed: {result.error}")
+            else:
+                if result.status == PortfolioResult.TIMEOUT:
+                    log(f"Tempo scaduto dopo {portfolio.timeout} secondi!")
+                log(
+                    "Nessuna soluzione trovata (non e' stato visitato tutto l'albero degli stati a causa di timeout o errori interni)"
+                )
+
+            algorithmsTimeMap[name] = time
+            algorithmsCostMap[name] = cost
+
+            log("-----------------------------------")
             log("")
 
         # ordina per costo crescente e tempo decrescente
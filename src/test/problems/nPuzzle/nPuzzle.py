@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from collections.abc import Callable
+from bisect import bisect_left
+from collections.abc import Callable, Sequence
+from functools import cache
+from math import factorial
+from typing import Optional
 
 from ai.core.action import Action
 from ai.core.agent import Agent
@@ -50,12 +54,85 @@ class NPuzzleState(State):
         return self.index(NPuzzleState.BLANK)
 
     def createGoalMap(self) -> dict[int, tuple[int, int]]:
-        goalMap = {}
-        for i in range(self.dimension):
-            for j in range(self.dimension):
-                value = i * self.dimension + j
-                goalMap[value] = (i, j)
-        return goalMap
+        # posizione (riga, colonna) di ogni tessera in questo stato, usato come obiettivo
+        return {value: divmod(index, self.dimension) for index, value in enumerate(self.board)}
+
+
+
+class PackedNPuzzleState(State):
+    """
+    Stato compatto dell'n-puzzle: la scacchiera è un unico intero, con la tessera della casella i
+    nei bit [i * bits, (i + 1) * bits) (4 bit per casella fino al 4x4), più la posizione del blank.
+    Hash e confronto lavorano su un solo intero e una mossa è qualche shift e maschera,
+    senza cercare il blank né creare liste o tuple; in memoria ogni stato occupa circa un terzo
+    di un `NPuzzleState` (utile per gli insiemi degli esplorati delle ricerche).
+    `board` ricostruisce la tupla (per la stampa e le euristiche che scorrono la scacchiera)
+    """
+
+    __slots__ = ("packed", "blankIndex", "dimension")
+
+    def __init__(self, packed: int, blankIndex: int, dimension: int):
+        """
+        **packed**: *int*                         - tessere della scacchiera, bits bit per casella\\
+        **blankIndex**: *int*                     - casella del blank\\
+        **dimension**: *int*                      - lato della scacchiera
+        """
+        self.packed = packed
+        self.blankIndex = blankIndex
+        self.dimension = dimension
+
+    @staticmethod
+    def fieldBits(dimension: int) -> int:
+        """Bit per casella: almeno 4, di più se le tessere non ci stanno (es: 5x5)"""
+        return max(4, (dimension * dimension - 1).bit_length())
+
+    @staticmethod
+    def fromBoard(board: tuple[int, ...], dimension: int) -> PackedNPuzzleState:
+        if len(board) != dimension * dimension:
+            raise ValueError(f"Board length {len(board)} does not match {dimension}x{dimension}")
+        bits = PackedNPuzzleState.fieldBits(dimension)
+        packed = 0
+        for index, tile in enumerate(board):
+            packed |= tile << (index * bits)
+        return PackedNPuzzleState(packed, board.index(NPuzzleState.BLANK), dimension)
+
+    # cifra esadecimale -> valore, per spacchettare le scacchiere a 4 bit per casella
+    HEX_DIGITS = bytes.maketrans(b"0123456789abcdef", bytes(range(16)))
+
+    @property
+    def board(self) -> tuple[int, ...]:
+        cells = self.dimension * self.dimension
+        bits = PackedNPuzzleState.fieldBits(self.dimension)
+        if bits == 4:
+            # una cifra esadecimale per casella, dalla meno significativa: la conversione avviene tutta in C
+            digits = format(self.packed, f"0{cells}x")[::-1].encode()
+            return tuple(digits.translate(PackedNPuzzleState.HEX_DIGITS))
+        mask = (1 << bits) - 1
+        return tuple((self.packed >> (index * bits)) & mask for index in range(cells))
+
+    def tile(self, index: int) -> int:
+        bits = PackedNPuzzleState.fieldBits(self.dimension)
+        return (self.packed >> (index * bits)) & ((1 << bits) - 1)
+
+    def __str__(self) -> str:
+        return str(NPuzzleState(self.board, self.dimension))
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, PackedNPuzzleState) and self.packed == other.packed
+
+    def __hash__(self) -> int:
+        return self.packed
+
+    def index(self, value: int) -> tuple[int, int]:
+        if value == NPuzzleState.BLANK:
+            return divmod(self.blankIndex, self.dimension)
+        return NPuzzleState(self.board, self.dimension).index(value)
+
+    def find_blank(self) -> tuple[int, int]:
+        return divmod(self.blankIndex, self.dimension)
+
+    def createGoalMap(self) -> dict[int, tuple[int, int]]:
+        return NPuzzleState(self.board, self.dimension).createGoalMap()
 
 
 class NPuzzleAction(Action):
@@ -66,6 +143,9 @@ class NPuzzleAction(Action):
 
     ACTION_LABELS = {RIGHT: "Right", UP: "Up", LEFT: "Left", DOWN: "Down"}
 
+    # mossa che annulla ciascuna mossa
+    INVERSE = {RIGHT: LEFT, UP: DOWN, LEFT: RIGHT, DOWN: UP}
+
     def __init__(self, value: int):
         if value not in NPuzzleAction.ACTION_LABELS:
             raise ValueError(f"Invalid move: {value}")
@@ -127,27 +207,104 @@ class NPuzzleProblem(Problem):
     def transitionModel(self, state: NPuzzleState, action: NPuzzleAction):
         return _transitionModel(state, action)
 
+    def expand(
+        self,
+        state: NPuzzleState,
+        heuristicDist: Optional[int] = None,
+        parentAction: Optional[NPuzzleAction] = None,
+    ) -> list[tuple[NPuzzleAction, NPuzzleState, int, int]]:
+        return _expand(state, self.goal, self.goalMap, self.heuristic, heuristicDist, parentAction)
+
+    def inverseAction(self, action: NPuzzleAction) -> NPuzzleAction:
+        return actions[NPuzzleAction.INVERSE[action.value]]
+
+    def getGoalStates(self) -> list[NPuzzleState]:
+        return [self.goal.stateToReach]
+
+    def getPredecessors(self, state: NPuzzleState) -> list[tuple[NPuzzleAction, NPuzzleState]]:
+        return _getPredecessors(state)
+
+    # un byte per casella e per mossa
+    def encodeState(self, state: NPuzzleState) -> bytes:
+        return bytes(state.board)
+
+    def decodeState(self, data: bytes) -> NPuzzleState:
+        return NPuzzleState(tuple(data), self.goal.stateToReach.dimension)
+
+    def encodeAction(self, action: NPuzzleAction) -> bytes:
+        return bytes((action.value,))
+
+    def decodeAction(self, data: bytes) -> NPuzzleAction:
+        return actions[data[0]]
+
+    def fingerprint(self) -> bytes:
+        # l'euristica cambia le soluzioni delle ricerche non ottime (es: greedySearch)
+        heuristic = self.heuristic
+        if hasattr(heuristic, "fingerprint"):
+            identity = heuristic.fingerprint()
+        else:
+            identity = f"{heuristic.__module__}.{heuristic.__qualname__}".encode()
+        return super().fingerprint() + b"|" + identity
+
+    # gli stati raggiungibili sono quelli della classe di parità dello stato iniziale (vedi rankBoard)
+    def stateSpaceSize(self) -> int:
+        return factorial(self.goal.stateToReach.dimension**2) // 2
+
+    def stateRank(self, state: NPuzzleState) -> int:
+        return rankBoard(state.board, state.dimension)
+
+    def stateFromRank(self, rank: int) -> NPuzzleState:
+        dimension = self.goal.stateToReach.dimension
+        parity = boardParity(self.initialState.board, dimension)
+        return self.decodeState(bytes(unrankBoard(rank, dimension, parity)))
+
+
+class PackedNPuzzleProblem(NPuzzleProblem):
+    """
+    `NPuzzleProblem` sugli stati compatti `PackedNPuzzleState` (anche lo stato obiettivo deve esserlo).
+    Accetta le stesse euristiche: gli aggiornamenti di Manhattan e walking distance usano solo
+    la tessera spostata, quello dei conflitti lineari spacchetta la scacchiera del figlio una sola volta;
+    anche le euristiche senza aggiornamento spacchettano la scacchiera una volta per figlio
+    """
+
+    def getActionsFromState(self, state: PackedNPuzzleState) -> list[NPuzzleAction]:
+        return _geActionsFromState(state)
+
+    def transitionModel(self, state: PackedNPuzzleState, action: NPuzzleAction) -> PackedNPuzzleState:
+        return _packedTransitionModel(state, action)
+
+    def expand(
+        self,
+        state: PackedNPuzzleState,
+        heuristicDist: Optional[int] = None,
+        parentAction: Optional[NPuzzleAction] = None,
+    ) -> list[tuple[NPuzzleAction, PackedNPuzzleState, int, int]]:
+        return _packedExpand(state, self.goal, self.goalMap, self.heuristic, heuristicDist, parentAction)
+
+    def getPredecessors(self, state: PackedNPuzzleState) -> list[tuple[NPuzzleAction, PackedNPuzzleState]]:
+        return [
+            (inverse, _packedTransitionModel(state, action))
+            for action, _, inverse in moveTable(state.dimension)[state.blankIndex]
+        ]
+
+    def encodeState(self, state: PackedNPuzzleState) -> bytes:
+        return bytes(state.board)
+
+    def decodeState(self, data: bytes) -> PackedNPuzzleState:
+        return PackedNPuzzleState.fromBoard(tuple(data), self.goal.stateToReach.dimension)
+
 
 class NPuzzleProblemSolving(ProblemSolving):
     pass
 
 
 def _geActionsFromState(state: NPuzzleState) -> list[NPuzzleAction]:
+    # lista precalcolata per la posizione del blank, condivisa: non va modificata
     blank_row, blank_col = state.find_blank()
-    valid_actions = []
-
-    if blank_col < state.dimension - 1:
-        valid_actions.append(NPuzzleAction(NPuzzleAction.RIGHT))
-    if blank_row > 0:
-        valid_actions.append(NPuzzleAction(NPuzzleAction.UP))
-    if blank_col > 0:
-        valid_actions.append(NPuzzleAction(NPuzzleAction.LEFT))
-    if blank_row < state.dimension - 1:
-        valid_actions.append(NPuzzleAction(NPuzzleAction.DOWN))
-
-    return valid_actions
+    return _actionTable(state.dimension)[blank_row * state.dimension + blank_col]
 
 
+# le quattro azioni, indicizzate per valore: vengono riusate invece di crearne di nuove ad ogni mossa
 actions = [
     NPuzzleAction(NPuzzleAction.RIGHT),
     NPuzzleAction(NPuzzleAction.UP),
@@ -157,7 +314,38 @@ actions = [
 
 
 def actionsPerState(state: NPuzzleState) -> list[NPuzzleAction]:
-    return actions
+    # solo le mosse possibili dalla posizione del blank (da `_actionTable`)
+    return _geActionsFromState(state)
+
+
+@cache
+def moveTable(dimension: int) -> tuple[tuple[tuple[NPuzzleAction, int, NPuzzleAction], ...], ...]:
+    """
+    Per ogni posizione del blank, le mosse possibili nell'ordine di `NPuzzleAction` (RIGHT, UP, LEFT, DOWN)
+    come terne (azione, casella della tessera che si sposta nel blank, azione inversa)
+    """
+    table = []
+    for blankIndex in range(dimension * dimension):
+        blankRow, blankCol = divmod(blankIndex, dimension)
+        moves = (
+            (NPuzzleAction.RIGHT, blankCol < dimension - 1, 1),
+            (NPuzzleAction.UP, blankRow > 0, -dimension),
+            (NPuzzleAction.LEFT, blankCol > 0, -1),
+            (NPuzzleAction.DOWN, blankRow < dimension - 1, dimension),
+        )
+        table.append(
+            tuple(
+                (actions[value], blankIndex + offset, actions[NPuzzleAction.INVERSE[value]])
+                for value, allowed, offset in moves
+                if allowed
+            )
+        )
+    return tuple(table)
+
+
+@cache
+def _actionTable(dimension: int) -> tuple[list[NPuzzleAction], ...]:
+    return tuple([action for action, _, _ in moves] for moves in moveTable(dimension))
 
 
 def _transitionModel(state: NPuzzleState, action: NPuzzleAction) -> NPuzzleState:
@@ -185,6 +373,128 @@ def _transitionModel(state: NPuzzleState, action: NPuzzleAction) -> NPuzzleState
     return NPuzzleState(tuple(newBoard), state.dimension)
 
 
+def _getPredecessors(state: NPuzzleState) -> list[tuple[NPuzzleAction, NPuzzleState]]:
+    # ogni mossa è reversibile: lo stato precedente si ottiene con la mossa opposta,
+    # e dallo stato precedente si torna a state proprio con la mossa inversa
+    blankRow, blankCol = state.find_blank()
+    return [
+        (inverse, _transitionModel(state, action))
+        for action, _, inverse in moveTable(state.dimension)[blankRow * state.dimension + blankCol]
+    ]
+
+
+def _expand(
+    state: NPuzzleState,
+    goal: NPuzzleGoal,
+    goalMap: dict[int, tuple[int, int]],
+    heuristic: Callable[[NPuzzleState, NPuzzleGoal, dict[int, tuple[int, int]]], int],
+    heuristicDist: Optional[int] = None,
+    parentAction: Optional[NPuzzleAction] = None,
+) -> list[tuple[NPuzzleAction, NPuzzleState, int, int]]:
+    """
+    Tutti i successori in un'unica passata: il blank viene cercato una sola volta e, se l'euristica
+    ha un aggiornamento incrementale (attributo `update`, vedi `manhattanDistance`), l'euristica
+    di ogni figlio si ottiene da quella del padre (**heuristicDist**, calcolata se non indicata)
+    guardando solo la tessera spostata (che passa dalla sua posizione a quella del blank).
+    Le mosse vengono lette da `moveTable`, senza controllare i bordi né creare nuove azioni
+    """
+    board = state.board
+    dimension = state.dimension
+    blankIndex = board.index(NPuzzleState.BLANK)
+
+    update = getattr(heuristic, "update", None)
+    if update is not None and heuristicDist is None:
+        heuristicDist = heuristic(state, goal, goalMap)
+
+    # la mossa inversa di quella che ha generato state riporterebbe al padre: non viene generata
+    skipped = None if parentAction is None else NPuzzleAction.INVERSE[parentAction.value]
+
+    successors = []
+    for action, swapIndex, _ in moveTable(dimension)[blankIndex]:
+        if action.value == skipped:
+            continue
+
+        tile = board[swapIndex]
+        newBoard = list(board)
+        newBoard[blankIndex] = tile
+        newBoard[swapIndex] = NPuzzleState.BLANK
+        newState = NPuzzleState(tuple(newBoard), dimension)
+
+        if update is not None:
+            newHeuristicDist = update(heuristicDist, state, newState, tile, swapIndex, blankIndex, goalMap)
+        else:
+            newHeuristicDist = heuristic(newState, goal, goalMap)
+
+        successors.append((action, newState, 1, newHeuristicDist))
+
+    return successors
+
+
+def _packedSwap(state: PackedNPuzzleState, swapIndex: int) -> tuple[int, PackedNPuzzleState]:
+    """Sposta nel blank la tessera di **swapIndex**: restituisce la tessera e il nuovo stato"""
+    bits = PackedNPuzzleState.fieldBits(state.dimension)
+    tile = (state.packed >> (swapIndex * bits)) & ((1 << bits) - 1)
+    # il blank vale 0: basta aggiungere la tessera nella casella del blank e toglierla dalla sua
+    packed = state.packed + (tile << (state.blankIndex * bits)) - (tile << (swapIndex * bits))
+    return (tile, PackedNPuzzleState(packed, swapIndex, state.dimension))
+
+
+def _packedTransitionModel(state: PackedNPuzzleState, action: NPuzzleAction) -> PackedNPuzzleState:
+    blankRow, blankCol = divmod(state.blankIndex, state.dimension)
+    if action.value == NPuzzleAction.RIGHT and blankCol < state.dimension - 1:
+        swapIndex = state.blankIndex + 1
+    elif action.value == NPuzzleAction.UP and blankRow > 0:
+        swapIndex = state.blankIndex - state.dimension
+    elif action.value == NPuzzleAction.LEFT and blankCol > 0:
+        swapIndex = state.blankIndex - 1
+    elif action.value == NPuzzleAction.DOWN and blankRow < state.dimension - 1:
+        swapIndex = state.blankIndex + state.dimension
+    else:
+        return state
+    return _packedSwap(state, swapIndex)[1]
+
+
+def _packedExpand(
+    state: PackedNPuzzleState,
+    goal: NPuzzleGoal,
+    goalMap: dict[int, tuple[int, int]],
+    heuristic: Callable[[NPuzzleState, NPuzzleGoal, dict[int, tuple[int, int]]], int],
+    heuristicDist: Optional[int] = None,
+    parentAction: Optional[NPuzzleAction] = None,
+) -> list[tuple[NPuzzleAction, PackedNPuzzleState, int, int]]:
+    """Come `_expand`, sugli stati compatti (lo scambio di `_packedSwap` è ripetuto qui, senza chiamate)"""
+    dimension = state.dimension
+    packed = state.packed
+    blankIndex = state.blankIndex
+    bits = PackedNPuzzleState.fieldBits(dimension)
+    mask = (1 << bits) - 1
+    blankShift = blankIndex * bits
+
+    update = getattr(heuristic, "update", None)
+    if update is not None and heuristicDist is None:
+        heuristicDist = heuristic(state, goal, goalMap)
+
+    # la mossa inversa di quella che ha generato state riporterebbe al padre: non viene generata
+    skipped = None if parentAction is None else NPuzzleAction.INVERSE[parentAction.value]
+
+    successors = []
+    for action, swapIndex, _ in moveTable(dimension)[blankIndex]:
+        if action.value == skipped:
+            continue
+
+        swapShift = swapIndex * bits
+        tile = (packed >> swapShift) & mask
+        newState = PackedNPuzzleState(packed + (tile << blankShift) - (tile << swapShift), swapIndex, dimension)
+        if update is not None:
+            newHeuristicDist = update(heuristicDist, state, newState, tile, swapIndex, blankIndex, goalMap)
+        else:
+            newHeuristicDist = heuristic(newState, goal, goalMap)
+
+        successors.append((action, newState, 1, newHeuristicDist))
+
+    return successors
+
+
 # Costo del percorso (ogni mossa ha costo 1)
 def _pathCostFunction(state: NPuzzleState, action: NPuzzleAction) -> int:
     return 1
@@ -193,11 +503,16 @@ def _pathCostFunction(state: NPuzzleState, action: NPuzzleAction) -> int:
 # Funzione heuristica: somma delle distanze di Manhattan
 def manhattanDistance(
     start: NPuzzleState, goal: NPuzzleGoal, goalMap: dict[int, tuple[int, int]]
+) -> int:
+    return _boardManhattanDistance(start.board, start.dimension, goalMap)
+
+
+def _boardManhattanDistance(
+    board: tuple[int, ...], dimension: int, goalMap: dict[int, tuple[int, int]]
 ) -> int:
     total_distance = 0
-    dimension = start.dimension
 
-    for index, value in enumerate(start.board):
+    for index, value in enumerate(board):
         if value == NPuzzleState.BLANK:
             continue
 
@@ -213,6 +528,257 @@ def manhattanDistance(
     return total_distance
 
 
+# Aggiornamenti incrementali: ricevono l'euristica del padre e la tessera **tile** spostata
+# da **fromIndex** a **toIndex** (la vecchia posizione del blank) nel passaggio da **parent** a **state**
+
+
+def _manhattanDistanceUpdate(
+    heuristicDist: int,
+    parent: NPuzzleState,
+    state: NPuzzleState,
+    tile: int,
+    fromIndex: int,
+    toIndex: int,
+    goalMap: dict[int, tuple[int, int]],
+) -> int:
+    """O(1): cambia solo la distanza della tessera spostata"""
+    goalRow, goalCol = goalMap[tile]
+    fromRow, fromCol = divmod(fromIndex, state.dimension)
+    toRow, toCol = divmod(toIndex, state.dimension)
+    return (
+        heuristicDist
+        - abs(fromRow - goalRow)
+        - abs(fromCol - goalCol)
+        + abs(toRow - goalRow)
+        + abs(toCol - goalCol)
+    )
+
+
+manhattanDistance.update = _manhattanDistanceUpdate
+
+
+# Funzione heuristica: distanza di Manhattan più i conflitti lineari
+def linearConflict(start: NPuzzleState, goal: NPuzzleGoal, goalMap: dict[int, tuple[int, int]]) -> int:
+    """
+    Due tessere nella loro riga (o colonna) obiettivo ma in ordine invertito non possono superarsi:
+    per ogni riga e colonna almeno (tessere nella propria linea - sottosequenza crescente più lunga)
+    tessere devono uscirne e rientrare, con 2 mosse in più rispetto alla distanza di Manhattan
+    """
+    # la scacchiera viene letta una sola volta (per gli stati compatti la ricostruzione ha un costo)
+    board = start.board
+    dimension = start.dimension
+    conflicts = 0
+    for line in range(dimension):
+        conflicts += _lineConflicts(board[line * dimension : (line + 1) * dimension], goalMap, line, False)
+        conflicts += _lineConflicts(board[line::dimension], goalMap, line, True)
+    return _boardManhattanDistance(board, dimension, goalMap) + 2 * conflicts
+
+
+def _lineConflicts(
+    tiles: tuple[int, ...], goalMap: dict[int, tuple[int, int]], line: int, column: bool
+) -> int:
+    """
+    Tessere da togliere dalla riga (o colonna) **line**, di cui **tiles** sono le tessere in ordine,
+    perché le restanti non siano in conflitto
+    """
+    count = 0
+    # tails[k]: minimo ultimo elemento di una sottosequenza crescente lunga k + 1
+    tails: list[int] = []
+    for tile in tiles:
+        if tile == NPuzzleState.BLANK:
+            continue
+        goalRow, goalCol = goalMap[tile]
+        if (goalCol if column else goalRow) != line:
+            continue
+
+        count += 1
+        target = goalRow if column else goalCol
+        position = bisect_left(tails, target)
+        if position == len(tails):
+            tails.append(target)
+        else:
+            tails[position] = target
+    return count - len(tails)
+
+
+def _linearConflictUpdate(
+    heuristicDist: int,
+    parent: NPuzzleState,
+    state: NPuzzleState,
+    tile: int,
+    fromIndex: int,
+    toIndex: int,
+    goalMap: dict[int, tuple[int, int]],
+) -> int:
+    """
+    O(dimensione): la tessera resta nella sua riga (o colonna), cambiano solo le due colonne
+    (o righe) coinvolte. Le linee del padre differiscono da quelle di **state** solo nella casella
+    della tessera spostata, quindi la scacchiera viene letta una sola volta
+    """
+    dimension = state.dimension
+    fromRow, fromCol = divmod(fromIndex, dimension)
+    toRow, toCol = divmod(toIndex, dimension)
+    column = fromRow == toRow
+    fromLine, toLine = (fromCol, toCol) if column else (fromRow, toRow)
+    # posizione di fromIndex e toIndex nelle rispettive linee (è la stessa)
+    position = fromRow if column else fromCol
+    board = state.board
+
+    conflicts = 0
+    # nel padre la tessera era in fromIndex e il blank in toIndex
+    for line, parentTile in ((fromLine, tile), (toLine, NPuzzleState.BLANK)):
+        tiles = board[line::dimension] if column else board[line * dimension : (line + 1) * dimension]
+        parentTiles = tiles[:position] + (parentTile,) + tiles[position + 1 :]
+        conflicts += _lineConflicts(tiles, goalMap, line, column)
+        conflicts -= _lineConflicts(parentTiles, goalMap, line, column)
+    return (
+        _manhattanDistanceUpdate(heuristicDist, parent, state, tile, fromIndex, toIndex, goalMap)
+        + 2 * conflicts
+    )
+
+
+linearConflict.update = _linearConflictUpdate
+
+
+# Funzione heuristica: walking distance (Takahashi)
+def walkingDistance(start: NPuzzleState, goal: NPuzzleGoal, goalMap: dict[int, tuple[int, int]]) -> int:
+    """
+    Le tessere vengono raggruppate per riga attuale e riga obiettivo (senza distinguerle tra loro):
+    il numero minimo di mosse verticali per portare la tabella dei conteggi a quella obiettivo
+    è precalcolato con una BFS, e lo stesso vale per le colonne. La somma delle due distanze
+    domina la distanza di Manhattan, perché considera anche i conflitti tra tessere della stessa riga.
+    Il calcolo è una sola passata sulla scacchiera; il valore restituito conserva le chiavi delle due tabelle,
+    così `walkingDistance.update` aggiorna in O(1) solo quella dell'asse su cui si muove la tessera.
+    Disponibile fino al 4x4 (24964 tabelle per asse): dal 5x5 le tabelle dei conteggi sono troppe
+    per tenerle in memoria e viene sollevato ValueError
+    """
+    return _walkingDistanceValue(start.board, start.dimension, goal.stateToReach.board)
+
+
+class _WalkingDistance(int):
+    """Walking distance con le chiavi delle tabelle dei conteggi di righe e colonne e le tabelle usate"""
+
+    def __new__(cls, value: int, rowKey: int, columnKey: int, tables: tuple) -> _WalkingDistance:
+        self = super().__new__(cls, value)
+        self.rowKey = rowKey
+        self.columnKey = columnKey
+        self.tables = tables
+        return self
+
+    def __reduce__(self):
+        # le tabelle non vanno copiate tra processi: si serializza il solo valore
+        # (l'aggiornamento incrementale ricalcola le chiavi dalla scacchiera)
+        return (int, (int(self),))
+
+
+def _walkingDistanceValue(board: tuple[int, ...], dimension: int, goalBoard: tuple[int, ...]) -> _WalkingDistance:
+    tables = _walkingDistanceTables(goalBoard, dimension)
+    rowWeights, columnWeights, rowDistances, columnDistances = tables
+    cells = dimension * dimension
+    rowKey = 0
+    columnKey = 0
+    for cell, tile in enumerate(board):
+        rowKey += rowWeights[cell * cells + tile]
+        columnKey += columnWeights[cell * cells + tile]
+    return _WalkingDistance(rowDistances[rowKey] + columnDistances[columnKey], rowKey, columnKey, tables)
+
+
+def _walkingDistanceUpdate(
+    heuristicDist: int,
+    parent: NPuzzleState,
+    state: NPuzzleState,
+    tile: int,
+    fromIndex: int,
+    toIndex: int,
+    goalMap: dict[int, tuple[int, int]],
+) -> int:
+    """O(1): la tessera cambia riga o colonna, quindi cambia la chiave di un solo asse"""
+    dimension = state.dimension
+    if not isinstance(heuristicDist, _WalkingDistance):
+        # valore senza chiavi (es: ripreso da un checkpoint): si ricalcolano sulla scacchiera del padre
+        goalBoard = [NPuzzleState.BLANK] * (dimension * dimension)
+        for goalTile, (goalRow, goalCol) in goalMap.items():
+            goalBoard[goalRow * dimension + goalCol] = goalTile
+        heuristicDist = _walkingDistanceValue(parent.board, dimension, tuple(goalBoard))
+
+    rowWeights, columnWeights, rowDistances, columnDistances = heuristicDist.tables
+    cells = dimension * dimension
+    rowKey = heuristicDist.rowKey
+    columnKey = heuristicDist.columnKey
+    if fromIndex - toIndex in (dimension, -dimension):
+        rowKey += rowWeights[toIndex * cells + tile] - rowWeights[fromIndex * cells + tile]
+    else:
+        columnKey += columnWeights[toIndex * cells + tile] - columnWeights[fromIndex * cells + tile]
+    return _WalkingDistance(
+        rowDistances[rowKey] + columnDistances[columnKey], rowKey, columnKey, heuristicDist.tables
+    )
+
+
+walkingDistance.update = _walkingDistanceUpdate
+
+
+# lato massimo per la walking distance: il 5x5 ha troppe tabelle dei conteggi (oltre 6 GB)
+WALKING_DISTANCE_MAX_DIMENSION = 4
+
+
+@cache
+def _walkingDistanceTables(
+    goalBoard: tuple[int, ...], dimension: int
+) -> tuple[list[int], list[int], dict[int, int], dict[int, int]]:
+    """
+    Per righe e colonne: pesi di (casella, tessera) nella chiave della tabella dei conteggi
+    e distanze di ogni tabella da quella obiettivo. La tabella è codificata in un intero:
+    il conteggio (linea attuale r, linea obiettivo g) occupa i bit dalla posizione bits * (r * dimensione + g)
+    """
+    if dimension > WALKING_DISTANCE_MAX_DIMENSION:
+        maximum = WALKING_DISTANCE_MAX_DIMENSION
+        raise ValueError(
+            f"Walking distance disponibile fino a {maximum}x{maximum}: "
+            f"le tabelle del {dimension}x{dimension} non stanno in memoria"
+        )
+    cells = dimension * dimension
+    bits = dimension.bit_length()
+    goalMap = {tile: divmod(cell, dimension) for cell, tile in enumerate(goalBoard)}
+
+    tables = []
+    for axis in (0, 1):
+        weights = [0] * (cells * cells)
+        goalKey = 0
+        for cell in range(cells):
+            line = divmod(cell, dimension)[axis]
+            for tile, position in goalMap.items():
+                if tile != NPuzzleState.BLANK:
+                    weights[cell * cells + tile] = 1 << (bits * (line * dimension + position[axis]))
+            goalKey += weights[cell * cells + goalBoard[cell]]
+        blankLine = goalMap[NPuzzleState.BLANK][axis]
+
+        # BFS all'indietro: il blank scambia una tessera (di qualunque linea obiettivo) con una linea adiacente
+        mask = (1 << bits) - 1
+        distances = {goalKey: 0}
+        current = [(goalKey, blankLine)]
+        distance = 0
+        while current:
+            distance += 1
+            following = []
+            for key, blank in current:
+                for neighbor in (blank - 1, blank + 1):
+                    if not 0 <= neighbor < dimension:
+                        continue
+                    for target in range(dimension):
+                        shift = bits * (neighbor * dimension + target)
+                        if (key >> shift) & mask == 0:
+                            continue
+                        newKey = key - (1 << shift) + (1 << (bits * (blank * dimension + target)))
+                        if newKey not in distances:
+                            distances[newKey] = distance
+                            following.append((newKey, neighbor))
+            current = following
+        tables.append((weights, distances))
+
+    (rowWeights, rowDistances), (columnWeights, columnDistances) = tables
+    return (rowWeights, columnWeights, rowDistances, columnDistances)
+
+
 def _heuristicDistFunction(
     state: NPuzzleState,
     goal: NPuzzleGoal,
@@ -278,3 +844,78 @@ def generateSortedState(dimension: int) -> NPuzzleState:
     Genera un'istanza NPuzzleState con lo stato obiettivo ordinato.
     """
     return NPuzzleState(generateSortedSquareMatrix(dimension), dimension)
+
+
+@cache
+def _rankCellOrder(dimension: int) -> tuple[int, ...]:
+    """
+    Ordine delle caselle per `rankBoard`: le prime due (0 e dimensione + 1, in diagonale) hanno lo stesso
+    colore della scacchiera, così scambiarne il contenuto cambia sempre la classe di parità
+    (anche se una delle due contiene il blank)
+    """
+    second = dimension + 1
+    return (0, second) + tuple(cell for cell in range(1, dimension * dimension) if cell != second)
+
+
+def rankBoard(board: tuple[int, ...], dimension: int) -> int:
+    """
+    Rango della disposizione tra quelle della sua classe di parità (vedi `boardParity`), in [0, N! / 2),
+    in O(N) (Myrvold e Ruskey): numerazione perfetta degli stati raggiungibili, usata per indicizzare
+    array di bit o di valori (es: `BitsetStateSet`) e file di stati.
+    L'ultima cifra del rango completo distingue solo lo scambio delle prime due caselle di `_rankCellOrder`,
+    che appartengono a classi diverse, quindi viene omessa
+    """
+    permutation = [board[cell] for cell in _rankCellOrder(dimension)]
+    inverse = [0] * len(board)
+    for index, tile in enumerate(permutation):
+        inverse[tile] = index
+
+    rank = 0
+    multiplier = 1
+    for size in range(len(permutation), 2, -1):
+        # porta in fondo la tessera size - 1, scambiandola con quella che occupa l'ultima casella
+        last = permutation[size - 1]
+        position = inverse[size - 1]
+        permutation[size - 1], permutation[position] = size - 1, last
+        inverse[last], inverse[size - 1] = position, size - 1
+        rank += last * multiplier
+        multiplier *= size
+    return rank
+
+
+def unrankBoard(rank: int, dimension: int, parity: int = 0) -> tuple[int, ...]:
+    """Disposizione con rango **rank** nella classe di parità **parity** (inversa di `rankBoard`)"""
+    permutation = list(range(dimension * dimension))
+    for size in range(len(permutation), 0, -1):
+        rank, position = divmod(rank, size)
+        permutation[size - 1], permutation[position] = permutation[position], permutation[size - 1]
+
+    order = _rankCellOrder(dimension)
+    board = [0] * len(permutation)
+    for cell, tile in zip(order, permutation):
+        board[cell] = tile
+    # la cifra omessa: se la classe non è quella richiesta va scambiato il contenuto delle prime due caselle
+    if boardParity(board, dimension) != parity:
+        board[order[0]], board[order[1]] = board[order[1]], board[order[0]]
+    return tuple(board)
+
+
+def boardParity(board: Sequence[int], dimension: int) -> int:
+    """
+    Classe di parità della disposizione: parità della permutazione più riga e colonna del blank.
+    Ogni mossa cambia entrambe, quindi gli stati raggiungibili da una disposizione
+    sono tutti e soli quelli della sua classe (N! / 2)
+    """
+    cells = len(board)
+    # parità della permutazione: numero di caselle meno numero di cicli
+    visited = [False] * cells
+    cycles = 0
+    for start in range(cells):
+        if not visited[start]:
+            cycles += 1
+            index = start
+            while not visited[index]:
+                visited[index] = True
+                index = board[index]
+    blankRow, blankCol = divmod(board.index(NPuzzleState.BLANK), dimension)
+    return (cells - cycles + blankRow + blankCol) % 2
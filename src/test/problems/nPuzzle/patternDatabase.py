@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from collections.abc import Sequence
+from typing import Any, Optional
+
+from test.problems.nPuzzle.nPuzzle import NPuzzleGoal, NPuzzleState
+
+
+class PatternDatabase:
+    """
+    Heuristica a pattern database additivi e disgiunti per l'n-puzzle, da passare come `heuristic`
+    a `NPuzzleProblem`. Le tessere vengono divise in gruppi (pattern) disgiunti: per ogni disposizione
+    delle tessere di un gruppo e per ogni casella del blank il database contiene il numero minimo di mosse
+    di quelle tessere (le mosse delle altre tessere sono gratuite) per portarle nella posizione obiettivo.
+    Il blank conta solo per la regione di caselle libere in cui si trova: il valore è la distanza esatta
+    nello spazio astratto (disposizione, regione del blank), in cui ogni mossa di una tessera del gruppo
+    costa 1 e quelle delle altre tessere non cambiano la regione. Ogni mossa sposta una sola tessera,
+    quindi la somma sui gruppi è ammissibile e consistente (tra stati vicini cambia al più di 1),
+    può essere usata da A* senza riaprire i nodi e domina la distanza di Manhattan.
+
+    Le tabelle vengono costruite una volta con `build` (BFS all'indietro dall'obiettivo) e salvate
+    in un file di byte, una tabella per gruppo di k tessere indicizzata da
+    sum(posizione della i-esima tessera * N^i) + casella del blank * N^k (N = numero di caselle):
+    l'indice si calcola con una sola passata sulla scacchiera, senza tuple intermedie.
+    Il file viene letto tramite mmap, quindi i processi che usano lo stesso database
+    (es: `SearchPortfolio`) condividono la stessa copia in memoria.
+
+        magic "NPDB" | versione (u8) | dimensione (u8) | numero di gruppi (u8)
+        obiettivo: N byte (tessera per casella)
+        gruppi: numero di tessere (u8) e tessere (u8[])
+        tabelle: N^(k+1) byte per ogni gruppo di k tessere (255 = disposizione impossibile)
+    """
+
+    MAGIC = b"NPDB"
+    VERSION = 2
+    UNKNOWN = 255
+
+    def __init__(self, path: str):
+        """**path**: *str*                             - file scritto da `build`"""
+        self.path = path
+        with open(path, "rb") as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self.data[:4] != PatternDatabase.MAGIC:
+            raise ValueError(f"{path} non è un pattern database")
+        version, dimension, patternCount = struct.unpack_from("<BBB", self.data, 4)
+        if version != PatternDatabase.VERSION:
+            raise ValueError(f"Versione del pattern database non supportata: {version}")
+        cells = dimension * dimension
+        offset = 7
+        self.dimension = dimension
+        self.goalBoard = tuple(self.data[offset : offset + cells])
+        offset += cells
+
+        self.patterns: list[tuple[int, ...]] = []
+        for _ in range(patternCount):
+            size = self.data[offset]
+            self.patterns.append(tuple(self.data[offset + 1 : offset + 1 + size]))
+            offset += 1 + size
+
+        # gli indici di tutti i gruppi vengono accumulati in un solo intero, un campo di indexBits bit per gruppo:
+        # per ogni (casella, tessera), contributo della tessera in quella casella all'indice del suo gruppo,
+        # spostato nel campo del gruppo (0 se la tessera non è in nessun gruppo; il blank è in tutti)
+        self.indexBits = (cells ** (max(map(len, self.patterns), default=0) + 1)).bit_length()
+        self.offsets: list[tuple[int, int]] = []
+        self.weights = [0] * (cells * cells)
+        for number, pattern in enumerate(self.patterns):
+            shift = number * self.indexBits
+            self.offsets.append((offset, shift))
+            for order, tile in enumerate(pattern):
+                for cell in range(cells):
+                    self.weights[cell * cells + tile] = cell * cells**order << shift
+            for cell in range(cells):
+                self.weights[cell * cells + NPuzzleState.BLANK] += cell * cells ** len(pattern) << shift
+            offset += cells ** (len(pattern) + 1)
+        self.cellBases = range(0, cells * cells, cells)
+        # ultimo obiettivo verificato (vedi `__call__`)
+        self.checkedGoal: Optional[NPuzzleGoal] = None
+
+    def __call__(
+        self, state: NPuzzleState, goal: NPuzzleGoal, goalMap: Optional[dict[int, tuple[int, int]]] = None
+    ) -> int:
+        """Somma delle mosse minime di ogni gruppo (**goal** deve essere l'obiettivo usato in `build`)"""
+        if goal is not self.checkedGoal:
+            if goal.stateToReach.board != self.goalBoard:
+                raise ValueError(f"Il pattern database {self.path} è stato costruito per un altro obiettivo")
+            self.checkedGoal = goal
+
+        weights = self.weights
+        indexes = 0
+        for base, tile in zip(self.cellBases, state.board):
+            indexes += weights[base + tile]
+
+        data = self.data
+        mask = (1 << self.indexBits) - 1
+        total = 0
+        for offset, shift in self.offsets:
+            total += data[offset + ((indexes >> shift) & mask)]
+        return total
+
+    def fingerprint(self) -> bytes:
+        """Identifica i valori del database (vedi `NPuzzleProblem.fingerprint`), indipendentemente dal file"""
+        return f"PatternDatabase:{PatternDatabase.VERSION}:{self.goalBoard}:{self.patterns}".encode()
+
+    def close(self) -> None:
+        self.data.close()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # la mappa in memoria non è serializzabile: il processo che la riceve riapre il file
+        return {"path": self.path}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(state["path"])
+
+    @staticmethod
+    def defaultPatterns(dimension: int) -> list[tuple[int, ...]]:
+        """Gruppi predefiniti: 4-4 per il gioco dell'8, 5-5-5 per il gioco del 15, altrimenti gruppi di 5 tessere"""
+        if dimension == 3:
+            return [(1, 2, 3, 4), (5, 6, 7, 8)]
+        if dimension == 4:
+            return [(1, 5, 6, 9, 13), (2, 3, 4, 7, 8), (10, 11, 12, 14, 15)]
+        tiles = list(range(1, dimension * dimension))
+        return [tuple(tiles[start : start + 5]) for start in range(0, len(tiles), 5)]
+
+    @staticmethod
+    def build(
+        goalState: NPuzzleState, path: str, patterns: Optional[Sequence[Sequence[int]]] = None
+    ) -> PatternDatabase:
+        """
+        Costruisce le tabelle di tutti i gruppi, le scrive in **path** e restituisce il database.\\
+        **goalState**: *NPuzzleState*                 - stato obiettivo\\
+        **path**: *str*                               - file del database\\
+        **patterns**: *Optional[Sequence[Sequence[int]]]* - gruppi disgiunti di tessere (default: `defaultPatterns`)
+        """
+        dimension = goalState.dimension
+        if patterns is None:
+            patterns = PatternDatabase.defaultPatterns(dimension)
+        patterns = [tuple(pattern) for pattern in patterns]
+        tiles = [tile for pattern in patterns for tile in pattern]
+        if len(set(tiles)) != len(tiles) or NPuzzleState.BLANK in tiles:
+            raise ValueError("I gruppi devono essere disgiunti e non contenere il blank")
+
+        temporaryPath = f"{path}.tmp"
+        with open(temporaryPath, "wb") as file:
+            file.write(PatternDatabase.MAGIC)
+            file.write(struct.pack("<BBB", PatternDatabase.VERSION, dimension, len(patterns)))
+            file.write(bytes(goalState.board))
+            for pattern in patterns:
+                file.write(bytes((len(pattern),)))
+                file.write(bytes(pattern))
+            for pattern in patterns:
+                file.write(PatternDatabase.buildTable(goalState, pattern))
+        os.replace(temporaryPath, path)
+        return PatternDatabase(path)
+
+    @staticmethod
+    def buildTable(goalState: NPuzzleState, pattern: tuple[int, ...]) -> bytearray:
+        """
+        BFS all'indietro sulle disposizioni delle tessere di **pattern**. Le mosse del blank tra caselle
+        libere hanno costo 0, quindi un nodo è (disposizione, regione di caselle libere raggiungibili
+        dal blank) e ogni arco sposta una tessera del gruppo in una casella adiacente della regione.
+        La distanza di un nodo viene scritta per ogni casella della sua regione
+        """
+        dimension = goalState.dimension
+        cells = dimension * dimension
+        neighbors = []
+        for cell in range(cells):
+            row, col = divmod(cell, dimension)
+            mask = 0
+            if col < dimension - 1:
+                mask |= 1 << (cell + 1)
+            if row > 0:
+                mask |= 1 << (cell - dimension)
+            if col > 0:
+                mask |= 1 << (cell - 1)
+            if row < dimension - 1:
+                mask |= 1 << (cell + dimension)
+            neighbors.append(mask)
+
+        def region(cell: int, occupied: int) -> int:
+            """Caselle libere raggiungibili dal blank in **cell** (maschera di bit)"""
+            reached = 1 << cell
+            frontier = reached
+            while frontier:
+                grown = 0
+                while frontier:
+                    low = frontier & -frontier
+                    grown |= neighbors[low.bit_length() - 1]
+                    frontier ^= low
+                frontier = grown & ~occupied & ~reached
+                reached |= frontier
+            return reached
+
+        def store(index: int, blankRegion: int, distance: int) -> None:
+            while blankRegion:
+                low = blankRegion & -blankRegion
+                table[index + (low.bit_length() - 1) * blankWeight] = distance
+                blankRegion ^= low
+
+        size = len(pattern)
+        weights = [cells**order for order in range(size)]
+        blankWeight = cells**size
+        # le regioni di una disposizione sono disgiunte: un nodo è già visitato se lo è una sua casella
+        table = bytearray([PatternDatabase.UNKNOWN]) * (cells ** (size + 1))
+
+        positions = [goalState.board.index(tile) for tile in pattern]
+        index = sum(position * weight for position, weight in zip(positions, weights))
+        occupied = sum(1 << position for position in positions)
+        blankRegion = region(goalState.board.index(NPuzzleState.BLANK), occupied)
+        store(index, blankRegion, 0)
+
+        current = [(index, blankRegion)]
+        distance = 0
+        while current:
+            distance += 1
+            following = []
+            for index, blankRegion in current:
+                rest = index
+                for order in range(size):
+                    rest, position = divmod(rest, cells)
+                    positions[order] = position
+                occupied = sum(1 << position for position in positions)
+
+                for order, position in enumerate(positions):
+                    targets = neighbors[position] & blankRegion
+                    while targets:
+                        low = targets & -targets
+                        targets ^= low
+                        target = low.bit_length() - 1
+                        # la tessera passa da position a target, il blank da target a position
+                        newIndex = index + weights[order] * (target - position)
+                        # la regione contiene sempre position (la vecchia casella della tessera)
+                        if table[newIndex + position * blankWeight] != PatternDatabase.UNKNOWN:
+                            continue
+                        newRegion = region(position, occupied ^ (1 << position) ^ low)
+                        store(newIndex, newRegion, distance)
+                        following.append((newIndex, newRegion))
+            current = following
+        return table
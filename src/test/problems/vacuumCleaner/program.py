@@ -1,4 +1,3 @@
-from collections.abc import Callable
 from test.problems.vacuumCleaner.vacuumCleaner import (
     VacuumAgent,
     VacuumEnvironment,
@@ -6,44 +5,9 @@ from test.problems.vacuumCleaner.vacuumCleaner import (
     VacuumProblem,
 )
 from test.problems.vacuumCleaner.vacuumCleaner import VacuumState as vs
-from threading import Event, Thread
 
-from ai.problems.problemSolving import ProblemSolving, SearchAlgorithmType, SolutionType
-
-
-# Funzione per eseguire l'algoritmo di ricerca con un limite di tempo
-def runWithTimeout(
-    searchAlgorithm: SearchAlgorithmType,
-    problem,
-    timeout: float,
-    log: Callable[[str], None],
-) -> SolutionType:
-    global name
-
-    solution = None
-
-    stopEvent = Event()
-
-    def search():
-        nonlocal solution
-        try:
-            solution = searchAlgorithm(problem, stopEvent)
-        except Exception as e:
-            log(f"Algorithm {name} did not succeed: {e}")
-
-    searchThread = Thread(target=search)
-    searchThread.start()
-
-    searchThread.join(timeout)
-
-    if searchThread.is_alive():
-        log(f"Tempo scaduto dopo {timeout} secondi!")
-        stopEvent.set()
-        return ProblemSolving.CUTOFF
-
-    searchThread.join()
-
-    return solution
+from ai.problems.portfolio import PortfolioResult, SearchPortfolio
+from ai.problems.problemSolving import ProblemSolving
 
 
 def capitalize_first_letter(string: str) -> str:
@@ -56,11 +20,6 @@ def capitalize_first_letter(string: str) -> str:
 
 
 def main():
-    global name
-
-    def reset():
-        environment.currentState = initialState
-
     # Definizione del problema
     initialState = vs((vs.DIRTY << vs.LEFT) | (vs.CLEAN << vs.RIGHT) | (vs.RIGHT << vs.VACUUM))
     goalState = vs((vs.CLEAN << vs.LEFT) | (vs.CLEAN << vs.RIGHT) | (vs.RIGHT << vs.VACUUM))
@@ -78,10 +37,15 @@ def main():
         "breadthFirstSearch",
         "depthFirstSearch",
         "depthFirstSearchRecursive",
+        "depthFirstSearchIterative",
         "iterativeDeepeningSearch",
+        "iterativeDeepeningSearchIncremental",
         "uniformSearch",
         "greedySearch",
         "aStarSearch",
+        "iterativeDeepeningAStar",
+        "bidirectionalBreadthFirstSearch",
+        "bidirectionalUniformSearch",
     ]
 
     with open("./test/vacuumOutput.txt", mode="w") as logger:
@@ -94,50 +58,44 @@ def main():
         algorithmsTimeMap: dict[str, float] = {}
         algorithmsCostMap: dict[str, float] = {}
 
-        for algorithm in algorithmsToTry:
-            name = capitalize_first_letter(algorithm)
+        # ogni algoritmo viene eseguito in un processo separato, con un limite di tempo
+        portfolio = SearchPortfolio(
+            {capitalize_first_letter(algorithm): getattr(solver, algorithm) for algorithm in algorithmsToTry},
+            timeout=10,
+            collectStatistics=True,
+        )
+        results = portfolio.run(problem)
+
+        for name, result in results.items():
             log(f"{name}:")
-            searchAlgorithm: SearchAlgorithmType = getattr(solver, algorithm)
-            try:
-                from timeit import default_timer as timer
-
-                start = timer()
-                solution = runWithTimeout(searchAlgorithm, problem, timeout=10, log=log)
-                end = timer()
-
-                time = end - start
-                log(f"Search algorithm time: {time}s")
-
-                if solution is None:
-                    raise ValueError("Solution era None")
-
-                if solution is ProblemSolving.CUTOFF:
-                    log(
-                        "Nessuna soluzione trovata (non e' stato visitato tutto l'albero degli stati a causa di timeout o errori interni)"
-                    )
-                    time = float("+inf")
-                    cost = float("+inf")
-                elif solution is ProblemSolving.NO_SOLUTIONS:
-                    log("Non ci sono soluzioni")
-                    time = float("+inf")
-                    cost = float("+inf")
-                else:
-                    actions, cost = solution
-                    if actions == None:
-                        print("Actions era None")
-                        return
-
-                    log(f"Soluzione trovata (Costo {cost})")
-                    for i in range(len(actions)):
-                        log(f"{f'{i+1}.':<5}\t{actions[i]}", logToStdout=False)
-
-                algorithmsTimeMap[name] = time
-                algorithmsCostMap[name] = cost
-
-                log("-----------------------------------")
-            except Exception as e:
-                log(f"Algorithm {name} did not succeed: {e}")
-            reset()
+            log(f"Search algorithm time: {result.time}s")
+            if result.statistics is not None:
+                log(str(result.statistics))
+
+            time = float("+inf")
+            cost = float("+inf")
+            if result.status == PortfolioResult.SOLVED:
+                actions, cost = result.solution
+                time = result.time
+
+                log(f"Soluzione trovata (Costo {cost})")
+                for i in range(len(actions)):
+                    log(f"{f'{i+1}.':<5}\t{actions[i]}", logToStdout=False)
+            elif result.status == PortfolioResult.NO_SOLUTIONS:
+                log("Non ci sono soluzioni")
+            elif result.status == PortfolioResult.ERROR:
+                log(f"Algorithm {name} did not succeed: {result.error}")
+            else:
+                if result.status == PortfolioResult.TIMEOUT:
+                    log(f"Tempo scaduto dopo {portfolio.timeout} secondi!")
+                log(
+                    "Nessuna soluzione trovata (non e' stato visitato tutto l'albero degli stati a causa di timeout o errori interni)"
+                )
+
+            algorithmsTimeMap[name] = time
+            algorithmsCostMap[name] = cost
+
+            log("-----------------------------------")
             log("")
 
         # ordina per costo crescente e tempo decrescente
@@ -126,6 +126,24 @@ class VacuumProblem(Problem):
     def transitionModel(self, state: VacuumState, action: VacuumAction) -> VacuumState:
         return _transitionModel(state, action)
 
+    def getGoalStates(self) -> list[VacuumState]:
+        return [self.goal.goalState]
+
+    def getPredecessors(self, state: VacuumState) -> list[tuple[VacuumAction, VacuumState]]:
+        return ALL_PREDECESSORS_PER_STATE[state]
+
+    def encodeState(self, state: VacuumState) -> bytes:
+        return bytes((state.bitmap,))
+
+    def decodeState(self, data: bytes) -> VacuumState:
+        return VacuumState(data[0])
+
+    def encodeAction(self, action: VacuumAction) -> bytes:
+        return bytes((action.value,))
+
+    def decodeAction(self, data: bytes) -> VacuumAction:
+        return VacuumAction(data[0])
+
 
 def putBitInPosition(bitmap: int, bit: int, position: int) -> int:
     return (bitmap & ~(1 << position)) | (bit << position)
@@ -193,3 +211,9 @@ ALL_ACTIONS = [VacuumAction(a) for a in VacuumAction.ACTION_LABELS.keys()]
 
 # tutte le azioni sono possibili in ogni stato
 ALL_ACTIONS_PER_STATE = {state: ALL_ACTIONS for state in ALL_STATES}
+
+# predecessori di ogni stato (l'aspirazione non è reversibile, quindi sono calcolati esplicitamente)
+ALL_PREDECESSORS_PER_STATE = {state: [] for state in ALL_STATES}
+for state in ALL_STATES:
+    for action in ALL_ACTIONS:
+        ALL_PREDECESSORS_PER_STATE[_transitionModel(state, action)].append((action, state))